@@ -0,0 +1,291 @@
+import os
+import gc
+import csv
+import json
+import time
+import sys
+import platform
+import subprocess
+import tracemalloc
+import numpy as np
+from typing import List, Dict, Optional, Iterator, NamedTuple, Union
+from knapsack_base import KnapsackAlgorithmBase
+from instrumentation import PHASES
+from solver_registry import SOLVERS, get_solver
+from data_handler import load_knapsack_data_from_csv
+from instance_generator import generate_arrays
+
+BUNDLED_DATASETS = ["dataset_20.csv", "dataset_500.csv", "dataset_1000.csv"]
+LARGE_SIZES = [10_000, 100_000, 1_000_000]
+
+# Thời gian import giao diện tối đa (giây) cho lệnh `cli.py startup`, không tính khởi động trình thông dịch
+STARTUP_TARGET = 0.3
+
+# Các module chỉ được import khi dùng lần đầu (ngoài module của các bộ giải trong solver_registry)
+LAZY_MODULES = ["numpy", "knapsack_base", "matplotlib", "parallel_runner", "data_handler", "multiprocessing"]
+
+# Chênh lệch thời gian tuyệt đối tối thiểu (giây) mới tính là hồi quy, bỏ qua nhiễu của các lần chạy rất ngắn
+MIN_TIME_DELTA = 0.005
+
+# Cột của file kết quả CSV (cũng là khóa của mỗi bản ghi JSON)
+RESULT_FIELDS = [
+    "instance", "n", "solver", "capacity_ratio", "capacity", "iterations", "population", "seed",
+    "best_value", "best_weight", "wall_time", "exec_time", "evaluations", "evals_per_sec", "peak_memory",
+    "cache_hits", "cache_misses", "iterations_run", "stop_reason",
+    "repairs", "time_init_ms", "time_update_ms", "time_repair_ms", "time_evaluation_ms", "time_leaders_ms",
+]
+
+
+class BenchInstance(NamedTuple):
+    """Một bộ dữ liệu dùng để đo: tên, tên vật phẩm, mảng giá trị và trọng lượng."""
+    name: str
+    names: List[str]
+    values: np.ndarray
+    weights: np.ndarray                         # Ràng buộc đầu tiên
+    weight_matrix: Optional[np.ndarray] = None  # m x n khi có nhiều ràng buộc trọng lượng
+    bounds: Optional[np.ndarray] = None         # Số lượng tối đa của từng vật phẩm (None: bài toán 0/1)
+
+    @property
+    def solver_weights(self) -> np.ndarray:
+        """Trọng lượng truyền cho bộ giải: mảng 1-D hoặc ma trận m x n khi có nhiều ràng buộc."""
+        return self.weights if self.weight_matrix is None else self.weight_matrix
+
+    def capacity(self, ratio: float):
+        """Sức chứa theo tỉ lệ tổng trọng lượng (tính cả số lượng tối đa): số nguyên, hoặc tuple mỗi ràng buộc một giá trị."""
+        weights = np.atleast_2d(self.solver_weights)
+        totals = weights.sum(axis=1) if self.bounds is None else weights @ self.bounds
+        capacities = tuple(int(ratio * int(total)) for total in totals)
+        return capacities[0] if self.weight_matrix is None else capacities
+
+
+class BenchConfig(NamedTuple):
+    """Một cấu hình đo (một điểm của lưới quét tham số)."""
+    solver: str
+    capacity_ratio: float
+    iterations: int
+    population: Optional[int]  # Kích thước quần thể (số sói, số cá thể GA); None nếu bộ giải không có
+    seed: int
+
+
+def load_instance(filename: str) -> BenchInstance:
+    """Tải dataset CSV (đường dẫn tương đối được tìm cạnh module nếu không có trong thư mục hiện tại)."""
+    if not os.path.exists(filename):
+        bundled = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+        if os.path.exists(bundled):
+            filename = bundled
+    data = load_knapsack_data_from_csv(filename)
+    if not data['names']:
+        raise ValueError(f"Không tải được dữ liệu từ {filename}")
+    weight_matrix = np.asarray(data['weight_matrix'], dtype=np.int64) if len(data['dimensions']) > 1 else None
+    bounds = None if data['bounds'] is None else np.asarray(data['bounds'], dtype=np.int64)
+    return BenchInstance(os.path.basename(filename), data['names'],
+                         np.asarray(data['values'], dtype=np.int64), np.asarray(data['weights'], dtype=np.int64),
+                         weight_matrix, bounds)
+
+
+def generate_instance(n: int, kind: str = "uncorrelated", seed: int = 0) -> BenchInstance:
+    """Sinh bộ dữ liệu tổng hợp bằng instance_generator (xem KINDS)."""
+    values, weights = generate_arrays(n, kind, seed)
+    return BenchInstance(f"{kind}_{n}", [f"Item_{i}" for i in range(1, n + 1)], values, weights)
+
+
+def sweep(solvers: List[str], capacity_ratios: List[float], iterations: List[int],
+          populations: Optional[List[int]], seeds: List[int]) -> Iterator[BenchConfig]:
+    """
+    Sinh mọi tổ hợp tham số. Kích thước quần thể chỉ được quét cho bộ giải có quần thể;
+    populations rỗng/None nghĩa là dùng giá trị mặc định của từng bộ giải.
+    """
+    for solver in solvers:
+        spec = get_solver(solver)
+        if spec.population_kwarg is None:
+            sizes = [None]
+        else:
+            sizes = populations or [spec.defaults.get(spec.population_kwarg)]
+        for ratio in capacity_ratios:
+            for iters in iterations:
+                for size in sizes:
+                    for seed in seeds:
+                        yield BenchConfig(solver, ratio, iters, size, seed)
+
+
+def _make_solver(instance: BenchInstance, config: BenchConfig, capacity: Union[int, tuple],
+                 solver_options: Optional[Dict[str, Dict]] = None) -> KnapsackAlgorithmBase:
+    """
+    Tạo đối tượng bộ giải cho một cấu hình. solver_options: tham số thêm theo tên bộ giải,
+    ví dụ {"hc": {"delta_evaluation": False, "fitness_cache_bytes": 2**20}}; tiêu chí dừng sớm
+    (ví dụ {"max_evaluations": 10**5} cho mọi bộ giải) giúp so sánh các bộ giải với cùng ngân sách;
+    {"instrument": True} thêm thời gian từng pha vào kết quả.
+    """
+    spec = get_solver(config.solver)
+    kwargs = dict(spec.defaults)
+    kwargs.update((solver_options or {}).get(config.solver, {}))
+    if config.population is not None:
+        kwargs[spec.population_kwarg] = config.population
+    return spec.cls(instance.names, instance.values, instance.solver_weights, capacity,
+                    config.iterations, seed=config.seed, item_bounds=instance.bounds, **kwargs)
+
+
+def run_config(instance: BenchInstance, config: BenchConfig, repeat: int = 1, measure_memory: bool = True,
+               solver_options: Optional[Dict[str, Dict]] = None) -> Dict:
+    """
+    Đo một cấu hình: thời gian thực (nhỏ nhất của `repeat` lần chạy), số lần đánh giá/giây,
+    giá trị tốt nhất và bộ nhớ đỉnh. Bộ nhớ được đo bằng tracemalloc ở một lần chạy riêng
+    để chi phí theo dõi cấp phát không làm sai thời gian.
+    """
+    capacity = instance.capacity(config.capacity_ratio)
+    wall_time, algo = float("inf"), None
+    for _ in range(max(1, repeat)):
+        gc.collect()
+        start = time.perf_counter()
+        candidate = _make_solver(instance, config, capacity, solver_options)
+        candidate.solve()
+        elapsed = time.perf_counter() - start
+        if elapsed < wall_time:
+            wall_time, algo = elapsed, candidate
+
+    peak_memory = None
+    if measure_memory:
+        gc.collect()
+        tracemalloc.start()
+        _make_solver(instance, config, capacity, solver_options).solve()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "instance": instance.name,
+        "n": len(instance.names),
+        "solver": config.solver,
+        "capacity_ratio": config.capacity_ratio,
+        "capacity": capacity,
+        "iterations": config.iterations,
+        "population": config.population,
+        "seed": config.seed,
+        "best_value": int(algo.best_value),
+        "best_weight": int(instance.weights @ algo.item_quantities()),
+        "wall_time": wall_time,
+        "exec_time": algo.exec_time,
+        "evaluations": algo.evaluations,
+        "evals_per_sec": algo.evaluations / wall_time if wall_time > 0 else 0.0,
+        "peak_memory": peak_memory,
+        "cache_hits": None if algo.fitness_cache is None else algo.fitness_cache.hits,
+        "cache_misses": None if algo.fitness_cache is None else algo.fitness_cache.misses,
+        "iterations_run": len(algo.history),
+        "stop_reason": algo.stop_reason,
+        **_phase_fields(algo),
+    }
+
+
+def _phase_fields(algo: KnapsackAlgorithmBase) -> Dict:
+    """Cột thời gian từng pha và số lần sửa nghiệm (None nếu bộ giải không bật instrument)."""
+    fields = {"repairs": None}
+    fields.update((f"time_{phase}_ms", None) for phase in PHASES)
+    if algo.perf is not None:
+        report = algo.performance_report()
+        fields["repairs"] = report["counters"].get("repairs", 0)
+        for phase in PHASES:
+            fields[f"time_{phase}_ms"] = report["phases"].get(phase, {}).get("time_ms", 0.0)
+    return fields
+
+
+def run_benchmark(instances: List[BenchInstance], configs: List[BenchConfig], repeat: int = 1,
+                  measure_memory: bool = True, log=print,
+                  solver_options: Optional[Dict[str, Dict]] = None) -> List[Dict]:
+    """
+    Chạy mọi cấu hình trên mọi bộ dữ liệu, ghi một dòng tóm tắt cho mỗi kết quả.
+    Bộ dữ liệu nhiều ràng buộc bỏ qua các bộ giải chỉ hỗ trợ một ràng buộc.
+    """
+    results = []
+    for instance in instances:
+        runnable = [config for config in configs
+                    if instance.weight_matrix is None or get_solver(config.solver).multi_constraint]
+        # Chạy khởi động (1 vòng lặp, không đo) để chi phí lần gọi đầu tiên không rơi vào cấu hình đầu
+        for config in runnable[:1]:
+            _make_solver(instance, config._replace(iterations=1), instance.capacity(0.5), solver_options).solve()
+        for config in runnable:
+            result = run_config(instance, config, repeat, measure_memory, solver_options)
+            results.append(result)
+            if log is not None:
+                memory = "-" if result["peak_memory"] is None else f"{result['peak_memory'] / 2**20:.1f}MB"
+                cache = "" if result["cache_hits"] is None else \
+                    f" cache={result['cache_hits']}/{result['cache_hits'] + result['cache_misses']}"
+                stop = "" if result["stop_reason"] == "max_iterations" else \
+                    f" stop={result['stop_reason']}@{result['iterations_run']}"
+                log(f"{result_key(result)}: value={result['best_value']} time={result['wall_time']:.4f}s "
+                    f"evals/s={result['evals_per_sec']:.0f} mem={memory}{cache}{stop}")
+    return results
+
+
+def result_key(result: Dict) -> str:
+    """Khóa định danh cấu hình của một kết quả, dùng để so sánh với baseline."""
+    population = "" if result["population"] is None else f" pop={result['population']}"
+    return (f"{result['instance']} {result['solver']} cap={result['capacity_ratio']} "
+            f"iters={result['iterations']}{population} seed={result['seed']}")
+
+
+def measure_startup(module: str = "ui", runs: int = 5) -> Dict:
+    """
+    Đo thời gian import `module` trong tiến trình Python mới (nhỏ nhất của `runs` lần, không tính
+    khởi động trình thông dịch) và liệt kê các module lẽ ra phải nạp lười nhưng đã bị import theo.
+    """
+    lazy = LAZY_MODULES + [spec.target.partition(":")[0] for spec in SOLVERS.values() if isinstance(spec.target, str)]
+    code = (f"import sys, time\nstart = time.perf_counter()\nimport {module}\n"
+            f"print(time.perf_counter() - start)\nprint(' '.join(m for m in {lazy!r} if m in sys.modules))")
+    times, eager = [], set()
+    for _ in range(max(1, runs)):
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.splitlines()
+        times.append(float(output[0]))
+        eager.update(output[1].split() if len(output) > 1 else [])
+    return {"module": module, "runs": len(times), "import_time": min(times),
+            "median_time": sorted(times)[len(times) // 2], "eager_modules": sorted(eager)}
+
+
+def environment_info() -> Dict:
+    """Thông tin môi trường chạy, ghi kèm kết quả để so sánh baseline có ngữ cảnh."""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def save_results(results: List[Dict], filename: str):
+    """Ghi kết quả ra file .csv hoặc .json (theo phần mở rộng)."""
+    if filename.lower().endswith(".csv"):
+        with open(filename, mode='w', encoding='utf-8', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=RESULT_FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+    else:
+        with open(filename, mode='w', encoding='utf-8') as file:
+            json.dump({"environment": environment_info(), "results": results}, file, indent=2)
+
+
+def load_results(filename: str) -> List[Dict]:
+    """Đọc kết quả đã lưu bằng save_results (JSON)."""
+    with open(filename, mode='r', encoding='utf-8') as file:
+        return json.load(file)["results"]
+
+
+def compare_to_baseline(results: List[Dict], baseline: List[Dict], tolerance: float = 0.2) -> List[str]:
+    """
+    So sánh với baseline theo từng cấu hình. Trả về danh sách mô tả hồi quy:
+    giá trị tốt nhất thấp hơn baseline (cùng seed), hoặc thời gian chậm hơn quá `tolerance` (tỉ lệ)
+    và quá MIN_TIME_DELTA giây.
+    """
+    reference = {result_key(r): r for r in baseline}
+    regressions = []
+    for result in results:
+        key = result_key(result)
+        base = reference.get(key)
+        if base is None:
+            continue
+        if result["best_value"] < base["best_value"]:
+            regressions.append(f"{key}: giá trị {result['best_value']} < baseline {base['best_value']}")
+        slower = result["wall_time"] - base["wall_time"]
+        if result["wall_time"] > base["wall_time"] * (1 + tolerance) and slower > MIN_TIME_DELTA:
+            regressions.append(f"{key}: thời gian {result['wall_time']:.4f}s > baseline "
+                               f"{base['wall_time']:.4f}s (+{tolerance:.0%})")
+    return regressions
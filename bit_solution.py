@@ -0,0 +1,115 @@
+import numpy as np
+from typing import Tuple
+
+# Số bit 1 của từng giá trị byte, dùng khi NumPy chưa có np.bitwise_count (< 2.0)
+_BYTE_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+
+def _popcount_words(words: np.ndarray) -> np.ndarray:
+    """Đếm số bit 1 theo từng hàng của mảng từ uint64 (hàng cuối cùng là trục từ)."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    as_bytes = words.view(np.uint8).reshape(words.shape[:-1] + (-1,))
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=-1, dtype=np.int64)
+
+
+def pack_rows(population: np.ndarray) -> np.ndarray:
+    """
+    Nén các nghiệm 0/1 (k x n hoặc n) thành từ uint64: vật phẩm i nằm ở bit i % 64 của từ i // 64.
+    Mỗi nghiệm chiếm n/8 byte thay vì n byte.
+    """
+    population = np.asarray(population, dtype=np.uint8)
+    packed = np.packbits(population, axis=-1, bitorder="little")
+    pad = -packed.shape[-1] % 8
+    if pad:
+        packed = np.concatenate([packed, np.zeros(packed.shape[:-1] + (pad,), dtype=np.uint8)], axis=-1)
+    return np.ascontiguousarray(packed).view("<u8")
+
+
+def unpack_rows(words: np.ndarray, n: int) -> np.ndarray:
+    """Giải nén từ uint64 về nghiệm 0/1 dạng uint8 với n vật phẩm."""
+    as_bytes = np.ascontiguousarray(words, dtype="<u8").view(np.uint8)
+    return np.unpackbits(as_bytes, axis=-1, count=n, bitorder="little")
+
+
+def unique_rows(words: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Tìm các nghiệm trùng nhau trong quần thể đã nén (k x số từ).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: chỉ số hàng đại diện của mỗi nghiệm khác nhau, và với mỗi hàng
+        là số thứ tự nghiệm đại diện của nó (population == population[first][inverse]).
+    """
+    _, first, inverse = np.unique(words, axis=0, return_index=True, return_inverse=True)
+    return first, inverse.reshape(-1)
+
+
+def hamming_distances(words: np.ndarray, other: np.ndarray) -> np.ndarray:
+    """Khoảng cách Hamming (số bit khác nhau, qua XOR) giữa từng hàng của words và một nghiệm nén."""
+    return _popcount_words(np.bitwise_xor(words, other))
+
+
+class BitSolution:
+    """
+    Nghiệm 0/1 nén bit trong mảng từ uint64, có thể băm (dùng làm khóa dict/set).
+
+    Hỗ trợ đếm số vật phẩm được chọn (popcount), XOR và khoảng cách Hamming giữa hai nghiệm.
+    """
+
+    __slots__ = ("words", "n", "_hash")
+
+    def __init__(self, words: np.ndarray, n: int):
+        """Tạo nghiệm từ mảng từ uint64 đã nén (xem pack_rows) và số vật phẩm n."""
+        self.words = np.ascontiguousarray(words, dtype="<u8")
+        self.words.flags.writeable = False
+        self.n = n
+        self._hash = None
+
+    @classmethod
+    def from_array(cls, sol: np.ndarray) -> "BitSolution":
+        """Nén một nghiệm 0/1 dạng mảng."""
+        return cls(pack_rows(sol), len(sol))
+
+    def to_array(self) -> np.ndarray:
+        """Giải nén về mảng uint8 (0/1)."""
+        return unpack_rows(self.words, self.n)
+
+    def popcount(self) -> int:
+        """Số vật phẩm được chọn."""
+        return int(_popcount_words(self.words))
+
+    def hamming(self, other: "BitSolution") -> int:
+        """Số vật phẩm khác nhau giữa hai nghiệm."""
+        return int(hamming_distances(self.words, other.words))
+
+    def __xor__(self, other: "BitSolution") -> "BitSolution":
+        """Các vật phẩm thuộc đúng một trong hai nghiệm."""
+        return BitSolution(np.bitwise_xor(self.words, other.words), self.n)
+
+    def __getitem__(self, index: int) -> int:
+        """Bit của vật phẩm thứ index."""
+        if index < 0:
+            index += self.n
+        if not 0 <= index < self.n:
+            raise IndexError(index)
+        return int(self.words[index >> 6] >> np.uint64(index & 63)) & 1
+
+    def __len__(self) -> int:
+        """Số vật phẩm n."""
+        return self.n
+
+    def __eq__(self, other: object) -> bool:
+        """Hai nghiệm bằng nhau khi chọn cùng tập vật phẩm."""
+        if not isinstance(other, BitSolution):
+            return NotImplemented
+        return self.n == other.n and np.array_equal(self.words, other.words)
+
+    def __hash__(self) -> int:
+        """Băm theo nội dung bit (tính một lần)."""
+        if self._hash is None:
+            self._hash = hash((self.n, self.words.tobytes()))
+        return self._hash
+
+    def __repr__(self) -> str:
+        """Dạng hiển thị ngắn gọn."""
+        return f"BitSolution(n={self.n}, selected={self.popcount()})"
@@ -0,0 +1,229 @@
+import sys
+import json
+import argparse
+import numpy as np
+from typing import List, Optional
+import benchmark
+import instance_generator
+from benchmark import BUNDLED_DATASETS, LARGE_SIZES, STARTUP_TARGET
+from run_control import STOP_REASONS
+from instrumentation import format_report
+from solver_registry import SOLVERS, get_solver
+from instance_generator import KINDS
+
+
+def _add_stopping_arguments(parser: argparse.ArgumentParser):
+    """Thêm các tiêu chí dừng sớm dùng chung cho lệnh run và bench."""
+    parser.add_argument("--time-budget", type=float, default=None, help="Thời gian chạy tối đa mỗi bộ giải (giây)")
+    parser.add_argument("--max-evaluations", type=int, default=None, help="Số lần đánh giá nghiệm tối đa")
+    parser.add_argument("--stall", type=int, default=None, dest="stall_iterations",
+                        help="Dừng khi không cải thiện sau chừng ấy vòng lặp")
+
+
+def _stopping_kwargs(args) -> dict:
+    """Tham số tiêu chí dừng sớm (chỉ những tiêu chí được đặt) để truyền cho bộ giải."""
+    return {name: getattr(args, name) for name in ("time_budget", "max_evaluations", "stall_iterations")
+            if getattr(args, name) is not None}
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Tạo bộ phân tích tham số dòng lệnh với các lệnh con: run, bench, gen và startup."""
+    parser = argparse.ArgumentParser(description="Chạy các thuật toán Knapsack không cần giao diện.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Giải một dataset và in kết quả")
+    run.add_argument("dataset", help="File CSV (hoặc .npy do lệnh gen ghi) dữ liệu vật phẩm")
+    run.add_argument("--solver", nargs="+", choices=list(SOLVERS), default=["hc", "gwo"])
+    run.add_argument("--capacity", type=int, nargs="+", default=[5000],
+                     help="Khối lượng tối đa; nhiều giá trị (mỗi ràng buộc một giá trị) cho dataset nhiều cột trọng lượng")
+    run.add_argument("--iterations", type=int, default=100)
+    run.add_argument("--population", "--wolves", type=int, default=None,
+                     help="Kích thước quần thể (số sói GWO, số cá thể GA); mặc định theo bộ giải")
+    run.add_argument("--seed", type=int, default=None)
+    run.add_argument("--restarts", type=int, default=1, help="Số lần khởi động độc lập (>1 chạy trên nhiều tiến trình)")
+    run.add_argument("--json", action="store_true", help="In kết quả dạng JSON")
+    run.add_argument("--report", action="store_true", help="Đo thời gian từng pha và in báo cáo hiệu năng")
+    run.add_argument("--profile", choices=["cpu", "memory"], default=None,
+                     help="Chụp thêm cProfile (cpu) hoặc tracemalloc (memory) vào báo cáo hiệu năng")
+    _add_stopping_arguments(run)
+
+    bench = commands.add_parser("bench", help="Quét tham số và đo hiệu năng các bộ giải")
+    bench.add_argument("--datasets", nargs="*", default=BUNDLED_DATASETS, help="File CSV cần đo")
+    bench.add_argument("--sizes", nargs="*", type=int, default=[], help="Kích thước bộ dữ liệu sinh ngẫu nhiên")
+    bench.add_argument("--large", action="store_true", help=f"Thêm bộ dữ liệu sinh ngẫu nhiên {LARGE_SIZES}")
+    bench.add_argument("--kinds", nargs="+", choices=KINDS, default=["uncorrelated"],
+                       help="Loại bộ dữ liệu sinh ngẫu nhiên")
+    bench.add_argument("--solver", nargs="+", choices=list(SOLVERS), default=["hc", "gwo"])
+    bench.add_argument("--capacity-ratios", nargs="+", type=float, default=[0.5],
+                       help="Sức chứa theo tỉ lệ tổng khối lượng")
+    bench.add_argument("--iterations", nargs="+", type=int, default=[100])
+    bench.add_argument("--population", "--wolves", nargs="+", type=int, default=None,
+                       help="Các kích thước quần thể cần quét; mặc định theo bộ giải")
+    bench.add_argument("--seeds", nargs="+", type=int, default=[0])
+    bench.add_argument("--repeat", type=int, default=1, help="Số lần chạy mỗi cấu hình (lấy thời gian nhỏ nhất)")
+    bench.add_argument("--no-memory", action="store_true", help="Bỏ qua đo bộ nhớ đỉnh (tracemalloc)")
+    bench.add_argument("--fitness-cache-mb", type=float, default=0,
+                       help="Bật bộ nhớ đệm kết quả đánh giá (LRU) với giới hạn MB; báo cáo hits/misses")
+    bench.add_argument("--full-evaluation", action="store_true",
+                       help="HC tính lại toàn bộ Fitness mỗi lân cận thay vì đánh giá tăng dần")
+    bench.add_argument("--output", help="Ghi kết quả ra file .json hoặc .csv (mặc định in JSON)")
+    bench.add_argument("--baseline", help="So sánh với file kết quả JSON đã lưu; mã thoát 1 nếu hồi quy")
+    bench.add_argument("--tolerance", type=float, default=0.2, help="Mức chậm hơn cho phép so với baseline")
+    bench.add_argument("--instrument", action="store_true", help="Thêm cột thời gian từng pha vào kết quả")
+    _add_stopping_arguments(bench)
+
+    gen = commands.add_parser("gen", help="Sinh bộ dữ liệu tổng hợp ra file .csv hoặc .npy")
+    gen.add_argument("output", help="File đích (.csv hoặc .npy)")
+    gen.add_argument("--n", type=int, required=True, help="Số vật phẩm")
+    gen.add_argument("--kind", choices=KINDS, default="uncorrelated")
+    gen.add_argument("--seed", type=int, default=0)
+    gen.add_argument("--range", type=int, default=1000, dest="value_range", help="Trọng lượng trong [1, range]")
+    startup = commands.add_parser("startup", help="Đo thời gian import giao diện (mã thoát 1 nếu vượt mục tiêu)")
+    startup.add_argument("--module", default="ui", help="Module cần đo (mặc định ui)")
+    startup.add_argument("--runs", type=int, default=5, help="Số lần đo, lấy thời gian nhỏ nhất")
+    startup.add_argument("--target", type=float, default=STARTUP_TARGET, help="Thời gian import tối đa (giây)")
+    return parser
+
+
+def _run(args) -> int:
+    """Lệnh run: giải một dataset bằng các bộ giải đã chọn."""
+    instance = benchmark.load_instance(args.dataset)
+    weights = np.atleast_2d(instance.solver_weights)
+    capacity = args.capacity[0] if len(args.capacity) == 1 else tuple(args.capacity)
+    if len(args.capacity) != len(weights):
+        print(f"Dataset có {len(weights)} ràng buộc trọng lượng, cần {len(weights)} giá trị --capacity", file=sys.stderr)
+        return 2
+    unsupported = [solver for solver in args.solver if len(weights) > 1 and not get_solver(solver).multi_constraint]
+    if unsupported:
+        print(f"Bộ giải chỉ hỗ trợ một ràng buộc trọng lượng: {', '.join(unsupported)}", file=sys.stderr)
+        return 2
+    reports = []
+    for solver in args.solver:
+        spec = get_solver(solver)
+        kwargs = dict(spec.defaults, **_stopping_kwargs(args))
+        if args.report or args.profile:
+            kwargs.update(instrument=True, profile=args.profile)
+        if args.population is not None and spec.population_kwarg is not None:
+            kwargs[spec.population_kwarg] = args.population
+        if args.restarts > 1:
+            from parallel_runner import ParallelRunner
+            with ParallelRunner(instance.names, instance.values, instance.solver_weights,
+                                item_bounds=instance.bounds) as runner:
+                result = runner.run_restarts(spec.cls, capacity, args.iterations, args.restarts,
+                                             args.seed, **kwargs)
+            best_value, indices, exec_time = result.best_value, result.best_indices, result.exec_time
+            quantities = result.quantities
+            stop_reason, performance = result.stop_reason, result.performance
+            seed, stream = result.seed, result.seed_stream
+        else:
+            algo = spec.cls(instance.names, instance.values, instance.solver_weights, capacity,
+                            args.iterations, seed=args.seed, item_bounds=instance.bounds, **kwargs)
+            algo.solve()
+            quantities = algo.item_quantities()
+            indices = np.flatnonzero(quantities)
+            quantities = quantities[indices]
+            best_value, exec_time = algo.best_value, algo.exec_time
+            stop_reason = algo.stop_reason
+            performance = algo.performance_report() if algo.perf is not None else None
+            seed, stream = algo.seed, algo.seed_stream
+        loads = (weights[:, indices] * quantities).sum(axis=1).tolist()
+        reports.append({
+            "solver": solver,
+            "best_value": int(best_value),
+            "best_weight": loads[0] if len(loads) == 1 else loads,
+            "capacity": args.capacity[0] if len(args.capacity) == 1 else args.capacity,
+            "exec_time": exec_time,
+            "stop_reason": stop_reason,
+            "seed": seed,
+            "seed_stream": list(stream),
+            "performance": performance,
+            "selected": [instance.names[i] if q == 1 else f"{instance.names[i]} x{q}"
+                         for i, q in zip(indices.tolist(), quantities.tolist())],
+        })
+
+    if args.json:
+        print(json.dumps(reports, ensure_ascii=False, indent=2))
+    else:
+        for report in reports:
+            print(f"Thuật toán: {report['solver']}")
+            loads = np.atleast_1d(report['best_weight']).tolist()
+            capacities = np.atleast_1d(report['capacity']).tolist()
+            used = ", ".join(f"{load}/{limit}" for load, limit in zip(loads, capacities))
+            print(f"Tổng giá trị: {report['best_value']}\nTổng khối lượng: {used}")
+            print(f"Số vật phẩm được chọn: {len(report['selected'])}\nThời gian: {report['exec_time']:.4f}s")
+            print(f"Lý do dừng: {STOP_REASONS.get(report['stop_reason'], report['stop_reason'])}")
+            stream = f" (luồng con {report['seed_stream']})" if report["seed_stream"] else ""
+            print(f"Seed: {report['seed']}{stream}\n")
+            if report["performance"] is not None:
+                print(format_report(report["performance"]) + "\n")
+    return 0
+
+
+def _bench(args) -> int:
+    """Lệnh bench: quét tham số, ghi kết quả và (tùy chọn) so sánh với baseline."""
+    log = lambda line: print(line, file=sys.stderr)
+    instances = [benchmark.load_instance(name) for name in args.datasets]
+    sizes = args.sizes + (LARGE_SIZES if args.large else [])
+    configs = list(benchmark.sweep(args.solver, args.capacity_ratios, args.iterations, args.population, args.seeds))
+    options = {solver: _stopping_kwargs(args) for solver in args.solver}
+    if args.instrument:
+        for solver_options in options.values():
+            solver_options['instrument'] = True
+    if args.fitness_cache_mb > 0:
+        for solver_options in options.values():
+            solver_options['fitness_cache_bytes'] = int(args.fitness_cache_mb * 2**20)
+    if args.full_evaluation and "hc" in options:
+        options["hc"]['delta_evaluation'] = False
+
+    results = []
+    for instance in instances:
+        results += benchmark.run_benchmark([instance], configs, args.repeat, not args.no_memory, log, options)
+    for kind in args.kinds:
+        for n in sizes:
+            # Sinh và đo từng bộ lớn một để không giữ nhiều bộ dữ liệu 1 triệu vật phẩm cùng lúc
+            results += benchmark.run_benchmark([benchmark.generate_instance(n, kind)], configs, args.repeat,
+                                               not args.no_memory, log, options)
+
+    if args.output:
+        benchmark.save_results(results, args.output)
+    else:
+        print(json.dumps({"environment": benchmark.environment_info(), "results": results}, indent=2))
+
+    if args.baseline:
+        regressions = benchmark.compare_to_baseline(results, benchmark.load_results(args.baseline), args.tolerance)
+        for line in regressions:
+            log(f"HỒI QUY: {line}")
+        if regressions:
+            return 1
+        log("Không có hồi quy so với baseline.")
+    return 0
+
+
+def _gen(args) -> int:
+    """Lệnh gen: ghi bộ dữ liệu tổng hợp theo từng đoạn và in sức chứa gợi ý (một nửa tổng trọng lượng)."""
+    writer = instance_generator.write_binary if args.output.lower().endswith(".npy") else instance_generator.write_csv
+    total_weight = writer(args.output, args.n, args.kind, args.seed, args.value_range)
+    print(f"Đã ghi {args.n} vật phẩm ({args.kind}, seed={args.seed}) vào {args.output}; "
+          f"tổng khối lượng {total_weight}, sức chứa gợi ý {total_weight // 2}")
+    return 0
+
+
+def _startup(args) -> int:
+    """Lệnh startup: đo thời gian import giao diện và kiểm tra các module nặng vẫn được nạp lười."""
+    result = benchmark.measure_startup(args.module, args.runs)
+    print(f"import {result['module']}: {result['import_time'] * 1000:.1f}ms (trung vị {result['median_time'] * 1000:.1f}ms, "
+          f"mục tiêu {args.target * 1000:.0f}ms)")
+    if result["eager_modules"]:
+        print(f"Module lẽ ra phải nạp lười: {', '.join(result['eager_modules'])}", file=sys.stderr)
+    return 1 if result["import_time"] > args.target or result["eager_modules"] else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Điểm khởi chạy dòng lệnh (không cần giao diện)."""
+    args = _build_parser().parse_args(argv)
+    commands = {"run": _run, "bench": _bench, "gen": _gen, "startup": _startup}
+    return commands[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
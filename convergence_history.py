@@ -0,0 +1,102 @@
+import time
+from array import array
+import numpy as np
+from typing import List, Tuple, Union
+
+
+class ConvergenceHistory:
+    """
+    Lịch sử hội tụ dạng mảng gọn: mỗi vòng lặp lưu giá trị tốt nhất và trọng lượng trong bộ đệm array('q').
+
+    Đồng hồ chỉ được đọc ở các mốc (mark, gọi tại checkpoint và cuối lần chạy) để append đủ rẻ cho
+    vòng lặp vài trăm ns; thời điểm của từng vòng lặp được nội suy tuyến tính giữa các mốc.
+
+    Chuỗi "Lần i: ..." chỉ được định dạng khi truy cập phần tử (ví dụ khi người dùng cuộn tới),
+    nên đối tượng vẫn dùng được như một danh sách chuỗi: len(), history[i], vòng lặp for.
+    """
+
+    def __init__(self):
+        """Khởi tạo lịch sử rỗng."""
+        self._values = array('q')
+        self._weights = array('q')
+        # Mốc thời gian: số vòng lặp đã ghi và thời điểm (ns, tính từ lúc tạo) khi đặt mốc
+        self._mark_counts = array('q', [0])
+        self._mark_times = array('q', [0])
+        self._start_ns = time.perf_counter_ns()
+
+    def append(self, best_value: int, weight: int):
+        """Ghi nhận một vòng lặp."""
+        self._values.append(best_value)
+        self._weights.append(weight)
+
+    def mark(self):
+        """Đặt mốc thời gian sau các vòng lặp đã ghi."""
+        if len(self._values) > self._mark_counts[-1]:
+            self._mark_counts.append(len(self._values))
+            self._mark_times.append(time.perf_counter_ns() - self._start_ns)
+
+    def extend(self, other: "ConvergenceHistory"):
+        """Nối lịch sử của một đoạn chạy tiếp theo (mốc thời gian được dời sau mốc cuối)."""
+        count, offset = len(self._values), self._mark_times[-1]
+        self._values.extend(other._values)
+        self._weights.extend(other._weights)
+        self._mark_counts.extend(c + count for c in other._mark_counts[1:])
+        self._mark_times.extend(t + offset for t in other._mark_times[1:])
+
+    def __len__(self) -> int:
+        """Số vòng lặp đã ghi."""
+        return len(self._values)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        """Định dạng (lười) dòng lịch sử thứ index."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return f"Lần {index}: Giá trị={self._values[index]}, Trọng lượng={self._weights[index]}"
+
+    def __iter__(self):
+        """Duyệt các dòng lịch sử đã định dạng."""
+        return (self[i] for i in range(len(self)))
+
+    @property
+    def best_values(self) -> np.ndarray:
+        """
+        Giá trị tốt nhất theo từng vòng lặp (bản sao int64). Không trả về view của bộ đệm array('q'):
+        khi người gọi còn giữ view, lần append tiếp theo không thể nới bộ đệm và báo BufferError.
+        """
+        return np.array(self._values, dtype=np.int64)
+
+    @property
+    def weights(self) -> np.ndarray:
+        """Trọng lượng theo từng vòng lặp (bản sao int64, xem best_values)."""
+        return np.array(self._weights, dtype=np.int64)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Thời điểm (ns) kết thúc từng vòng lặp, nội suy tuyến tính giữa các mốc."""
+        counts = np.array(self._mark_counts, dtype=np.int64)
+        times = np.array(self._mark_times, dtype=np.int64)
+        return np.interp(np.arange(1, len(self) + 1), counts, times).astype(np.int64)
+
+
+def downsample_minmax(y: np.ndarray, max_points: int = 2000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Giảm số điểm của một chuỗi để vẽ nhanh mà vẫn giữ cực trị: chia thành các nhóm bằng nhau
+    và giữ điểm nhỏ nhất, lớn nhất của mỗi nhóm cùng điểm đầu, điểm cuối.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: chỉ số (trục x) và giá trị tương ứng.
+    """
+    y = np.asarray(y)
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n), y
+
+    buckets = max(1, max_points // 2)
+    size = -(-n // buckets)
+    padded = np.concatenate([y, np.full(buckets * size - n, y[-1], dtype=y.dtype)]).reshape(buckets, size)
+    base = np.arange(buckets) * size
+    keep = np.concatenate([[0, n - 1], base + padded.argmin(axis=1), base + padded.argmax(axis=1)])
+    keep = np.unique(np.minimum(keep, n - 1))
+    return keep, y[keep]
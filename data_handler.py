@@ -1,44 +1,216 @@
 import csv
-from typing import List, Dict, Tuple
+import os
+import hashlib
+import warnings
+import numpy as np
+from typing import List, Dict, Optional, Tuple
 
-def load_knapsack_data_from_csv(filename: str) -> Dict[str, List]:
+# Thư mục chứa cache nhị phân, đặt cạnh file CSV
+CACHE_DIR_NAME = ".knapsack_cache"
+
+# Tên cột (không phân biệt hoa thường) chứa số lượng tối đa của từng vật phẩm trong CSV mở rộng
+BOUND_COLUMNS = ("bound", "quantity")
+
+
+def _cache_paths(filename: str) -> Tuple[str, str, str]:
+    """Đường dẫn cache (mảng số, tên, dòng lỗi) gắn với kích thước và thời điểm sửa đổi của file CSV."""
+    stat = os.stat(filename)
+    key = hashlib.sha1(f"{os.path.abspath(filename)}|{stat.st_size}|{stat.st_mtime_ns}".encode()).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    base = os.path.join(os.path.dirname(os.path.abspath(filename)), CACHE_DIR_NAME, f"{stem}-{key}")
+    return base + ".items.npy", base + ".names.npy", base + ".bad.npy"
+
+
+def _read_layout(filename: str) -> Tuple[List[int], List[str], bool]:
+    """
+    Đọc header để biết bố cục cột: Name,Value,Weight[,Volume,Budget,...][,Bound].
+    Mỗi cột sau Value là một ràng buộc trọng lượng, trừ cột có tên trong BOUND_COLUMNS (số lượng tối đa).
+
+    Returns:
+        Tuple: chỉ số các cột số theo thứ tự chuẩn (giá trị, các trọng lượng, giới hạn số lượng),
+        tên các ràng buộc trọng lượng và có cột giới hạn số lượng hay không.
+    """
+    with open(filename, mode='r', encoding='utf-8-sig', newline='') as file:
+        header = [column.strip() for column in next(csv.reader(file), [])]
+    bound_columns = [i for i in range(2, len(header)) if header[i].lower() in BOUND_COLUMNS]
+    if len(bound_columns) > 1:
+        raise ValueError(f"File {filename} có nhiều hơn một cột số lượng tối đa")
+    weight_columns = [i for i in range(2, len(header)) if i not in bound_columns] or [2]
+    dimensions = [header[i] if i < len(header) else "Weight" for i in weight_columns]
+    return [1] + weight_columns + bound_columns, dimensions, bool(bound_columns)
+
+
+def split_items(items: np.ndarray, dimensions: int, bounded: bool) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """
+    Tách mảng items (hàng 0: giá trị, các hàng trọng lượng, hàng giới hạn số lượng nếu có) thành
+    (giá trị, trọng lượng, giới hạn số lượng hoặc None); trọng lượng là mảng 1-D khi chỉ có một ràng buộc,
+    ma trận m x n khi có nhiều ràng buộc, đúng dạng các bộ giải nhận.
+    """
+    weights = items[1] if dimensions == 1 else items[1:1 + dimensions]
+    return items[0], weights, items[1 + dimensions] if bounded else None
+
+
+def _load_fast(filename: str, columns: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Đường nhanh cho file hợp lệ: bộ phân tích C của np.loadtxt đọc thẳng các cột số
+    thành int64 và cột tên. Ném ValueError nếu có bất kỳ dòng nào sai định dạng.
+    """
+    options = dict(delimiter=",", quotechar='"', skiprows=1, encoding="utf-8-sig")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)  # File chỉ có header
+        items = np.loadtxt(filename, dtype=np.int64, usecols=columns, ndmin=2, **options)
+        names = np.loadtxt(filename, dtype=object, usecols=(0,), ndmin=1, **options)
+    return names.astype(str), np.ascontiguousarray(items.T)
+
+
+def _read_columns(filename: str, columns: List[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[int]]:
+    """
+    Đọc cột tên và các cột số (theo thứ tự `columns`) dạng chuỗi; dòng trống bị bỏ qua,
+    dòng thiếu cột được ghi nhận là dòng lỗi.
+    Returns: (tên, bảng chuỗi len(columns) x số dòng, số dòng trong file của từng dòng đọc được, số dòng lỗi).
+    """
+    rows, lines, bad_rows = [], [], []
+    last = max(columns)
+    with open(filename, mode='r', encoding='utf-8-sig', newline='') as file:
+        reader = csv.reader(file)
+        next(reader, None)  # Bỏ qua header
+        for row in reader:
+            if len(row) > last:
+                rows.append([row[0]] + [row[i] for i in columns])
+                lines.append(reader.line_num)
+            elif row:
+                bad_rows.append(reader.line_num)
+    table = np.array(rows, dtype=str).reshape(-1, 1 + len(columns))
+    return table[:, 0], table[:, 1:].T, np.array(lines, dtype=np.int64), bad_rows
+
+
+def _parse_int_column(column: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Chuyển một cột chuỗi sang int64 theo lô. Trả về (giá trị, mặt nạ dòng hợp lệ)."""
+    stripped = np.char.strip(column)
+    digits = np.char.lstrip(stripped, "+-")
+    valid = np.char.isdigit(digits) & (np.char.str_len(stripped) - np.char.str_len(digits) <= 1)
+    parsed = np.zeros(len(column), dtype=np.int64)
+    parsed[valid] = stripped[valid].astype(np.int64)
+    return parsed, valid
+
+
+def _parse_csv(filename: str, columns: List[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Phân tích file CSV thành (mảng tên, mảng len(columns) x n các cột số, số dòng lỗi)."""
+    try:
+        names, items = _load_fast(filename, columns)
+        return names, items, np.zeros(0, dtype=np.int64)
+    except ValueError:
+        pass  # Có dòng sai định dạng: kiểm tra toàn bộ theo lô để báo cáo
+
+    names, table, lines, bad_rows = _read_columns(filename, columns)
+    parsed = [_parse_int_column(column) for column in table]
+
+    ok = np.logical_and.reduce([valid for _, valid in parsed])
+    if not ok.all():
+        # Thêm số dòng trong file của các dòng đọc được nhưng không phải là số
+        bad_rows = sorted(bad_rows + lines[~ok].tolist())
+
+    items = np.ascontiguousarray(np.stack([column[ok] for column, _ in parsed]))
+    return names[ok], items, np.array(bad_rows, dtype=np.int64)
+
+
+def _write_cache(paths: Tuple[str, str, str], names: np.ndarray, items: np.ndarray, bad_rows: np.ndarray):
+    """Ghi cache nhị phân (ghi file tạm rồi đổi tên để tiến trình khác không đọc phải file dở dang)."""
+    os.makedirs(os.path.dirname(paths[0]), exist_ok=True)
+    for path, array in zip(paths, (items, names, bad_rows)):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            np.save(file, array)
+        os.replace(tmp_path, path)
+
+
+def _load_binary(filename: str) -> Dict[str, np.ndarray]:
+    """
+    Mở file .npy ((1 + m) x n: giá trị rồi m hàng trọng lượng) do instance_generator ghi bằng memory map;
+    tên vật phẩm là Item_1 ... Item_n.
+    """
+    items = np.load(filename, mmap_mode='r')
+    if items.ndim != 2 or items.shape[0] < 2:
+        raise ValueError(f"File nhị phân {filename} phải chứa mảng (1 + m) x n, nhận được {items.shape}")
+    names = np.char.add("Item_", np.arange(1, items.shape[1] + 1).astype(str))
+    dimensions = ["Weight"] + [f"Weight_{j}" for j in range(2, items.shape[0])]
+    return {'names': names, 'items': items, 'bad_rows': np.zeros(0, dtype=np.int64),
+            'dimensions': dimensions, 'bounded': False}
+
+
+def load_knapsack_arrays(filename: str, use_cache: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Tải dữ liệu vật phẩm dưới dạng mảng NumPy có kiểu.
+
+    Lần đầu phân tích file CSV theo lô và ghi cache nhị phân (.npy) vào thư mục .knapsack_cache
+    cạnh file, khóa theo kích thước và thời điểm sửa đổi. Các lần sau mở cache bằng memory map
+    chỉ đọc, nên tải gần như tức thì và nhiều tiến trình có thể dùng chung một bản trong bộ nhớ.
+    File .npy (định dạng nhị phân của instance_generator) được mở thẳng bằng memory map.
+
+    CSV mở rộng có thể có nhiều cột trọng lượng (mỗi cột một ràng buộc, ví dụ Weight,Volume,Budget)
+    và một cột số lượng tối đa (Bound), xem _read_layout; tách 'items' bằng split_items.
+
+    Returns:
+        Dict[str, np.ndarray]: 'names' (chuỗi), 'items' (int64, hàng 0: giá trị, tiếp theo m hàng trọng lượng,
+        cuối cùng là số lượng tối đa nếu có), 'bad_rows' (số dòng bị bỏ qua vì sai định dạng),
+        'dimensions' (tên m ràng buộc trọng lượng) và 'bounded' (có hàng số lượng tối đa hay không).
+    """
+    if filename.lower().endswith(".npy"):
+        return _load_binary(filename)
+
+    columns, dimensions, bounded = _read_layout(filename)
+    paths = _cache_paths(filename) if use_cache else None
+    if paths and all(os.path.exists(p) for p in paths):
+        try:
+            return {
+                'names': np.load(paths[1], mmap_mode='r'),
+                'items': np.load(paths[0], mmap_mode='r'),
+                'bad_rows': np.load(paths[2]),
+                'dimensions': dimensions,
+                'bounded': bounded,
+            }
+        except (OSError, ValueError):
+            pass  # Cache hỏng: phân tích lại file CSV
+
+    names, items, bad_rows = _parse_csv(filename, columns)
+    if paths:
+        try:
+            _write_cache(paths, names, items, bad_rows)
+        except OSError as e:
+            print(f"Cảnh báo: Không ghi được cache cho {filename}: {e}")
+    return {'names': names, 'items': items, 'bad_rows': bad_rows, 'dimensions': dimensions, 'bounded': bounded}
+
+
+def load_knapsack_data_from_csv(filename: str, use_cache: bool = True) -> Dict[str, List]:
     """"
     Tải dữ liệu vật phẩm từ file CSV được chỉ định.
-    
+
     Args:
-        filename (str): Tên file CSV cần tải.
+        filename (str): Tên file CSV cần tải (hoặc file .npy do instance_generator ghi).
+        use_cache (bool): Dùng/ghi cache nhị phân (xem load_knapsack_arrays).
 
     Returns:
-        Dict[str, List]: Dictionary chứa 'names', 'values', và 'weights'.
+        Dict[str, List]: Dictionary chứa 'names' (list), 'values' và 'weights' (mảng int64 chỉ đọc; 'weights'
+        là ràng buộc đầu tiên), 'weight_matrix' (m x n, mọi ràng buộc), 'dimensions' (tên các ràng buộc),
+        'bounds' (số lượng tối đa của từng vật phẩm hoặc None), 'bad_rows' (danh sách số dòng sai định dạng đã bỏ qua).
     """
-    item_names = []
-    item_values = []
-    item_weights = []
-    
+    empty = {'names': [], 'values': [], 'weights': [], 'weight_matrix': [], 'dimensions': [], 'bounds': None,
+             'bad_rows': []}
     try:
-        with open(filename, mode='r', encoding='utf-8-sig') as file:
-            reader = csv.reader(file)
-            header = next(reader) # Bỏ qua header
-            
-            for row in reader:
-                if len(row) >= 3:
-                    try:
-                        # Giả định cột 0: Tên, 1: Giá trị, 2: Khối lượng
-                        name = row[0] 
-                        value = int(row[1]) 
-                        weight = int(row[2]) 
-                        
-                        item_names.append(name)
-                        item_values.append(value)
-                        item_weights.append(weight)
-                    except ValueError:
-                        continue # Bỏ qua dòng có dữ liệu không phải là số
-                        
+        data = load_knapsack_arrays(filename, use_cache)
     except FileNotFoundError:
         print(f"Lỗi: Không tìm thấy file dữ liệu {filename}.")
-        return {'names': [], 'values': [], 'weights': []}
+        return empty
     except Exception as e:
         print(f"Lỗi khi đọc file {filename}: {e}")
-        return {'names': [], 'values': [], 'weights': []}
-        
-    return {'names': item_names, 'values': item_values, 'weights': item_weights}
\ No newline at end of file
+        return empty
+
+    bad_rows = data['bad_rows'].tolist()
+    if bad_rows:
+        preview = ", ".join(map(str, bad_rows[:10])) + (", ..." if len(bad_rows) > 10 else "")
+        print(f"Cảnh báo: Bỏ qua {len(bad_rows)} dòng sai định dạng trong {filename} (dòng {preview}).")
+
+    items, m = data['items'], len(data['dimensions'])
+    values, _, bounds = split_items(items, m, data['bounded'])
+    return {'names': data['names'].tolist(), 'values': values, 'weights': items[1], 'weight_matrix': items[1:1 + m],
+            'dimensions': data['dimensions'], 'bounds': bounds, 'bad_rows': bad_rows}
\ No newline at end of file
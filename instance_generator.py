@@ -0,0 +1,94 @@
+import numpy as np
+from typing import Iterator, Tuple
+
+# Các loại bộ dữ liệu kinh điển của bài toán Knapsack (theo mức tương quan giá trị - trọng lượng)
+KINDS = ("uncorrelated", "weakly_correlated", "strongly_correlated", "subset_sum")
+
+# Số vật phẩm mỗi đoạn sinh; mỗi đoạn có bộ sinh số riêng nên kết quả không phụ thuộc cách ghi
+CHUNK_ITEMS = 1 << 16
+
+
+def _chunk_rng(seed: int, chunk: int) -> np.random.Generator:
+    """Bộ sinh số của đoạn thứ `chunk`, suy ra từ seed bằng SeedSequence (tái lập được)."""
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(chunk,)))
+
+
+def generate_chunks(n: int, kind: str = "uncorrelated", seed: int = 0,
+                    value_range: int = 1000) -> Iterator[Tuple[int, np.ndarray, np.ndarray]]:
+    """
+    Sinh bộ dữ liệu n vật phẩm theo từng đoạn CHUNK_ITEMS, không giữ toàn bộ trong bộ nhớ.
+
+    Với R = value_range, trọng lượng w ~ U[1, R] và giá trị v:
+    - uncorrelated: v ~ U[1, R]
+    - weakly_correlated: v ~ U[w - R/10, w + R/10] (tối thiểu 1)
+    - strongly_correlated: v = w + R/10
+    - subset_sum: v = w
+
+    Yields:
+        Tuple[int, np.ndarray, np.ndarray]: chỉ số vật phẩm đầu đoạn, giá trị và trọng lượng (int64).
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Loại bộ dữ liệu không hợp lệ: {kind} (chọn trong {', '.join(KINDS)})")
+    if n < 0 or value_range < 1:
+        raise ValueError("n phải không âm và value_range phải >= 1")
+    spread = max(1, value_range // 10)
+
+    for chunk, start in enumerate(range(0, n, CHUNK_ITEMS)):
+        size = min(CHUNK_ITEMS, n - start)
+        rng = _chunk_rng(seed, chunk)
+        weights = rng.integers(1, value_range + 1, size=size, dtype=np.int64)
+        if kind == "uncorrelated":
+            values = rng.integers(1, value_range + 1, size=size, dtype=np.int64)
+        elif kind == "weakly_correlated":
+            values = np.maximum(1, weights + rng.integers(-spread, spread + 1, size=size, dtype=np.int64))
+        elif kind == "strongly_correlated":
+            values = weights + spread
+        else:
+            values = weights.copy()
+        yield start, values, weights
+
+
+def generate_arrays(n: int, kind: str = "uncorrelated", seed: int = 0,
+                    value_range: int = 1000) -> Tuple[np.ndarray, np.ndarray]:
+    """Sinh toàn bộ bộ dữ liệu trong bộ nhớ. Returns: (giá trị, trọng lượng) dạng int64."""
+    items = np.empty((2, n), dtype=np.int64)
+    for start, values, weights in generate_chunks(n, kind, seed, value_range):
+        items[0, start:start + len(values)] = values
+        items[1, start:start + len(values)] = weights
+    return items[0], items[1]
+
+
+def write_csv(filename: str, n: int, kind: str = "uncorrelated", seed: int = 0, value_range: int = 1000) -> int:
+    """
+    Ghi bộ dữ liệu ra CSV (Name,Value,Weight) theo từng đoạn, tên vật phẩm Item_1 ... Item_n.
+
+    Returns:
+        int: Tổng trọng lượng (để chọn sức chứa, ví dụ một nửa tổng).
+    """
+    total_weight = 0
+    with open(filename, mode='w', encoding='utf-8', newline='') as file:
+        file.write("Name,Value,Weight\n")
+        for start, values, weights in generate_chunks(n, kind, seed, value_range):
+            ids = np.arange(start + 1, start + 1 + len(values), dtype=np.int64)
+            np.savetxt(file, np.column_stack((ids, values, weights)), fmt="Item_%d,%d,%d")
+            total_weight += int(weights.sum())
+    return total_weight
+
+
+def write_binary(filename: str, n: int, kind: str = "uncorrelated", seed: int = 0, value_range: int = 1000) -> int:
+    """
+    Ghi bộ dữ liệu ra file .npy (int64, hàng 0: giá trị, hàng 1: trọng lượng) qua memory map,
+    cùng định dạng với cache nhị phân của data_handler; tải lại bằng load_knapsack_data_from_csv.
+
+    Returns:
+        int: Tổng trọng lượng.
+    """
+    items = np.lib.format.open_memmap(filename, mode='w+', dtype=np.int64, shape=(2, n))
+    total_weight = 0
+    for start, values, weights in generate_chunks(n, kind, seed, value_range):
+        items[0, start:start + len(values)] = values
+        items[1, start:start + len(values)] = weights
+        total_weight += int(weights.sum())
+    items.flush()
+    del items
+    return total_weight
@@ -0,0 +1,171 @@
+import io
+import time
+import pstats
+import cProfile
+import tracemalloc
+from contextlib import nullcontext
+from typing import Dict, List, Optional
+
+# Các pha được bấm giờ (theo thứ tự báo cáo); Class con có thể dùng thêm tên pha khác
+PHASES = ("init", "update", "repair", "evaluation", "leaders")
+
+# Số dòng giữ lại trong báo cáo cProfile / tracemalloc
+PROFILE_TOP = 15
+
+# Context manager rỗng dùng chung khi tắt đo đạc, để `with` gần như không tốn gì
+NULL_SECTION = nullcontext()
+
+
+class _Section:
+    """Context manager bấm giờ một pha của PerfStats."""
+    __slots__ = ("_stats", "_name")
+
+    def __init__(self, stats: "PerfStats", name: str):
+        self._stats = stats
+        self._name = name
+
+    def __enter__(self):
+        self._stats._enter(self._name)
+
+    def __exit__(self, *exc):
+        self._stats._exit()
+        return False
+
+
+class PerfStats:
+    """
+    Bộ đo hiệu năng của một lần chạy: thời gian từng pha (perf_counter_ns), bộ đếm
+    và (tùy chọn) ảnh chụp cProfile / tracemalloc.
+
+    Thời gian là thời gian riêng (exclusive): khi một pha lồng trong pha khác (ví dụ đánh giá
+    bên trong khởi tạo), thời gian của pha ngoài tạm dừng, nên tổng các pha không bị tính trùng.
+    Chỉ bấm giờ ở mức cả quần thể hoặc cả vòng lặp, không bấm từng bước đảo bit.
+    """
+
+    def __init__(self, profile: Optional[str] = None):
+        """profile: None, "cpu" (cProfile) hoặc "memory" (tracemalloc)."""
+        if profile not in (None, "cpu", "memory"):
+            raise ValueError(f"profile không hợp lệ: {profile}")
+        self.profile = profile
+        self.times_ns: Dict[str, int] = {}
+        self.calls: Dict[str, int] = {}
+        self.counters: Dict[str, int] = {}
+        self._stack: List[list] = []  # [tên pha, thời điểm bắt đầu đoạn đang tính]
+        self._profiler = None
+        self._started_tracemalloc = False
+        self.cpu_profile: List[Dict] = []
+        self.memory_profile: Dict = {}
+
+    def section(self, name: str) -> _Section:
+        """Context manager bấm giờ pha `name`."""
+        return _Section(self, name)
+
+    def _enter(self, name: str):
+        now = time.perf_counter_ns()
+        parent = self._stack[-1] if self._stack else None
+        if parent is not None:
+            self.times_ns[parent[0]] = self.times_ns.get(parent[0], 0) + now - parent[1]
+        self._stack.append([name, now])
+        # Pha lồng trong chính nó (ví dụ sửa nghiệm gọi lại sửa cả quần thể) chỉ tính một lần gọi
+        if parent is None or parent[0] != name:
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def _exit(self):
+        now = time.perf_counter_ns()
+        name, start = self._stack.pop()
+        self.times_ns[name] = self.times_ns.get(name, 0) + now - start
+        if self._stack:
+            self._stack[-1][1] = now
+
+    def count(self, name: str, k: int = 1):
+        """Cộng k vào bộ đếm `name`."""
+        self.counters[name] = self.counters.get(name, 0) + k
+
+    def start_profiling(self):
+        """Bắt đầu cProfile hoặc tracemalloc theo profile (gọi ở đầu lần chạy)."""
+        if self.profile == "cpu":
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif self.profile == "memory" and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def stop_profiling(self):
+        """Dừng đo và lưu ảnh chụp gọn (các hàm/dòng tốn nhiều nhất) vào báo cáo."""
+        if self._profiler is not None:
+            self._profiler.disable()
+            stats = pstats.Stats(self._profiler, stream=io.StringIO()).sort_stats("cumulative")
+            self.cpu_profile = [
+                {"function": f"{file}:{line}({func})", "calls": nc, "tottime": tt, "cumtime": ct}
+                for (file, line, func), (_, nc, tt, ct, _) in
+                sorted(stats.stats.items(), key=lambda item: -item[1][3])[:PROFILE_TOP]
+            ]
+            self._profiler = None
+        elif self.profile == "memory" and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            self.memory_profile = {
+                "current": current,
+                "peak": peak,
+                "top": [{"location": str(stat.traceback), "size": stat.size, "count": stat.count}
+                        for stat in snapshot.statistics("lineno")[:PROFILE_TOP]],
+            }
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+
+    def report(self, total_seconds: Optional[float] = None) -> Dict:
+        """
+        Báo cáo dạng dict (ghi được ra JSON): thời gian (ms), số lần gọi và tỉ lệ của từng pha,
+        các bộ đếm và ảnh chụp profile nếu có. total_seconds dùng để tính phần thời gian ngoài các pha.
+        """
+        names = [name for name in PHASES if name in self.times_ns]
+        names += sorted(name for name in self.times_ns if name not in PHASES)
+        measured_ns = sum(self.times_ns.values())
+        total_ns = max(measured_ns, int(total_seconds * 1e9)) if total_seconds is not None else measured_ns
+        phases = {
+            name: {
+                "time_ms": self.times_ns[name] / 1e6,
+                "calls": self.calls.get(name, 0),
+                "share": self.times_ns[name] / total_ns if total_ns else 0.0,
+            }
+            for name in names
+        }
+        report = {"phases": phases, "other_ms": (total_ns - measured_ns) / 1e6, "counters": dict(self.counters)}
+        if self.cpu_profile:
+            report["cpu_profile"] = self.cpu_profile
+        if self.memory_profile:
+            report["memory_profile"] = self.memory_profile
+        return report
+
+
+def merge_reports(reports: List[Dict]) -> Dict:
+    """Cộng dồn các báo cáo (ví dụ các epoch của một đảo GWO); tỉ lệ được tính lại trên tổng."""
+    merged: Dict = {"phases": {}, "other_ms": 0.0, "counters": {}}
+    for report in reports:
+        merged["other_ms"] += report["other_ms"]
+        for name, phase in report["phases"].items():
+            target = merged["phases"].setdefault(name, {"time_ms": 0.0, "calls": 0, "share": 0.0})
+            target["time_ms"] += phase["time_ms"]
+            target["calls"] += phase["calls"]
+        for name, value in report["counters"].items():
+            merged["counters"][name] = merged["counters"].get(name, 0) + value
+    total_ms = merged["other_ms"] + sum(phase["time_ms"] for phase in merged["phases"].values())
+    for phase in merged["phases"].values():
+        phase["share"] = phase["time_ms"] / total_ms if total_ms else 0.0
+    return merged
+
+
+def format_report(report: Dict) -> str:
+    """Trình bày báo cáo thành bảng chữ (dùng cho tab Hiệu năng và dòng lệnh)."""
+    lines = [f"{'Pha':<12}{'Thời gian (ms)':>16}{'Số lần':>10}{'Tỉ lệ':>9}"]
+    for name, phase in report["phases"].items():
+        lines.append(f"{name:<12}{phase['time_ms']:>16.3f}{phase['calls']:>10}{phase['share']:>8.1%}")
+    lines.append(f"{'khác':<12}{report['other_ms']:>16.3f}")
+    for name, value in report["counters"].items():
+        lines.append(f"{name}: {value}")
+    for entry in report.get("cpu_profile", [])[:5]:
+        lines.append(f"  {entry['cumtime'] * 1000:9.2f}ms  {entry['calls']:>8}  {entry['function']}")
+    if report.get("memory_profile"):
+        lines.append(f"Bộ nhớ đỉnh: {report['memory_profile']['peak'] / 2**20:.2f}MB")
+    return "\n".join(lines)
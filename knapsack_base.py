@@ -1,47 +1,524 @@
+import math
 import time
 import csv
-from typing import List, Tuple, Dict
+import numpy as np
+from typing import List, Tuple, Dict, Optional, Callable, Sequence, Union
 from abc import ABC, abstractmethod
+from convergence_history import ConvergenceHistory
+from fitness_cache import FitnessCache
+from instrumentation import PerfStats, NULL_SECTION
+from run_control import ProgressEvent, CancelToken
+
+
+def binary_split(bounds: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Tách vật phẩm có giới hạn số lượng b thành các gói 1, 2, 4, ..., phần dư (tổng đúng bằng b),
+    nhờ đó mọi số lượng từ 0 đến b đều là một nghiệm 0/1 trên các gói.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: chỉ số vật phẩm gốc của từng gói và số lượng trong gói.
+    """
+    bounds = np.asarray(bounds, dtype=np.int64)
+    if bounds.ndim != 1 or (bounds < 0).any():
+        raise ValueError("item_bounds phải là dãy số nguyên không âm")
+    powers = np.frexp(bounds + 1)[1].astype(np.int64) - 1  # floor(log2(b + 1)): số gói lũy thừa của 2
+    rest = bounds - (np.left_shift(1, powers) - 1)
+    counts = powers + (rest > 0)
+    owners = np.repeat(np.arange(len(bounds)), counts)
+    slot = np.arange(len(owners)) - np.repeat(np.cumsum(counts) - counts, counts)
+    sizes = np.where(slot < powers[owners], np.left_shift(1, slot), rest[owners])
+    return owners, sizes
+
 
 class KnapsackAlgorithmBase(ABC):
     """
     Class cơ sở trừu tượng cho các thuật toán giải bài toán Knapsack (0/1).
 
     Đóng gói dữ liệu đầu vào và định nghĩa giao diện chung (solve) cho các Class con.
+    Dữ liệu số được lưu dưới dạng mảng NumPy liên tục, nghiệm là mảng uint8 (0/1),
+    nhờ đó cả quần thể có thể được đánh giá bằng một phép nhân ma trận - vector.
+
+    Ngoài bài toán kinh điển còn hỗ trợ nhiều ràng buộc (ma trận trọng lượng m x n, vector sức chứa)
+    và giới hạn số lượng từng vật phẩm (tách nhị phân thành các gói 0/1, xem binary_split).
     """
+
+    # Số vòng lặp giữa hai lần kiểm tra tiêu chí dừng sớm; Class con có vòng lặp rất rẻ đặt lớn hơn
+    _STOP_CHECK_EVERY = 1
+    # Class con chỉ xử lý một ràng buộc trọng lượng (đánh giá tăng dần theo số vô hướng) đặt False
+    _MULTI_CONSTRAINT = True
+
     def __init__(
         self,
         item_names: List[str],
         item_values: List[int],
-        item_weights: List[int],
-        knapsack_capacity: int,
-        max_iterations: int = 100
+        item_weights: Union[List[int], Sequence[Sequence[int]]],
+        knapsack_capacity: Union[int, Sequence[int]],
+        max_iterations: int = 100,
+        seed: Union[int, np.random.SeedSequence, None] = None,
+        repair_strategy: str = "greedy",
+        progress_every: int = 1,
+        cancel_token: Optional[CancelToken] = None,
+        fitness_cache_bytes: int = 0,
+        time_budget: Optional[float] = None,
+        max_evaluations: Optional[int] = None,
+        stall_iterations: Optional[int] = None,
+        instrument: bool = False,
+        profile: Optional[str] = None,
+        item_bounds: Optional[Sequence[int]] = None
     ):
-        """Khởi tạo đối tượng thuật toán cơ sở."""
+        """
+        Khởi tạo đối tượng thuật toán cơ sở.
+
+        item_weights là danh sách n trọng lượng (một ràng buộc) hoặc ma trận m x n (m ràng buộc, ví dụ
+        khối lượng, thể tích, ngân sách), khi đó knapsack_capacity là vector m sức chứa.
+        item_bounds: số lượng tối đa của từng vật phẩm (None: bài toán 0/1). Vật phẩm được tách thành
+        các gói 1, 2, 4, ... nên nghiệm (best_solution) là mảng 0/1 trên các gói; item_quantities()
+        đổi về số lượng của từng vật phẩm.
+
+        seed khởi tạo bộ sinh số ngẫu nhiên NumPy riêng của đối tượng (mọi phép rút ngẫu nhiên đều đi qua
+        self._rng, không dùng module random toàn cục); có thể là một SeedSequence con (luồng độc lập của
+        một worker). seed=None lấy entropy của hệ thống, giá trị đó được lưu vào self.seed để chạy lại được.
+        repair_strategy chọn cách sửa nghiệm quá tải: "greedy" (theo tỉ lệ giá trị/trọng lượng,
+        có bổ sung vật phẩm) hoặc "random" (bỏ ngẫu nhiên vật phẩm như cách cũ, dùng để so sánh).
+        progress_every: cứ bao nhiêu vòng lặp thì phát một ProgressEvent và kiểm tra cancel_token.
+        fitness_cache_bytes: giới hạn bộ nhớ (byte) của bộ nhớ đệm LRU cho kết quả đánh giá nghiệm;
+        0 là tắt (mặc định).
+        Tiêu chí dừng sớm (None là không dùng): time_budget - thời gian chạy tối đa (giây),
+        max_evaluations - số lần đánh giá nghiệm tối đa, stall_iterations - dừng khi nghiệm tốt nhất
+        không cải thiện sau chừng ấy vòng lặp. Tiêu chí đã kết thúc lần chạy được ghi vào stop_reason.
+        instrument=True bật đo thời gian từng pha và các bộ đếm (xem performance_report);
+        profile: "cpu" (cProfile) hoặc "memory" (tracemalloc) chụp thêm profile của lần chạy, tự bật instrument.
+        """
+        if repair_strategy not in ("greedy", "random"):
+            raise ValueError(f"repair_strategy không hợp lệ: {repair_strategy}")
+        if time_budget is not None and time_budget <= 0:
+            raise ValueError("time_budget phải > 0")
+        if max_evaluations is not None and max_evaluations < 1:
+            raise ValueError("max_evaluations phải >= 1")
+        if stall_iterations is not None and stall_iterations < 1:
+            raise ValueError("stall_iterations phải >= 1")
+        values = np.ascontiguousarray(item_values, dtype=np.int64)
+        weights = np.atleast_2d(np.asarray(item_weights, dtype=np.int64))  # m x n
+        capacities = np.atleast_1d(np.asarray(knapsack_capacity, dtype=np.int64))
+        if capacities.ndim != 1 or weights.shape != (len(capacities), len(item_names)):
+            raise ValueError(f"item_weights phải có dạng ({len(capacities)} x {len(item_names)}) "
+                             f"theo số phần tử của knapsack_capacity, nhận được {weights.shape}")
+        if len(capacities) > 1 and not self._MULTI_CONSTRAINT:
+            raise ValueError(f"{type(self).__name__} chỉ hỗ trợ một ràng buộc trọng lượng")
+
+        # Giới hạn số lượng: mỗi gói là một "vật phẩm" 0/1 với giá trị và trọng lượng nhân theo số lượng trong gói
+        self._owners: Optional[np.ndarray] = None  # Chỉ số vật phẩm gốc của từng gói (None: không tách)
+        if item_bounds is not None:
+            if len(item_bounds) != len(item_names):
+                raise ValueError("item_bounds phải có đúng một giới hạn cho mỗi vật phẩm")
+            self._owners, self._pack_sizes = binary_split(item_bounds)
+            values = values[self._owners] * self._pack_sizes
+            weights = weights[:, self._owners] * self._pack_sizes
+
         self._item_names = item_names
         self._item_values = item_values
         self._item_weights = item_weights
-        self._capacity = knapsack_capacity
+        self._m = len(capacities)                  # Số ràng buộc
+        self._capacities = capacities              # Sức chứa từng ràng buộc
+        self._capacity = int(capacities[0])        # Sức chứa của ràng buộc đầu tiên (duy nhất trong bài toán kinh điển)
         self._max_iterations = max_iterations
-        self._n = len(item_names)
-        self.history = []
-        self.history_values = []  # Lưu giá trị tốt nhất theo từng iteration
-        self.best_solution = []
+        self._n = len(values)                      # Độ dài nghiệm (số gói khi có giới hạn số lượng)
+        seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.seed = seed_sequence.entropy             # Seed gốc
+        self.seed_stream = seed_sequence.spawn_key    # Vị trí luồng con (rỗng nếu không phải luồng con)
+        self._rng = np.random.default_rng(seed_sequence)
+
+        # Engine đánh giá: cột 0 là giá trị, cột 1..m là trọng lượng theo từng ràng buộc (shape n x (1 + m))
+        self._values_arr = values
+        self._weights_arr = np.ascontiguousarray(weights[0])  # Ràng buộc đầu tiên: đường nhanh và lịch sử
+        self._value_weight = np.ascontiguousarray(np.column_stack((values, weights.T)))
+        self._weight_matrix = self._value_weight[:, 1:]       # n x m
+
+        # Chỉ mục vật phẩm theo tỉ lệ giá trị/trọng lượng giảm dần, tính một lần cho mỗi đối tượng.
+        # Nhiều ràng buộc: trọng lượng thay thế (surrogate) là tổng trọng lượng các chiều chia cho sức chứa.
+        self._repair_strategy = repair_strategy
+        if self._m == 1:
+            surrogate = self._weights_arr
+        else:
+            surrogate = (weights / np.maximum(capacities, 1)[:, None]).sum(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratios = np.where(surrogate > 0, self._values_arr / surrogate, np.inf)
+        self._ratio_order = np.argsort(-ratios, kind="stable")
+
+        # Quan sát tiến độ và hủy giữa chừng
+        self._progress_every = max(1, progress_every)
+        self._cancel_token = cancel_token
+        self._progress_callbacks: List[Callable[[ProgressEvent], None]] = []
+        self.cancelled = False
+
+        # Tiêu chí dừng sớm
+        self._time_budget = time_budget
+        self._max_evaluations = max_evaluations
+        self._stall_iterations = stall_iterations
+        self._run_start = time.perf_counter()
+        self._run_evaluations = 0
+        self._stall_best = -1
+        self._stall_since = 0
+        self.stop_reason: Optional[str] = None  # Một khóa của STOP_REASONS sau khi solve kết thúc
+
+        self.history = ConvergenceHistory()  # Giá trị tốt nhất, trọng lượng, thời điểm theo từng iteration
+        self.best_solution = np.zeros(self._n, dtype=np.uint8)
         self.best_value = 0
         self.exec_time = 0.0
+        self.evaluations = 0  # Số nghiệm đã thực sự được chấm điểm (đầy đủ hoặc tăng dần), không tính lần trúng bộ nhớ đệm
+        self.fitness_cache = FitnessCache(fitness_cache_bytes, self._n) if fitness_cache_bytes > 0 else None
+        self.perf = PerfStats(profile) if instrument or profile else None  # None: tắt đo đạc
 
-    def _calculate_fitness(self, sol: List[int]) -> Tuple[int, int]:
-        """Tính tổng giá trị và trọng lượng của một nghiệm."""
-        total_value = sum(self._item_values[i] * sol[i] for i in range(self._n))
-        total_weight = sum(self._item_weights[i] * sol[i] for i in range(self._n))
-        return total_value, total_weight
+    @property
+    def history_values(self) -> np.ndarray:
+        """Giá trị tốt nhất theo từng iteration (bản sao NumPy của lịch sử)."""
+        return self.history.best_values
+
+    def add_progress_callback(self, callback: Callable[[ProgressEvent], None]):
+        """Đăng ký hàm nhận ProgressEvent. Hàm được gọi trên luồng đang chạy thuật toán."""
+        self._progress_callbacks.append(callback)
+
+    def _begin_run(self):
+        """Đặt lại trạng thái dừng và mốc thời gian; Class con gọi ở đầu mỗi lần chạy."""
+        self.cancelled = False
+        self.stop_reason = None
+        self._run_start = time.perf_counter()
+        self._run_evaluations = self.evaluations
+        self._stall_best = -1
+        self._stall_since = 0
+        if self.perf is not None:
+            self.perf = PerfStats(self.perf.profile)
+            self.perf.start_profiling()
+
+    def _resume_run(self, elapsed: float, evaluations: int, stall: Tuple[int, int], stop_reason: Optional[str]):
+        """
+        Tiếp tục một lần chạy đã bắt đầu ở đối tượng khác (ví dụ epoch kế tiếp của mô hình đảo):
+        giữ thời gian đã chạy, số lần đánh giá, mốc cải thiện cuối và lý do dừng thay vì đặt lại.
+        """
+        self.cancelled = False
+        self.stop_reason = stop_reason
+        self._run_start = time.perf_counter() - elapsed
+        self._run_evaluations = self.evaluations - evaluations
+        self._stall_best, self._stall_since = stall
+        if self.perf is not None:
+            self.perf.start_profiling()
+
+    def _finish_run(self):
+        """Ghi nhận lần chạy kết thúc bình thường nếu chưa có tiêu chí nào dừng sớm."""
+        if self.stop_reason is None:
+            self.stop_reason = "max_iterations"
+        self.history.mark()
+        if self.perf is not None:
+            self.perf.stop_profiling()
+
+    def _timed(self, phase: str):
+        """Context manager bấm giờ một pha (init, update, repair, evaluation, leaders) khi bật instrument."""
+        return self.perf.section(phase) if self.perf is not None else NULL_SECTION
+
+    def performance_report(self) -> Dict:
+        """
+        Báo cáo hiệu năng của lần chạy gần nhất dạng dict: thời gian, số vòng lặp, lý do dừng,
+        số lần đánh giá và (khi bật instrument) thời gian từng pha, số lần sửa nghiệm, profile.
+        """
+        report = {
+            "solver": type(self).__name__,
+            "n": self._n,
+            "exec_time": self.exec_time,
+            "iterations": len(self.history),
+            "stop_reason": self.stop_reason,
+        }
+        counters = {"evaluations": self.evaluations}
+        if self.fitness_cache is not None:
+            counters.update(cache_hits=self.fitness_cache.hits, cache_misses=self.fitness_cache.misses)
+        if self.perf is not None:
+            self.perf.stop_profiling()
+            report.update(self.perf.report(self.exec_time))
+            counters.update(report["counters"])
+        report["counters"] = counters
+        return report
 
-    def _fitness_value(self, sol: List[int]) -> int:
+    def _has_stopping_criteria(self) -> bool:
+        """True nếu có ít nhất một tiêu chí dừng sớm được bật."""
+        return (self._time_budget is not None or self._max_evaluations is not None
+                or self._stall_iterations is not None)
+
+    def _checkpoint_interval(self) -> int:
+        """
+        Khoảng vòng lặp giữa hai lần gọi _checkpoint; không ai quan sát và không có tiêu chí dừng sớm
+        thì bỏ qua hoàn toàn. Tiêu chí dừng được kiểm tra mỗi _STOP_CHECK_EVERY vòng (hoặc thưa hơn
+        stall_iterations), nên có thể chạy quá mức giới hạn tối đa chừng ấy vòng.
+        """
+        interval = None
+        if self._progress_callbacks or self._cancel_token is not None:
+            interval = self._progress_every
+        if self._has_stopping_criteria():
+            stop_every = self._STOP_CHECK_EVERY
+            if self._stall_iterations is not None:
+                stop_every = min(stop_every, self._stall_iterations)
+            # Ước chung lớn nhất để cả hai nhịp (tiến độ và kiểm tra dừng) đều rơi vào điểm kiểm tra
+            interval = stop_every if interval is None else math.gcd(interval, stop_every)
+        return interval if interval is not None else self._max_iterations + 1
+
+    def _checkpoint(self, iteration: int, best_value: int, weight: int) -> bool:
+        """
+        Phát ProgressEvent tới các callback, kiểm tra yêu cầu hủy và các tiêu chí dừng sớm.
+
+        Vòng lặp của Class con gọi hàm này mỗi _checkpoint_interval() vòng; trả về False nếu phải dừng
+        (nghiệm tốt nhất đến thời điểm đó vẫn được giữ lại, lý do nằm trong stop_reason).
+        """
+        self.history.mark()
+        if self._progress_callbacks and iteration % self._progress_every == 0:
+            event = ProgressEvent(iteration, best_value, weight)
+            for callback in self._progress_callbacks:
+                callback(event)
+        if self._cancel_token is not None and self._cancel_token.cancelled:
+            self.cancelled = True
+            self.stop_reason = "cancelled"
+            return False
+        if self._time_budget is not None and time.perf_counter() - self._run_start >= self._time_budget:
+            self.stop_reason = "time_budget"
+            return False
+        if self._max_evaluations is not None and self.evaluations - self._run_evaluations >= self._max_evaluations:
+            self.stop_reason = "max_evaluations"
+            return False
+        if self._stall_iterations is not None:
+            if best_value > self._stall_best:
+                self._stall_best, self._stall_since = best_value, iteration
+            elif iteration - self._stall_since >= self._stall_iterations:
+                self.stop_reason = "stall"
+                return False
+        return True
+
+    def _feasible(self, weights):
+        """
+        Nghiệm hợp lệ hay không theo trọng lượng: số nguyên hoặc mảng (k,) khi một ràng buộc,
+        vector tải (m,) hoặc ma trận (k x m) khi nhiều ràng buộc (hợp lệ khi mọi chiều đều vừa).
+        """
+        if self._m == 1:
+            return weights <= self._capacity
+        return (weights <= self._capacities).all(axis=-1)
+
+    def _reported_weight(self, weight) -> int:
+        """Trọng lượng ghi vào lịch sử và ProgressEvent: tải của ràng buộc đầu tiên khi có nhiều ràng buộc."""
+        return int(weight) if self._m == 1 else int(weight[0])
+
+    def _calculate_fitness(self, sol: np.ndarray, key: Optional[int] = None) -> Tuple[int, Union[int, np.ndarray]]:
+        """
+        Tính tổng giá trị và trọng lượng của một nghiệm (qua bộ nhớ đệm nếu được bật).
+        Khi có nhiều ràng buộc, trọng lượng là vector tải (m,) của từng ràng buộc.
+        key: khóa bộ nhớ đệm đã biết (ví dụ cập nhật bằng flip_key), None thì tính từ nghiệm.
+        """
+        cache = self.fitness_cache
+        if cache is not None:
+            if key is None:
+                key = cache.solution_key(sol)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached if self._m == 1 else (cached[0], np.array(cached[1], dtype=np.int64))
+        self.evaluations += 1
+        scores = np.asarray(sol, dtype=np.int64) @ self._value_weight
+        if self._m > 1:
+            if cache is not None:
+                cache.put(key, int(scores[0]), tuple(scores[1:].tolist()))
+            return int(scores[0]), scores[1:]
+        total_value, total_weight = scores
+        if cache is not None:
+            cache.put(key, int(total_value), int(total_weight))
+        return int(total_value), int(total_weight)
+
+    def _fitness_value(self, sol: np.ndarray) -> int:
         """Trả về giá trị Fitness của nghiệm. Trả về 0 nếu nghiệm không hợp lệ (quá tải)."""
         total_value, total_weight = self._calculate_fitness(sol)
-        return total_value if total_weight <= self._capacity else 0
+        return total_value if self._feasible(total_weight) else 0
+
+    def _evaluate_population(self, population: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Tính tổng giá trị và trọng lượng của cả quần thể (k x n) bằng một phép nhân ma trận.
+        Khi có nhiều ràng buộc, cùng phép nhân đó cho ma trận tải (k x m) thay cho mảng trọng lượng.
+        """
+        with self._timed("evaluation"):
+            cache = self.fitness_cache
+            if cache is None:
+                self.evaluations += len(population)
+                scores = np.asarray(population, dtype=np.int64) @ self._value_weight
+                return scores[:, 0], (scores[:, 1] if self._m == 1 else scores[:, 1:])
+
+            # Chỉ những nghiệm chưa có trong bộ nhớ đệm mới được nhân ma trận
+            keys = cache.population_keys(population)
+            cached = [cache.get(key) for key in keys]
+            scores = np.empty((len(population), 1 + self._m), dtype=np.int64)
+            missing = [i for i, result in enumerate(cached) if result is None]
+            self.evaluations += len(missing)
+            if missing:
+                computed = np.asarray(population[missing], dtype=np.int64) @ self._value_weight
+                scores[missing] = computed
+                for i, row in zip(missing, computed.tolist()):
+                    cache.put(keys[i], row[0], row[1] if self._m == 1 else tuple(row[1:]))
+            for i, result in enumerate(cached):
+                if result is not None:
+                    scores[i, 0], scores[i, 1:] = result
+            return scores[:, 0], (scores[:, 1] if self._m == 1 else scores[:, 1:])
+
+    def _population_fitness(self, population: np.ndarray) -> np.ndarray:
+        """Trả về mảng Fitness của cả quần thể, nghiệm quá tải nhận giá trị 0."""
+        values, weights = self._evaluate_population(population)
+        return np.where(self._feasible(weights), values, 0)
+
+    def _repair(self, sol: np.ndarray, total_value: int, total_weight) -> Tuple[int, Union[int, np.ndarray]]:
+        """
+        Sửa nghiệm tại chỗ theo repair_strategy. Trả về giá trị và trọng lượng sau khi sửa
+        (vector tải khi có nhiều ràng buộc).
+        """
+        perf = self.perf
+        if perf is not None:
+            perf.count("repairs")
+            if not self._feasible(total_weight):
+                perf.count("infeasible_repairs")
+        if self._m > 1:
+            if self._repair_strategy == "greedy":
+                return self._surrogate_repair(sol, total_value, total_weight)
+            return self._random_repair_multi(sol, total_value, total_weight)
+        if self._repair_strategy == "greedy":
+            return self._greedy_repair(sol, total_value, total_weight)
+        return self._random_repair(sol, total_value, total_weight)
+
+    def _random_repair(self, sol: np.ndarray, total_value: int, total_weight: int) -> Tuple[int, int]:
+        """Bỏ vật phẩm theo một hoán vị ngẫu nhiên cho đến khi nghiệm không quá tải."""
+        if total_weight <= self._capacity:
+            return total_value, total_weight
+        removal = self._rng.permutation(np.flatnonzero(sol))
+        removed_weight = np.cumsum(self._weights_arr[removal])
+        k = int(np.searchsorted(removed_weight, total_weight - self._capacity)) + 1
+        removal = removal[:k]
+        sol[removal] = 0
+        return total_value - int(self._values_arr[removal].sum()), total_weight - int(removed_weight[k - 1])
+
+    def _greedy_repair(self, sol: np.ndarray, total_value: int, total_weight: int) -> Tuple[int, int]:
+        """
+        Bỏ các vật phẩm có tỉ lệ giá trị/trọng lượng thấp nhất cho đến khi hợp lệ,
+        sau đó lần lượt thêm các vật phẩm tỉ lệ cao nhất còn vừa ba lô.
+        """
+        order = self._ratio_order
+        if total_weight > self._capacity:
+            worst_first = order[::-1]
+            removal = worst_first[sol[worst_first] == 1]
+            removed_weight = np.cumsum(self._weights_arr[removal])
+            k = int(np.searchsorted(removed_weight, total_weight - self._capacity)) + 1
+            removal = removal[:k]
+            sol[removal] = 0
+            total_value -= int(self._values_arr[removal].sum())
+            total_weight -= int(removed_weight[k - 1])
+
+        # Thêm theo từng đoạn tiền tố vừa sức chứa; vật phẩm đầu tiên không vừa bị loại hẳn
+        # vì sức chứa còn lại chỉ giảm dần, kết quả giống hệt duyệt tham lam tuần tự.
+        candidates = order[sol[order] == 0]
+        remaining = self._capacity - total_weight
+        while candidates.size:
+            candidates = candidates[self._weights_arr[candidates] <= remaining]
+            if not candidates.size:
+                break
+            added_weight = np.cumsum(self._weights_arr[candidates])
+            k = int(np.searchsorted(added_weight, remaining, side="right"))
+            added = candidates[:k]
+            sol[added] = 1
+            total_value += int(self._values_arr[added].sum())
+            total_weight += int(added_weight[k - 1])
+            remaining -= int(added_weight[k - 1])
+            candidates = candidates[k + 1:]
+
+        return total_value, total_weight
+
+    def _random_repair_multi(self, sol: np.ndarray, total_value: int, loads: np.ndarray) -> Tuple[int, np.ndarray]:
+        """Như _random_repair khi có nhiều ràng buộc: bỏ vật phẩm ngẫu nhiên đến khi mọi chiều đều vừa."""
+        excess = loads - self._capacities
+        if (excess <= 0).all():
+            return total_value, loads
+        removal = self._rng.permutation(np.flatnonzero(sol))
+        removed = np.cumsum(self._weight_matrix[removal], axis=0)
+        k = int(np.argmax((removed >= excess).all(axis=1))) + 1
+        removal = removal[:k]
+        sol[removal] = 0
+        return total_value - int(self._values_arr[removal].sum()), loads - removed[k - 1]
+
+    def _surrogate_repair(self, sol: np.ndarray, total_value: int, loads: np.ndarray) -> Tuple[int, np.ndarray]:
+        """
+        Sửa tham lam khi có nhiều ràng buộc, theo tỉ lệ giá trị / trọng lượng thay thế (surrogate):
+        bỏ vật phẩm tỉ lệ thấp nhất đến khi mọi chiều đều vừa, rồi thêm vật phẩm tỉ lệ cao nhất còn vừa.
+        Cùng cách duyệt theo đoạn tiền tố như _greedy_repair, với phép so sánh trên cả m chiều.
+        """
+        order = self._ratio_order
+        weight_matrix = self._weight_matrix
+        excess = loads - self._capacities
+        if (excess > 0).any():
+            worst_first = order[::-1]
+            removal = worst_first[sol[worst_first] == 1]
+            removed = np.cumsum(weight_matrix[removal], axis=0)
+            k = int(np.argmax((removed >= excess).all(axis=1))) + 1
+            removal = removal[:k]
+            sol[removal] = 0
+            total_value -= int(self._values_arr[removal].sum())
+            loads = loads - removed[k - 1]
+
+        candidates = order[sol[order] == 0]
+        remaining = self._capacities - loads
+        while candidates.size:
+            candidates = candidates[(weight_matrix[candidates] <= remaining).all(axis=1)]
+            if not candidates.size:
+                break
+            added_weight = np.cumsum(weight_matrix[candidates], axis=0)
+            k = int((added_weight <= remaining).all(axis=1).sum())  # Tổng tích lũy tăng dần nên là một tiền tố
+            added = candidates[:k]
+            sol[added] = 1
+            total_value += int(self._values_arr[added].sum())
+            loads = loads + added_weight[k - 1]
+            remaining = remaining - added_weight[k - 1]
+            candidates = candidates[k + 1:]
+
+        return total_value, loads
+
+    def _random_solution(self) -> Tuple[np.ndarray, int, int]:
+        """Sinh nghiệm ngẫu nhiên (mỗi vật phẩm 50%) rồi sửa theo repair_strategy. Trả về nghiệm, giá trị, trọng lượng."""
+        sol = self._rng.integers(0, 2, size=self._n, dtype=np.uint8)
+        total_value, total_weight = self._calculate_fitness(sol)
+        total_value, total_weight = self._repair(sol, total_value, total_weight)
+        return sol, total_value, total_weight
+
+    def _repair_population(self, population: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sửa tại chỗ cả quần thể. Trả về mảng giá trị và trọng lượng sau khi sửa
+        (ma trận tải k x m khi có nhiều ràng buộc).
+        """
+        values, weights = self._evaluate_population(population)
+        with self._timed("repair"):
+            if self._repair_strategy == "greedy":
+                rows = range(len(population))
+            else:
+                rows = np.flatnonzero(~self._feasible(weights))
+            if self._m == 1:
+                for i in rows:
+                    values[i], weights[i] = self._repair(population[i], int(values[i]), int(weights[i]))
+            else:
+                for i in rows:
+                    values[i], weights[i] = self._repair(population[i], int(values[i]), weights[i])
+        return values, weights
+
+    def item_quantities(self, sol: Optional[np.ndarray] = None) -> np.ndarray:
+        """Số lượng được chọn của từng vật phẩm (cộng các gói khi có giới hạn số lượng); mặc định của best_solution."""
+        sol = self.best_solution if sol is None else sol
+        if self._owners is None:
+            return np.asarray(sol, dtype=np.int64)
+        return np.bincount(self._owners, weights=sol * self._pack_sizes,
+                           minlength=len(self._item_names)).astype(np.int64)
+
+    def _selected_names(self, sol: np.ndarray) -> List[str]:
+        """Trả về tên các vật phẩm được chọn trong nghiệm (kèm " xK" khi chọn K > 1 đơn vị)."""
+        if self._owners is None:
+            return [self._item_names[i] for i in np.flatnonzero(sol)]
+        quantities = self.item_quantities(sol)
+        return [self._item_names[i] if quantities[i] == 1 else f"{self._item_names[i]} x{quantities[i]}"
+                for i in np.flatnonzero(quantities)]
 
     @abstractmethod
-    def solve(self) -> Tuple[List[str], List[str], float]:
+    def solve(self) -> Tuple[List[str], ConvergenceHistory, float]:
         """Phương thức trừu tượng, phải được Class con ghi đè để chạy thuật toán."""
         pass
\ No newline at end of file
@@ -0,0 +1,167 @@
+import time
+from bisect import bisect_right
+import numpy as np
+from typing import List, Tuple, Optional
+from knapsack_base import KnapsackAlgorithmBase
+from convergence_history import ConvergenceHistory
+
+class ExactSolver(KnapsackAlgorithmBase):
+    """
+    Giải chính xác bài toán Knapsack (0/1), dùng làm mốc so sánh cho các thuật toán heuristic.
+
+    Hai phương pháp:
+    - "dp": quy hoạch động với một mảng 1-D cuộn và bitset nén để truy vết nghiệm,
+      phù hợp khi sức chứa x số vật phẩm đủ nhỏ.
+    - "bnb": nhánh cận (branch and bound) cắt tỉa bằng cận trên của bài toán Knapsack phân số,
+      dùng cho sức chứa lớn.
+    """
+
+    # Số ô tối đa (n x (sức chứa + 1)) để chế độ "auto" chọn quy hoạch động (~128MB bitset)
+    _DP_MAX_CELLS = 1 << 30
+    # Quy hoạch động và cận phân số chỉ dùng cho một ràng buộc; vật phẩm có giới hạn số lượng được giải trên các gói
+    _MULTI_CONSTRAINT = False
+
+    def __init__(self, *args, method: str = "auto", max_nodes: int = 5_000_000, **kwargs):
+        """
+        Khởi tạo bộ giải chính xác. method: "auto", "dp" hoặc "bnb"; max_nodes giới hạn số nút nhánh cận.
+        Trong các tiêu chí dừng sớm chỉ time_budget có tác dụng (khi đó kết quả không còn chắc chắn tối ưu).
+        """
+        super().__init__(*args, **kwargs)
+        if method not in ("auto", "dp", "bnb"):
+            raise ValueError(f"method không hợp lệ: {method}")
+        self._method = method
+        self._max_nodes = max_nodes
+        self.method_used = ""
+        self.is_optimal = False
+        self.nodes_explored = 0
+
+    def _choose_method(self) -> str:
+        """Chọn phương pháp dựa trên kích thước bảng quy hoạch động."""
+        if self._method != "auto":
+            return self._method
+        return "dp" if self._n * (self._capacity + 1) <= self._DP_MAX_CELLS else "bnb"
+
+    def _should_stop(self) -> bool:
+        """Kiểm tra yêu cầu hủy và time_budget, ghi lý do vào stop_reason."""
+        if self._cancel_token is not None and self._cancel_token.cancelled:
+            self.cancelled = True
+            self.stop_reason = "cancelled"
+            return True
+        if self._time_budget is not None and time.perf_counter() - self._run_start >= self._time_budget:
+            self.stop_reason = "time_budget"
+            return True
+        return False
+
+    def _solve_dp(self) -> np.ndarray:
+        """Quy hoạch động: dp[c] là giá trị tốt nhất với sức chứa c, mỗi vật phẩm lưu một hàng bit "có lấy"."""
+        capacity = self._capacity
+        dp = np.zeros(capacity + 1, dtype=np.int64)
+        take = np.zeros((self._n, (capacity + 8) // 8), dtype=np.uint8)
+        row = np.zeros(capacity + 1, dtype=bool)
+
+        self.is_optimal = True
+        for i in range(self._n):
+            # Khi bị dừng, bảng hiện tại vẫn tối ưu cho các vật phẩm đã xét nên vẫn truy vết được
+            if i % 256 == 0 and self._should_stop():
+                self.is_optimal = False
+                break
+            value, weight = int(self._values_arr[i]), int(self._weights_arr[i])
+            if value <= 0 or weight > capacity:
+                continue
+            row[:] = False
+            candidate = dp[:capacity + 1 - weight] + value
+            better = candidate > dp[weight:]
+            row[weight:] = better
+            dp[weight:] = np.where(better, candidate, dp[weight:])
+            take[i] = np.packbits(row)
+
+        # Truy vết ngược từ sức chứa đầy đủ
+        sol = np.zeros(self._n, dtype=np.uint8)
+        c = capacity
+        for i in range(self._n - 1, -1, -1):
+            if (take[i, c >> 3] >> (7 - (c & 7))) & 1:
+                sol[i] = 1
+                c -= int(self._weights_arr[i])
+        return sol
+
+    def _solve_bnb(self) -> np.ndarray:
+        """Nhánh cận theo chiều sâu trên các vật phẩm đã sắp theo tỉ lệ giá trị/trọng lượng giảm dần."""
+        capacity = self._capacity
+        sol = np.zeros(self._n, dtype=np.uint8)
+
+        # Vật phẩm không có trọng lượng và có giá trị luôn được chọn
+        free = (self._weights_arr == 0) & (self._values_arr > 0)
+        sol[free] = 1
+
+        order = self._ratio_order
+        order = order[(self._weights_arr[order] > 0) & (self._weights_arr[order] <= capacity) & (self._values_arr[order] > 0)]
+        values = self._values_arr[order].tolist()
+        weights = self._weights_arr[order].tolist()
+        m = len(order)
+        prefix_w = [0] + np.cumsum(self._weights_arr[order]).tolist()
+        prefix_v = [0] + np.cumsum(self._values_arr[order]).tolist()
+
+        def upper_bound(level: int, value: int, weight: int) -> int:
+            """Cận trên (làm tròn xuống) của bài toán Knapsack phân số cho các vật phẩm từ level trở đi."""
+            remaining = capacity - weight
+            k = bisect_right(prefix_w, prefix_w[level] + remaining, level, m + 1) - 1
+            bound = value + prefix_v[k] - prefix_v[level]
+            if k < m:
+                bound += (remaining - (prefix_w[k] - prefix_w[level])) * values[k] // weights[k]
+            return bound
+
+        # Mỗi nút lưu chuỗi vật phẩm đã chọn dạng (vị trí, nút cha) để không phải sao chép nghiệm
+        best_value, best_chain = 0, None
+        stack: List[Tuple[int, int, int, Optional[tuple]]] = [(0, 0, 0, None)]
+        nodes = 0
+        while stack:
+            if nodes >= self._max_nodes:
+                break
+            if nodes & 0xFFFF == 0 and self._should_stop():
+                break
+            level, value, weight, chain = stack.pop()
+            nodes += 1
+            if level == m or upper_bound(level, value, weight) <= best_value:
+                continue
+            stack.append((level + 1, value, weight, chain))
+            if weight + weights[level] <= capacity:
+                taken = (level, chain)
+                value += values[level]
+                if value > best_value:
+                    best_value, best_chain = value, taken
+                stack.append((level + 1, value, weight + weights[level], taken))
+
+        self.is_optimal = not stack
+        while best_chain is not None:
+            position, best_chain = best_chain
+            sol[order[position]] = 1
+        self.nodes_explored = nodes
+        return sol
+
+    def solve(self) -> Tuple[List[str], ConvergenceHistory, float]:
+        """Thực thi bộ giải chính xác."""
+        start_time = time.perf_counter()
+        self._begin_run()
+
+        self.method_used = self._choose_method()
+        with self._timed("search"):
+            if self.method_used == "dp":
+                self.best_solution = self._solve_dp()
+            else:
+                self.best_solution = self._solve_bnb()
+        self.best_value, best_weight = self._calculate_fitness(self.best_solution)
+
+        self.history = ConvergenceHistory()
+        self.history.append(self.best_value, best_weight)
+        self._finish_run()
+        self.exec_time = time.perf_counter() - start_time
+
+        selected_items = self._selected_names(self.best_solution)
+        return selected_items, self.history, self.exec_time
+
+
+def optimality_gap(value: int, optimal_value: int) -> float:
+    """Khoảng cách tối ưu (%) của một kết quả so với giá trị tối ưu."""
+    if optimal_value <= 0:
+        return 0.0
+    return (optimal_value - value) / optimal_value * 100
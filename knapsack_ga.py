@@ -0,0 +1,94 @@
+import time
+import numpy as np
+from typing import List, Optional, Tuple
+from knapsack_base import KnapsackAlgorithmBase
+from convergence_history import ConvergenceHistory
+
+class GeneticAlgorithm(KnapsackAlgorithmBase):
+    """
+    Giải bài toán Knapsack bằng thuật toán di truyền dạng steady-state.
+
+    Mỗi vòng lặp chỉ sinh một nhóm nhỏ con (offspring_per_step) thay vì cả thế hệ:
+    chọn cha mẹ bằng tournament, lai ghép đồng nhất và đột biến đảo bit đều được vector hóa
+    trên cả nhóm; con tốt hơn thay thế những cá thể kém nhất của quần thể.
+    """
+
+    def __init__(self, *args, population_size: int = 50, offspring_per_step: Optional[int] = None,
+                 mutation_rate: Optional[float] = None, tournament_size: int = 2, **kwargs):
+        """
+        Khởi tạo đối tượng GA.
+
+        offspring_per_step mặc định bằng 1/5 quần thể (tối thiểu 2); mutation_rate là xác suất
+        đảo mỗi bit, mặc định 1/n.
+        """
+        super().__init__(*args, **kwargs)
+        if population_size < 2 or tournament_size < 1:
+            raise ValueError("population_size phải >= 2 và tournament_size phải >= 1")
+        self._population_size = population_size
+        self._offspring = offspring_per_step or max(2, population_size // 5)
+        self._mutation_rate = mutation_rate if mutation_rate is not None else 1.0 / max(1, self._n)
+        self._tournament_size = tournament_size
+
+    def _select_parents(self, fitness: np.ndarray, count: int) -> np.ndarray:
+        """Chọn `count` cha mẹ bằng tournament: mỗi hàng rút tournament_size cá thể, lấy con tốt nhất."""
+        contenders = self._rng.integers(0, len(fitness), size=(count, self._tournament_size))
+        return contenders[np.arange(count), fitness[contenders].argmax(axis=1)]
+
+    def _make_offspring(self, population: np.ndarray, fitness: np.ndarray) -> np.ndarray:
+        """Sinh cả nhóm con: lai ghép đồng nhất bằng mặt nạ bit, rồi đột biến đúng các vị trí được rút."""
+        m = self._offspring
+        parents = self._select_parents(fitness, 2 * m)
+        mask = self._rng.integers(0, 2, size=(m, self._n), dtype=np.uint8).view(bool)
+        children = np.where(mask, population[parents[:m]], population[parents[m:]])
+
+        # Số bit đột biến của mỗi con theo phân phối nhị thức; chỉ rút đúng các vị trí đó thay vì n số ngẫu nhiên
+        counts = self._rng.binomial(self._n, self._mutation_rate, size=m)
+        rows = np.repeat(np.arange(m), counts)
+        cols = self._rng.integers(0, self._n, size=int(counts.sum()))
+        np.bitwise_xor.at(children, (rows, cols), 1)
+        return children
+
+    def solve(self) -> Tuple[List[str], ConvergenceHistory, float]:
+        """Thực thi thuật toán di truyền steady-state."""
+        start_time = time.perf_counter()
+        self._begin_run()
+
+        with self._timed("init"):
+            population = self._rng.integers(0, 2, size=(self._population_size, self._n), dtype=np.uint8)
+            fitness, weights = self._repair_population(population)
+            best = int(np.argmax(fitness))
+            self.best_value = int(fitness[best])
+            self.best_solution = population[best].copy()
+            best_weight = self._reported_weight(weights[best])
+        self.history = ConvergenceHistory()
+        every = self._checkpoint_interval()
+
+        for iteration in range(self._max_iterations):
+            with self._timed("update"):
+                children = self._make_offspring(population, fitness)
+            child_fitness, child_weights = self._repair_population(children)
+
+            with self._timed("leaders"):
+                # Ghép con tốt nhất với cá thể kém nhất; chỉ thay khi con tốt hơn
+                worst = np.argsort(fitness, kind="stable")[:len(children)]
+                ranked = np.argsort(-child_fitness, kind="stable")
+                better = child_fitness[ranked] > fitness[worst]
+                population[worst[better]] = children[ranked[better]]
+                fitness[worst[better]] = child_fitness[ranked[better]]
+
+                top = int(np.argmax(child_fitness))
+                if child_fitness[top] > self.best_value:
+                    self.best_value = int(child_fitness[top])
+                    self.best_solution = children[top].copy()
+                    best_weight = self._reported_weight(child_weights[top])
+
+            self.history.append(self.best_value, best_weight)
+
+            if iteration % every == 0 and not self._checkpoint(iteration, self.best_value, best_weight):
+                break
+        self._finish_run()
+
+        self.exec_time = time.perf_counter() - start_time
+
+        selected_items = self._selected_names(self.best_solution)
+        return selected_items, self.history, self.exec_time
@@ -1,92 +1,178 @@
-import random
-import math
 import time
+import numpy as np
 from typing import List, Tuple
 from knapsack_base import KnapsackAlgorithmBase
+from bit_solution import pack_rows, unique_rows
+from convergence_history import ConvergenceHistory
 
 class GreyWolfOptimizer(KnapsackAlgorithmBase):
-    """Giải bài toán Knapsack bằng thuật toán Grey Wolf Optimizer (GWO)."""
+    """
+    Giải bài toán Knapsack bằng thuật toán Grey Wolf Optimizer (GWO).
 
-    def __init__(self, *args, num_wolves: int = 30, **kwargs):
-        """Khởi tạo đối tượng GWO và số lượng sói."""
+    Vị trí cả bầy sói được cập nhật đồng thời dưới dạng mảng (num_wolves x n):
+    hệ số A/C, khoảng cách tới Alpha/Beta/Delta, hàm sigmoid và nhị phân hóa
+    đều được tính bằng NumPy với bộ sinh số ngẫu nhiên có seed của đối tượng.
+
+    Khi bầy hội tụ, nhiều con sói trùng vị trí; chúng được phát hiện qua dạng nén bit
+    và chỉ sửa/đánh giá một lần ("skip") hoặc được gieo lại ngẫu nhiên ("reseed").
+    """
+
+    # Số phần tử tối đa của một khối (số sói x n) khi cập nhật vị trí, giới hạn bộ nhớ tạm
+    _BLOCK_ELEMENTS = 1 << 18
+
+    def __init__(self, *args, num_wolves: int = 30, duplicate_policy: str = "skip", **kwargs):
+        """
+        Khởi tạo đối tượng GWO và số lượng sói.
+
+        duplicate_policy: "skip" (sói trùng vị trí dùng lại kết quả sửa/đánh giá của con đại diện),
+        "reseed" (sói trùng được gieo lại vị trí ngẫu nhiên để giữ đa dạng) hoặc "none" (không kiểm tra).
+        """
         super().__init__(*args, **kwargs)
+        if duplicate_policy not in ("skip", "reseed", "none"):
+            raise ValueError(f"duplicate_policy không hợp lệ: {duplicate_policy}")
         self._num_wolves = num_wolves
+        self._duplicate_policy = duplicate_policy
+        self.duplicate_wolves = 0  # Tổng số sói trùng vị trí đã phát hiện
 
-    def solve(self) -> Tuple[List[str], List[str], float]:
-        """Thực thi thuật toán Grey Wolf Optimizer (GWO)."""
-        start_time = time.time()
-        
-        # Khởi tạo quần thể sói
-        wolves = [[random.randint(0, 1) for _ in range(self._n)] for _ in range(self._num_wolves)]
-        
-        # Sắp xếp và chọn Alpha, Beta, Delta (3 con sói tốt nhất)
-        scored_wolves = sorted(zip([self._fitness_value(w) for w in wolves], wolves), key=lambda x: x[0], reverse=True)
-        
-        alpha = scored_wolves[0][1][:]
-        beta = scored_wolves[1][1][:]
-        delta = scored_wolves[2][1][:]
-        self.best_value = scored_wolves[0][0]
-        self.best_solution = alpha[:]
-        self.history = []
-        self.history_values = []
-
-        for iteration in range(self._max_iterations):
-            a = 2 - iteration * (2 / self._max_iterations)
+    def _init_population(self) -> np.ndarray:
+        """Khởi tạo quần thể sói ngẫu nhiên (ma trận num_wolves x n)."""
+        return self._rng.integers(0, 2, size=(self._num_wolves, self._n), dtype=np.uint8)
+
+    def _update_positions(self, wolves: np.ndarray, leaders: np.ndarray, a: float) -> np.ndarray:
+        """Cập nhật vị trí toàn bộ bầy sói theo Alpha, Beta, Delta và nhị phân hóa bằng sigmoid."""
+        num_wolves = wolves.shape[0]
+        new_wolves = np.empty_like(wolves)
+        block = max(1, self._BLOCK_ELEMENTS // max(1, self._n))
+        guides = leaders[:, None, :].astype(np.float64)  # (3, 1, n)
+
+        for start in range(0, num_wolves, block):
+            stop = min(start + block, num_wolves)
+            positions = wolves[start:stop].astype(np.float64)
+            shape = (3,) + positions.shape
+
+            A = 2 * a * self._rng.random(shape) - a
+            C = 2 * self._rng.random(shape)
+            D = np.abs(C * guides - positions)
+            X_avg = (guides - A * D).mean(axis=0)
+
+            # sigmoid(10 * (x - 0.5)) viết dưới dạng tanh để tránh tràn số của exp
+            prob = 0.5 * (1 + np.tanh(5 * (X_avg - 0.5)))
+            new_wolves[start:stop] = self._rng.random(positions.shape) < prob
+
+        return new_wolves
+
+    def _repair_unique(self, wolves: np.ndarray) -> np.ndarray:
+        """
+        Sửa và đánh giá quần thể tại chỗ, xử lý sói trùng vị trí theo duplicate_policy.
+        Trả về mảng giá trị của từng con sói.
+        """
+        if self._duplicate_policy == "none":
+            return self._repair_population(wolves)[0]
 
-            for i in range(self._num_wolves):
-                new_wolf_pos = wolves[i][:]
-                
-                for j in range(self._n):
-                    r1, r2 = random.random(), random.random()
-                    A1, C1 = 2 * a * r1 - a, 2 * r2
-                    D_alpha = abs(C1 * alpha[j] - wolves[i][j])
-                    X1 = alpha[j] - A1 * D_alpha
-                    
-                    r1, r2 = random.random(), random.random()
-                    A2, C2 = 2 * a * r1 - a, 2 * r2
-                    D_beta = abs(C2 * beta[j] - wolves[i][j])
-                    X2 = beta[j] - A2 * D_beta
-
-                    r1, r2 = random.random(), random.random()
-                    A3, C3 = 2 * a * r1 - a, 2 * r2
-                    D_delta = abs(C3 * delta[j] - wolves[i][j])
-                    X3 = delta[j] - A3 * D_delta
-
-                    X_avg = (X1 + X2 + X3) / 3
-                    try:
-                        prob = 1 / (1 + math.exp(-10 * (X_avg - 0.5)))
-                    except OverflowError:
-                        prob = 0 if X_avg < 0.5 else 1
-                        
-                    new_wolf_pos[j] = 1 if random.random() < prob else 0
-                
-                wolves[i] = new_wolf_pos
-                
-                _, total_weight = self._calculate_fitness(wolves[i])
-                while total_weight > self._capacity:
-                    ones_indices = [j for j, v in enumerate(wolves[i]) if v == 1]
-                    if not ones_indices: break
-                    wolves[i][random.choice(ones_indices)] = 0
-                    _, total_weight = self._calculate_fitness(wolves[i])
-
-            fitness_scores = [self._fitness_value(w) for w in wolves]
-            scored_wolves = sorted(zip(fitness_scores, wolves), key=lambda x: x[0], reverse=True)
-            
-            alpha = scored_wolves[0][1][:]
-            beta = scored_wolves[1][1][:]
-            delta = scored_wolves[2][1][:]
-
-            # So sánh và lưu giá trị tốt nhất toàn cục
-            current_best = scored_wolves[0][0]
+        first, inverse = unique_rows(pack_rows(wolves))
+        duplicates = len(wolves) - len(first)
+        if not duplicates:
+            return self._repair_population(wolves)[0]
+        self.duplicate_wolves += duplicates
+
+        if self._duplicate_policy == "reseed":
+            is_duplicate = np.ones(len(wolves), dtype=bool)
+            is_duplicate[first] = False
+            wolves[is_duplicate] = self._rng.integers(0, 2, size=(duplicates, self._n), dtype=np.uint8)
+            return self._repair_population(wolves)[0]
+
+        # Sửa tham lam là tất định nên các bản trùng cho cùng kết quả với con đại diện
+        unique = wolves[first]
+        values, _ = self._repair_population(unique)
+        wolves[:] = unique[inverse]
+        return values[inverse]
+
+    def _select_leaders(self, fitness_scores: np.ndarray) -> np.ndarray:
+        """Trả về chỉ số của Alpha, Beta, Delta (3 con sói tốt nhất)."""
+        order = np.argsort(-fitness_scores, kind="stable")
+        return order[np.minimum(np.arange(3), len(order) - 1)]
+
+    def _set_leaders(self, wolves: np.ndarray, values: np.ndarray):
+        """Chọn Alpha, Beta, Delta và cập nhật nghiệm tốt nhất toàn cục."""
+        with self._timed("leaders"):
+            top = self._select_leaders(values)
+            self._leaders = wolves[top].copy()
+            self._wolf_values = values
+            self._alpha_weight = int(self._weights_arr @ self._leaders[0])
+            current_best = int(values[top[0]])
             if current_best > self.best_value:
                 self.best_value = current_best
-                self.best_solution = alpha[:]
-            
-            _, best_weight = self._calculate_fitness(alpha)
-            self.history.append(f"Lần {iteration}: Giá trị={self.best_value}, Trọng lượng={best_weight}")
-            self.history_values.append(self.best_value)  # Lưu giá trị tốt nhất
+                self.best_solution = self._leaders[0].copy()
+
+    def start_population(self) -> np.ndarray:
+        """Khởi tạo quần thể đã sửa, chọn con đầu đàn ban đầu và đặt lại lịch sử."""
+        self._begin_run()
+        with self._timed("init"):
+            wolves = self._init_population()
+            values, _ = self._repair_population(wolves)
+            self.best_value = -1
+            self._set_leaders(wolves, values)
+        self.history = ConvergenceHistory()
+        return wolves
+
+    def run_iterations(self, wolves: np.ndarray, start: int, stop: int) -> np.ndarray:
+        """Chạy các vòng lặp GWO từ start đến stop (hệ số a vẫn tính theo max_iterations)."""
+        every = self._checkpoint_interval()
+        for iteration in range(start, stop):
+            a = 2 - iteration * (2 / self._max_iterations)
+
+            with self._timed("update"):
+                wolves = self._update_positions(wolves, self._leaders, a)
+            with self._timed("repair"):
+                values = self._repair_unique(wolves)
+            self._set_leaders(wolves, values)
+
+            self.history.append(self.best_value, self._alpha_weight)
+
+            if iteration % every == 0 and not self._checkpoint(iteration, self.best_value, self._alpha_weight):
+                break
+        return wolves
+
+    def export_state(self, wolves: np.ndarray) -> dict:
+        """
+        Đóng gói trạng thái quần thể (sói, giá trị của từng sói, RNG, nghiệm tốt nhất) cùng trạng thái
+        các tiêu chí dừng (thời gian đã chạy, số lần đánh giá, mốc cải thiện cuối) để tiếp tục ở tiến trình khác.
+        """
+        self.history.mark()
+        return {
+            'wolves': wolves,
+            'values': self._wolf_values,
+            'rng': self._rng,
+            'best_value': self.best_value,
+            'best_solution': self.best_solution,
+            'elapsed': time.perf_counter() - self._run_start,
+            'evaluations': self.evaluations - self._run_evaluations,
+            'stall': (self._stall_best, self._stall_since),
+            'stop_reason': self.stop_reason,
+        }
+
+    def restore_state(self, state: dict) -> np.ndarray:
+        """
+        Khôi phục trạng thái từ export_state (có thể đã nhận sói di cư kèm giá trị của chúng). Trả về quần thể.
+        Quần thể không được đánh giá lại, nên số lần đánh giá không bị cộng thêm mỗi epoch.
+        """
+        self._resume_run(state['elapsed'], state['evaluations'], state['stall'], state['stop_reason'])
+        self._rng = state['rng']
+        self.best_value = state['best_value']
+        self.best_solution = state['best_solution']
+        wolves = state['wolves']
+        self._set_leaders(wolves, state['values'])
+        return wolves
+
+    def solve(self) -> Tuple[List[str], ConvergenceHistory, float]:
+        """Thực thi thuật toán Grey Wolf Optimizer (GWO)."""
+        start_time = time.perf_counter()
+        
+        wolves = self.start_population()
+        self.run_iterations(wolves, 0, self._max_iterations)
+        self._finish_run()
 
-        self.exec_time = time.time() - start_time
+        self.exec_time = time.perf_counter() - start_time
         
-        selected_items = [self._item_names[i] for i, v in enumerate(self.best_solution) if v == 1]
-        return selected_items, self.history, self.exec_time
\ No newline at end of file
+        selected_items = self._selected_names(self.best_solution)
+        return selected_items, self.history, self.exec_time
@@ -1,53 +1,167 @@
-import random
 import time
+import numpy as np
 from typing import List, Tuple
 from knapsack_base import KnapsackAlgorithmBase
+from convergence_history import ConvergenceHistory
 
 class HillClimbing(KnapsackAlgorithmBase):
     """Giải bài toán Knapsack bằng thuật toán Hill Climbing."""
 
-    def _generate_neighbor(self, sol: List[int]) -> List[int]:
-        """Tạo lân cận bằng cách đảo bit ngẫu nhiên tại một vị trí."""
-        new_sol = sol[:]
-        i = random.randint(0, self._n - 1)
-        new_sol[i] = 1 - new_sol[i] 
+    # Mỗi vòng lặp delta chỉ tốn vài trăm ns nên tiêu chí dừng được kiểm tra thưa hơn
+    _STOP_CHECK_EVERY = 64
+    # Số vị trí đảo bit rút từ bộ sinh số ngẫu nhiên một lần
+    _BATCH = 4096
+
+    def __init__(self, *args, delta_evaluation: bool = True, **kwargs):
+        """
+        Khởi tạo đối tượng Hill Climbing.
+
+        delta_evaluation=True: giữ tổng giá trị/trọng lượng hiện tại và chấm điểm mỗi
+        bước đảo bit trong O(1); False: tính lại toàn bộ Fitness cho mỗi lân cận (O(n)),
+        khi đó bộ nhớ đệm fitness_cache_bytes giúp bỏ qua các lân cận đã chấm điểm.
+        """
+        super().__init__(*args, **kwargs)
+        self._delta_evaluation = delta_evaluation
+
+    def _generate_neighbor(self, sol: np.ndarray, i: int) -> np.ndarray:
+        """Tạo lân cận bằng cách đảo bit tại vị trí i (được rút ngẫu nhiên theo lô)."""
+        new_sol = sol.copy()
+        new_sol[i] ^= 1
         return new_sol
 
-    def solve(self) -> Tuple[List[str], List[str], float]:
+    def _positions(self, iteration: int) -> List[int]:
+        """Rút một lô vị trí đảo bit cho các vòng lặp từ iteration trở đi."""
+        size = min(self._BATCH, self._max_iterations - iteration)
+        return self._rng.integers(0, self._n, size=size).tolist()
+
+    def solve(self) -> Tuple[List[str], ConvergenceHistory, float]:
         """Thực thi thuật toán Hill Climbing để tìm nghiệm tối ưu."""
-        start_time = time.time()
+        start_time = time.perf_counter()
+        self._begin_run()
+
+        with self._timed("init"):
+            current_solution, current_value, current_weight = self._random_solution()
+
+        self.best_solution = current_solution.copy()
+        self.best_value = current_value
+        self.history = ConvergenceHistory()
+
+        with self._timed("update"):
+            if self._delta_evaluation and self._m > 1:
+                self._solve_delta_multi(current_solution, current_value, current_weight)
+            elif self._delta_evaluation:
+                self._solve_delta(current_solution, current_value, current_weight)
+            else:
+                self._solve_full(current_solution, current_value, current_weight)
+        self._finish_run()
+
+        self.exec_time = time.perf_counter() - start_time
         
-        current_solution = [random.randint(0, 1) for _ in range(self._n)]
-        current_value, current_weight = self._calculate_fitness(current_solution)
-
-        while current_weight > self._capacity:
-            ones_indices = [i for i, v in enumerate(current_solution) if v == 1]
-            if not ones_indices: break
-            
-            idx = random.choice(ones_indices)
-            current_solution[idx] = 0
-            current_value, current_weight = self._calculate_fitness(current_solution)
-
-        self.best_solution = current_solution[:]
-        self.best_value, best_weight = current_value, current_weight
-        self.history = []
-        self.history_values = []
+        selected_items = self._selected_names(self.best_solution)
+        return selected_items, self.history, self.exec_time
 
+    def _solve_full(self, current_solution: np.ndarray, current_value: int, current_weight: int):
+        """
+        Vòng lặp HC tính lại Fitness đầy đủ cho mỗi lân cận. Khi bật bộ nhớ đệm, khóa của lân cận
+        được suy ra từ khóa nghiệm hiện tại trong O(1) thay vì băm lại cả nghiệm.
+        """
+        every = self._checkpoint_interval()
+        feasible = self._feasible
+        reported = self._reported_weight
+        cache = self.fitness_cache
+        current_key = neighbor_key = cache.solution_key(current_solution) if cache is not None else None
         for iteration in range(self._max_iterations):
-            neighbor = self._generate_neighbor(current_solution)
-            value, weight = self._calculate_fitness(neighbor)
+            j = iteration % self._BATCH
+            if j == 0:
+                positions = self._positions(iteration)
+            i = positions[j]
+            if cache is not None:
+                neighbor_key = cache.flip_key(current_key, i, bool(current_solution[i]))
+            neighbor = self._generate_neighbor(current_solution, i)
+            value, weight = self._calculate_fitness(neighbor, neighbor_key)
 
-            if weight <= self._capacity and value > current_value:
-                current_solution = neighbor[:]
+            if value > current_value and feasible(weight):
+                current_solution, current_key = neighbor, neighbor_key
                 current_value, current_weight = value, weight
                 if current_value > self.best_value:
-                    self.best_solution = current_solution[:]
-                    self.best_value, best_weight = current_value, current_weight
+                    self.best_solution = current_solution.copy()
+                    self.best_value = current_value
 
-            self.history.append(f"Lần {iteration}: Giá trị={current_value}, Trọng lượng={current_weight}")
-            self.history_values.append(self.best_value)  # Lưu giá trị tốt nhất
+            self.history.append(current_value, reported(current_weight))
 
-        self.exec_time = time.time() - start_time
-        
-        selected_items = [self._item_names[i] for i, v in enumerate(self.best_solution) if v == 1]
-        return selected_items, self.history, self.exec_time
\ No newline at end of file
+            if iteration % every == 0 and not self._checkpoint(iteration, self.best_value, reported(current_weight)):
+                break
+
+    def _solve_delta(self, current_solution: np.ndarray, current_value: int, current_weight: int):
+        """Vòng lặp HC đánh giá tăng dần: mỗi bước đảo bit chỉ tốn O(1)."""
+        values = self._values_arr.tolist()
+        weights = self._weights_arr.tolist()
+        bits = bytearray(current_solution.tobytes())
+        record = self.history.append
+        capacity = self._capacity
+        every = self._checkpoint_interval()
+        evaluations = self.evaluations
+        iteration = -1
+
+        for iteration in range(self._max_iterations):
+            j = iteration % self._BATCH
+            if j == 0:
+                positions = self._positions(iteration)
+            i = positions[j]
+            sign = -1 if bits[i] else 1
+            value = current_value + sign * values[i]
+            weight = current_weight + sign * weights[i]
+
+            # Chỉ nhận bước cải thiện nên nghiệm hiện tại luôn là nghiệm tốt nhất
+            if weight <= capacity and value > current_value:
+                bits[i] ^= 1
+                current_value, current_weight = value, weight
+
+            record(current_value, current_weight)  # Nghiệm hiện tại luôn là nghiệm tốt nhất
+
+            if iteration % every == 0:
+                self.evaluations = evaluations + iteration + 1
+                if not self._checkpoint(iteration, current_value, current_weight):
+                    break
+
+        self.evaluations = evaluations + iteration + 1  # Mỗi vòng lặp chấm điểm một lân cận bằng delta
+        self.best_solution = np.frombuffer(bytes(bits), dtype=np.uint8).copy()
+        self.best_value = current_value
+
+    def _solve_delta_multi(self, current_solution: np.ndarray, current_value: int, current_loads: np.ndarray):
+        """Như _solve_delta khi có nhiều ràng buộc: mỗi bước đảo bit cập nhật tải của m chiều trong O(m)."""
+        values = self._values_arr.tolist()
+        rows = self._weight_matrix.tolist()
+        capacities = self._capacities.tolist()
+        loads = current_loads.tolist()
+        bits = bytearray(current_solution.tobytes())
+        record = self.history.append
+        every = self._checkpoint_interval()
+        evaluations = self.evaluations
+        iteration = -1
+
+        for iteration in range(self._max_iterations):
+            j = iteration % self._BATCH
+            if j == 0:
+                positions = self._positions(iteration)
+            i = positions[j]
+            sign = -1 if bits[i] else 1
+            value = current_value + sign * values[i]
+
+            # Tải chỉ được tính khi bước làm tăng giá trị (chỉ nhận bước cải thiện)
+            if value > current_value:
+                new_loads = [load + sign * w for load, w in zip(loads, rows[i])]
+                if all(load <= capacity for load, capacity in zip(new_loads, capacities)):
+                    bits[i] ^= 1
+                    current_value, loads = value, new_loads
+
+            record(current_value, loads[0])
+
+            if iteration % every == 0:
+                self.evaluations = evaluations + iteration + 1
+                if not self._checkpoint(iteration, current_value, loads[0]):
+                    break
+
+        self.evaluations = evaluations + iteration + 1
+        self.best_solution = np.frombuffer(bytes(bits), dtype=np.uint8).copy()
+        self.best_value = current_value
@@ -0,0 +1,109 @@
+import math
+import time
+import numpy as np
+from typing import List, Optional, Tuple
+from knapsack_base import KnapsackAlgorithmBase
+from convergence_history import ConvergenceHistory
+
+class SimulatedAnnealing(KnapsackAlgorithmBase):
+    """
+    Giải bài toán Knapsack bằng Simulated Annealing (luyện kim mô phỏng).
+
+    Mỗi bước đảo một bit ngẫu nhiên và được chấm điểm tăng dần trong O(1) như Hill Climbing,
+    nhưng bước làm giảm giá trị vẫn được chấp nhận với xác suất exp(delta / T);
+    nhiệt độ T giảm theo cấp số nhân từ nhiệt độ đầu tới nhiệt độ cuối.
+    """
+
+    # Số bước rút số ngẫu nhiên (vị trí đảo bit, ngưỡng chấp nhận) một lần
+    _BATCH = 4096
+    _STOP_CHECK_EVERY = 64
+    # Đánh giá tăng dần theo một trọng lượng vô hướng
+    _MULTI_CONSTRAINT = False
+
+    def __init__(self, *args, initial_temperature: Optional[float] = None,
+                 final_temperature: Optional[float] = None, **kwargs):
+        """
+        Khởi tạo đối tượng Simulated Annealing.
+
+        initial_temperature mặc định: bước bỏ một vật phẩm có giá trị trung bình được chấp nhận
+        với xác suất 50%; final_temperature mặc định bằng 1/1000 nhiệt độ đầu.
+        """
+        super().__init__(*args, **kwargs)
+        mean_value = float(self._values_arr.mean()) if self._n else 1.0
+        self._t0 = initial_temperature or max(mean_value / math.log(2), 1e-9)
+        self._t_end = final_temperature or self._t0 * 1e-3
+        if self._t0 <= 0 or self._t_end <= 0:
+            raise ValueError("Nhiệt độ phải dương")
+
+    def _thresholds(self, start: int, stop: int) -> List[float]:
+        """
+        Ngưỡng chấp nhận của các bước start..stop-1: bước có thay đổi giá trị delta được nhận khi
+        delta > T * ln(u), tương đương u < exp(delta / T) nhưng không cần tính exp trong vòng lặp.
+        """
+        steps = np.arange(start, stop) / max(1, self._max_iterations - 1)
+        temperatures = self._t0 * (self._t_end / self._t0) ** steps
+        with np.errstate(divide="ignore"):
+            return (temperatures * np.log(self._rng.random(stop - start))).tolist()
+
+    def solve(self) -> Tuple[List[str], ConvergenceHistory, float]:
+        """Thực thi thuật toán Simulated Annealing."""
+        start_time = time.perf_counter()
+        self._begin_run()
+
+        with self._timed("init"):
+            current_solution, current_value, current_weight = self._random_solution()
+        self.history = ConvergenceHistory()
+
+        values = self._values_arr.tolist()
+        weights = self._weights_arr.tolist()
+        bits = bytearray(current_solution.tobytes())
+        record = self.history.append
+        capacity = self._capacity
+        every = self._checkpoint_interval()
+        best_value, best_weight = current_value, current_weight
+        # Nghiệm tốt nhất = nghiệm hiện tại đảo ngược các bit đã đảo kể từ lần cải thiện cuối,
+        # nên không phải sao chép cả nghiệm mỗi lần tìm được nghiệm tốt hơn
+        flips_since_best: List[int] = []
+        evaluations = self.evaluations
+        iteration = -1
+
+        with self._timed("update"):
+            for iteration in range(self._max_iterations):
+                j = iteration % self._BATCH
+                if j == 0:
+                    stop = min(iteration + self._BATCH, self._max_iterations)
+                    positions = self._rng.integers(0, max(1, self._n), size=stop - iteration).tolist()
+                    thresholds = self._thresholds(iteration, stop)
+
+                i = positions[j]
+                if self._n:
+                    sign = -1 if bits[i] else 1
+                    weight = current_weight + sign * weights[i]
+                    delta = sign * values[i]
+                    if weight <= capacity and delta > thresholds[j]:
+                        bits[i] ^= 1
+                        current_value += delta
+                        current_weight = weight
+                        flips_since_best.append(i)
+                        if current_value > best_value:
+                            best_value, best_weight = current_value, current_weight
+                            flips_since_best.clear()
+
+                record(best_value, best_weight)
+
+                if iteration % every == 0:
+                    self.evaluations = evaluations + iteration + 1
+                    if not self._checkpoint(iteration, best_value, best_weight):
+                        break
+
+        for i in flips_since_best:
+            bits[i] ^= 1
+        self.evaluations = evaluations + iteration + 1
+        self.best_solution = np.frombuffer(bytes(bits), dtype=np.uint8).copy()
+        self.best_value = best_value
+        self._finish_run()
+
+        self.exec_time = time.perf_counter() - start_time
+
+        selected_items = self._selected_names(self.best_solution)
+        return selected_items, self.history, self.exec_time
@@ -0,0 +1,102 @@
+import math
+import time
+from collections import deque
+import numpy as np
+from typing import List, Optional, Tuple
+from knapsack_base import KnapsackAlgorithmBase
+from convergence_history import ConvergenceHistory
+
+class TabuSearch(KnapsackAlgorithmBase):
+    """
+    Giải bài toán Knapsack bằng Tabu Search.
+
+    Mỗi vòng lặp xét một mẫu neighborhood_size bước đảo bit (chấm điểm tăng dần, vector hóa)
+    và đi theo bước tốt nhất chưa bị cấm, kể cả khi bước đó làm giảm giá trị.
+    Danh sách cấm lưu băm Zobrist 64 bit của các nghiệm vừa đi qua trong một set + hàng đợi:
+    băm của nghiệm lân cận chỉ là một phép XOR, kiểm tra và cập nhật đều O(1).
+    Bước bị cấm vẫn được nhận nếu cho nghiệm tốt nhất mới (aspiration).
+    """
+
+    # Đánh giá tăng dần theo một trọng lượng vô hướng
+    _MULTI_CONSTRAINT = False
+
+    def __init__(self, *args, tabu_tenure: Optional[int] = None, neighborhood_size: int = 32, **kwargs):
+        """Khởi tạo đối tượng Tabu Search. tabu_tenure mặc định max(7, căn bậc hai của n)."""
+        super().__init__(*args, **kwargs)
+        if neighborhood_size < 1:
+            raise ValueError("neighborhood_size phải >= 1")
+        self._tabu_tenure = tabu_tenure or max(7, int(math.sqrt(self._n)))
+        self._neighborhood_size = neighborhood_size
+
+    def solve(self) -> Tuple[List[str], ConvergenceHistory, float]:
+        """Thực thi thuật toán Tabu Search."""
+        start_time = time.perf_counter()
+        self._begin_run()
+
+        with self._timed("init"):
+            current_solution, current_value, current_weight = self._random_solution()
+            self.history = ConvergenceHistory()
+
+            # Khóa Zobrist ngẫu nhiên cho từng vật phẩm; băm của nghiệm là XOR các khóa của vật phẩm được chọn
+            zobrist = self._rng.integers(0, 2**63, size=self._n, dtype=np.int64)
+            current_hash = int(np.bitwise_xor.reduce(zobrist[current_solution == 1])) if current_solution.any() else 0
+            tabu = {current_hash}
+            tabu_queue = deque([current_hash])
+
+        best_value, best_weight = current_value, current_weight
+        flips_since_best: List[int] = []  # Như SA: nghiệm tốt nhất được khôi phục khi kết thúc
+        sample_size = min(self._neighborhood_size, self._n)
+        every = self._checkpoint_interval()
+        evaluations = self.evaluations
+
+        with self._timed("update"):
+            for iteration in range(self._max_iterations):
+                if sample_size:
+                    candidates = self._rng.integers(0, self._n, size=sample_size)
+                    signs = 1 - 2 * current_solution[candidates].astype(np.int64)
+                    deltas = signs * self._values_arr[candidates]
+                    new_weights = current_weight + signs * self._weights_arr[candidates]
+                    hashes = (zobrist[candidates] ^ current_hash).tolist()
+                    feasible = (new_weights <= self._capacity).tolist()
+                    delta_list = deltas.tolist()
+
+                    for j in np.argsort(-deltas, kind="stable").tolist():
+                        if not feasible[j]:
+                            continue
+                        if hashes[j] in tabu and current_value + delta_list[j] <= best_value:
+                            continue
+                        i = int(candidates[j])
+                        current_solution[i] ^= 1
+                        current_value += delta_list[j]
+                        current_weight = int(new_weights[j])
+                        current_hash = hashes[j]
+                        flips_since_best.append(i)
+
+                        tabu.add(current_hash)
+                        tabu_queue.append(current_hash)
+                        if len(tabu_queue) > self._tabu_tenure:
+                            tabu.discard(tabu_queue.popleft())
+
+                        if current_value > best_value:
+                            best_value, best_weight = current_value, current_weight
+                            flips_since_best.clear()
+                        break
+
+                self.history.append(best_value, best_weight)
+
+                if iteration % every == 0:
+                    self.evaluations = evaluations + len(self.history) * sample_size
+                    if not self._checkpoint(iteration, best_value, best_weight):
+                        break
+
+        for i in flips_since_best:
+            current_solution[i] ^= 1
+        self.evaluations = evaluations + len(self.history) * sample_size
+        self.best_solution = current_solution
+        self.best_value = best_value
+        self._finish_run()
+
+        self.exec_time = time.perf_counter() - start_time
+
+        selected_items = self._selected_names(self.best_solution)
+        return selected_items, self.history, self.exec_time
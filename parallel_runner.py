@@ -0,0 +1,313 @@
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, Future
+from multiprocessing import shared_memory
+import numpy as np
+from typing import List, Dict, Optional, Sequence, Tuple, Type, Union
+from knapsack_base import KnapsackAlgorithmBase, binary_split
+from knapsack_gwo import GreyWolfOptimizer
+from convergence_history import ConvergenceHistory
+from data_handler import load_knapsack_arrays, split_items
+from instrumentation import merge_reports
+from run_control import CancelToken
+
+# Dữ liệu vật phẩm của tiến trình worker, được gán một lần bởi _init_worker
+_worker_data: Dict = {}
+
+
+def _init_worker(shm_name: Optional[str], dataset_file: Optional[str], shape: Tuple[int, int], dimensions: int, bounded: bool,
+                 names: Optional[List[str]], progress_queue, cancel_token: Optional[CancelToken]):
+    """
+    Gắn tiến trình worker vào dữ liệu vật phẩm dùng chung (chỉ đọc): hoặc vùng shared memory,
+    hoặc cache nhị phân của dataset_file được mở bằng memory map.
+    """
+    shm = None
+    if dataset_file is not None:
+        data = load_knapsack_arrays(dataset_file)
+        items, names = data['items'], data['names'].tolist()
+        dimensions, bounded = len(data['dimensions']), data['bounded']
+    else:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        items = np.ndarray(shape, dtype=np.int64, buffer=shm.buf)
+        items.flags.writeable = False
+    values, weights, bounds = split_items(items, dimensions, bounded)
+    _worker_data.update(shm=shm, names=names, values=values, weights=weights, bounds=bounds,
+                        progress_queue=progress_queue, cancel_token=cancel_token)
+
+
+def _new_algorithm(algo_class: Type[KnapsackAlgorithmBase], capacity: Union[int, Sequence[int]], max_iterations: int,
+                   seed: np.random.SeedSequence, algo_kwargs: Dict, tag=None) -> KnapsackAlgorithmBase:
+    """Tạo đối tượng thuật toán từ dữ liệu dùng chung của worker, nối tiến độ về progress_queue (nếu có)."""
+    algo = algo_class(
+        _worker_data['names'], _worker_data['values'], _worker_data['weights'],
+        capacity, max_iterations, seed=seed, cancel_token=_worker_data['cancel_token'],
+        item_bounds=_worker_data['bounds'], **algo_kwargs
+    )
+    progress_queue = _worker_data['progress_queue']
+    if progress_queue is not None:
+        algo.add_progress_callback(lambda event: progress_queue.put((tag, event)))
+    return algo
+
+
+def _run_restart(algo_class: Type[KnapsackAlgorithmBase], capacity: Union[int, Sequence[int]], max_iterations: int,
+                 seed: np.random.SeedSequence, algo_kwargs: Dict, tag=None) -> Dict:
+    """Chạy một lần khởi động độc lập của thuật toán trong tiến trình worker (luồng số ngẫu nhiên riêng `seed`)."""
+    start_time = time.perf_counter()
+    algo = _new_algorithm(algo_class, capacity, max_iterations, seed, algo_kwargs, tag)
+    algo.solve()
+    quantities = algo.item_quantities()
+    indices = np.flatnonzero(quantities)
+    return {
+        'seed': algo.seed,
+        'stream': algo.seed_stream,
+        'pid': os.getpid(),
+        'best_value': algo.best_value,
+        'best_indices': indices,
+        'best_quantities': quantities[indices],
+        'history': algo.history,
+        'exec_time': algo.exec_time,
+        'cancelled': algo.cancelled,
+        'stop_reason': algo.stop_reason,
+        'performance': algo.performance_report() if algo.perf is not None else None,
+        'worker_time': time.perf_counter() - start_time,
+    }
+
+
+def _run_island_epoch(capacity: Union[int, Sequence[int]], max_iterations: int, seed: np.random.SeedSequence, algo_kwargs: Dict,
+                      state: Optional[Dict], start: int, stop: int, tag=None) -> Dict:
+    """Chạy một đảo GWO từ vòng start đến stop, trả về trạng thái để di cư và tiếp tục."""
+    start_time = time.perf_counter()
+    gwo = _new_algorithm(GreyWolfOptimizer, capacity, max_iterations, seed, algo_kwargs, tag)
+    if state is None:
+        wolves = gwo.start_population()
+    else:
+        wolves = gwo.restore_state(state)
+    wolves = gwo.run_iterations(wolves, start, stop)
+    result = gwo.export_state(wolves)
+    result.update(
+        pid=os.getpid(),
+        history=gwo.history,
+        cancelled=gwo.cancelled,
+        performance=gwo.performance_report() if gwo.perf is not None else None,
+        worker_time=time.perf_counter() - start_time,
+    )
+    return result
+
+
+class RunResult:
+    """Kết quả tốt nhất của một thuật toán sau khi chạy song song nhiều worker."""
+
+    def __init__(self, algorithm: str, item_names: List[str], best: Dict, workers: List[Dict], wall_time: float):
+        """Khởi tạo kết quả từ worker tốt nhất và thông tin thời gian của từng worker."""
+        self.algorithm = algorithm
+        self.best_value = best['best_value']
+        self.best_indices = best['best_indices']
+        # Số lượng của từng vật phẩm được chọn (luôn là 1 trong bài toán 0/1)
+        self.quantities = best.get('best_quantities', np.ones(len(self.best_indices), dtype=np.int64))
+        self.selected = [item_names[i] if q == 1 else f"{item_names[i]} x{q}"
+                         for i, q in zip(self.best_indices, self.quantities.tolist())]
+        self.history = best['history']
+        self.history_values = best.get('history_values', self.history.best_values)
+        # Chạy lại được bằng seed=np.random.SeedSequence(seed, spawn_key=seed_stream)
+        self.seed = best.get('seed')
+        self.seed_stream = best.get('stream', ())
+        self.stop_reason = best.get('stop_reason')  # Tiêu chí đã kết thúc lần chạy tốt nhất (khóa của STOP_REASONS)
+        self.performance = best.get('performance')  # Báo cáo hiệu năng của worker tốt nhất (khi bật instrument)
+        self.cancelled = any(w.get('cancelled', False) for w in workers)
+        self.workers = workers
+        # wall_time tính từ start_time do bên gọi truyền vào (có thể dùng chung cho nhiều thuật toán nên gồm cả
+        # thời gian chờ trong hàng đợi của pool); exec_time chỉ tính thời gian chạy của chính thuật toán này:
+        # thời gian của worker chậm nhất
+        self.wall_time = wall_time
+        self.exec_time = max(self.worker_times(), default=0.0)
+
+    def worker_times(self) -> List[float]:
+        """Thời gian chạy của từng worker (giây)."""
+        return [w['worker_time'] for w in self.workers]
+
+
+class ParallelRunner:
+    """
+    Chạy các thuật toán trên nhiều tiến trình bằng ProcessPoolExecutor để tránh giới hạn GIL.
+
+    Mảng giá trị/trọng lượng được đặt vào shared memory một lần và mỗi worker gắn vào khi
+    khởi động, thay vì pickle dữ liệu vật phẩm cho từng tác vụ. Nếu truyền dataset_file
+    (file CSV đã có cache nhị phân), các worker mở thẳng cache bằng memory map nên không cần
+    sao chép dữ liệu lẫn pickle tên vật phẩm. Dùng như context manager.
+
+    progress_queue (ví dụ multiprocessing.Manager().Queue()) nhận các cặp (tag, ProgressEvent)
+    với tag = (tên thuật toán, số thứ tự worker); cancel_token nên bọc Event của Manager
+    để yêu cầu dừng tới được các tiến trình worker.
+
+    item_weights và item_bounds có cùng ý nghĩa như ở KnapsackAlgorithmBase (ma trận m x n khi có
+    nhiều ràng buộc, số lượng tối đa của từng vật phẩm); capacity truyền cho từng lần chạy.
+    """
+
+    def __init__(self, item_names: List[str], item_values: List[int], item_weights: List[int],
+                 max_workers: Optional[int] = None, progress_queue=None,
+                 cancel_token: Optional[CancelToken] = None, dataset_file: Optional[str] = None,
+                 item_bounds: Optional[Sequence[int]] = None):
+        """Khởi tạo bộ chạy song song. max_workers mặc định bằng số nhân CPU."""
+        self._dataset_file = dataset_file
+        self._progress_queue = progress_queue
+        self._cancel_token = cancel_token
+        self._item_names = item_names
+        n = len(item_names)
+        weights = np.atleast_2d(np.asarray(item_weights, dtype=np.int64))
+        rows = [np.asarray(item_values, dtype=np.int64).reshape(1, n), weights]
+        if item_bounds is not None:
+            rows.append(np.asarray(item_bounds, dtype=np.int64).reshape(1, n))
+        # Hàng 0: giá trị, m hàng trọng lượng, hàng số lượng tối đa (nếu có) - cùng bố cục với data_handler
+        self._items = np.ascontiguousarray(np.vstack(rows))
+        self._layout = (len(weights), item_bounds is not None)
+        # Giá trị của từng bit trong nghiệm (các gói khi có giới hạn số lượng), dùng để xếp hạng sói khi di cư
+        self._packs = None
+        if item_bounds is not None:
+            self._packs = binary_split(item_bounds)
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._shm = None
+        self._executor = None
+
+    def __enter__(self):
+        """Tạo shared memory (nếu không dùng cache của dataset_file) và pool tiến trình."""
+        if self._dataset_file is not None:
+            initargs = (None, self._dataset_file, self._items.shape) + self._layout + (None,)
+        else:
+            self._shm = shared_memory.SharedMemory(create=True, size=max(1, self._items.nbytes))
+            np.ndarray(self._items.shape, dtype=np.int64, buffer=self._shm.buf)[:] = self._items
+            initargs = (self._shm.name, None, self._items.shape) + self._layout + (self._item_names,)
+        # "spawn" để tiến trình con không kế thừa trạng thái Tk của luồng giao diện
+        self._executor = ProcessPoolExecutor(
+            max_workers=self._max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=initargs + (self._progress_queue, self._cancel_token),
+        )
+        return self
+
+    def __exit__(self, *exc):
+        """Đóng pool và giải phóng shared memory."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+        return False
+
+    def submit_restarts(self, algo_class: Type[KnapsackAlgorithmBase], capacity: Union[int, Sequence[int]],
+                        max_iterations: int,
+                        restarts: int, seed: Optional[int] = None, **algo_kwargs) -> List[Future]:
+        """
+        Gửi K lần khởi động độc lập vào pool, không chờ kết quả. Lần thứ k dùng luồng con thứ k của
+        SeedSequence(seed) nên các worker không trùng luồng số ngẫu nhiên (seed=None: entropy hệ thống).
+        """
+        seeds = np.random.SeedSequence(seed).spawn(restarts)
+        return [
+            self._executor.submit(_run_restart, algo_class, capacity, max_iterations, s, algo_kwargs,
+                                  (algo_class.__name__, k))
+            for k, s in enumerate(seeds)
+        ]
+
+    def collect(self, algorithm: str, futures: List[Future], start_time: float) -> RunResult:
+        """Chờ các tác vụ hoàn tất và giữ lại kết quả tốt nhất."""
+        workers = [f.result() for f in futures]
+        best = max(workers, key=lambda w: w['best_value'])
+        return RunResult(algorithm, self._item_names, best, workers, time.perf_counter() - start_time)
+
+    def run_restarts(self, algo_class: Type[KnapsackAlgorithmBase], capacity: Union[int, Sequence[int]],
+                     max_iterations: int,
+                     restarts: int, seed: Optional[int] = None, **algo_kwargs) -> RunResult:
+        """Chạy K lần khởi động độc lập trên mọi nhân CPU và trả về kết quả tốt nhất."""
+        start_time = time.perf_counter()
+        futures = self.submit_restarts(algo_class, capacity, max_iterations, restarts, seed, **algo_kwargs)
+        return self.collect(algo_class.__name__, futures, start_time)
+
+    def run_island_gwo(self, capacity: Union[int, Sequence[int]], max_iterations: int, islands: int, migration_interval: int = 10,
+                       migrants: int = 2, seed: Optional[int] = None, **algo_kwargs) -> RunResult:
+        """
+        GWO mô hình đảo: mỗi worker tiến hóa một quần thể riêng, cứ migration_interval vòng
+        thì `migrants` con sói tốt nhất của mỗi đảo thay thế những con kém nhất ở đảo kế tiếp (vòng tròn).
+        Tiêu chí dừng sớm (time_budget, max_evaluations, stall_iterations) tính riêng cho từng đảo,
+        mỗi đảo chỉ tính thời gian tính toán của chính nó. Đảo đã dừng sớm không được chạy tiếp
+        (vẫn cho sói di cư sang đảo khác); mô hình đảo dừng khi mọi đảo đã dừng.
+        """
+        start_time = time.perf_counter()
+        seeds = np.random.SeedSequence(seed).spawn(islands)
+        states: List[Optional[Dict]] = [None] * islands
+        histories = [ConvergenceHistory() for _ in range(islands)]
+        worker_times = [0.0] * islands
+        reports: List[List[Dict]] = [[] for _ in range(islands)]
+        pids = [None] * islands
+        done = [False] * islands
+        cancelled = False
+
+        for start in range(0, max(max_iterations, 1), migration_interval):
+            stop = min(start + migration_interval, max_iterations)
+            futures = {
+                k: self._executor.submit(_run_island_epoch, capacity, max_iterations, seeds[k], algo_kwargs,
+                                         states[k], start, stop, ("GreyWolfOptimizer", k))
+                for k in range(islands) if not done[k]
+            }
+            for k, future in futures.items():
+                state = states[k] = future.result()
+                histories[k].extend(state.pop('history'))
+                worker_times[k] += state.pop('worker_time')
+                pids[k] = state.pop('pid')
+                report = state.pop('performance')
+                if report is not None:
+                    reports[k].append(report)
+                cancelled |= state.pop('cancelled')
+                done[k] = state['stop_reason'] is not None
+            if cancelled or all(done):
+                break
+            if islands > 1 and stop < max_iterations:
+                self._migrate(states, migrants)
+
+        best_k = max(range(islands), key=lambda k: states[k]['best_value'])
+        stop_reasons = ["cancelled" if cancelled else state['stop_reason'] or "max_iterations" for state in states]
+        # Các đảo có thể dừng ở những vòng lặp khác nhau: đảo đã dừng giữ nguyên giá trị cuối
+        length = max(len(h) for h in histories)
+        curves = [np.concatenate([h.best_values, np.full(length - len(h), h.best_values[-1] if len(h) else 0, dtype=np.int64)])
+                  for h in histories]
+        quantities = self._item_quantities(states[best_k]['best_solution'])
+        indices = np.flatnonzero(quantities)
+        best = {
+            'seed': seeds[best_k].entropy,
+            'stream': seeds[best_k].spawn_key,
+            'best_value': states[best_k]['best_value'],
+            'best_indices': indices,
+            'best_quantities': quantities[indices],
+            'history': histories[best_k],
+            'stop_reason': stop_reasons[best_k],
+            'performance': merge_reports(reports[best_k]) if reports[best_k] else None,
+            # Đường hội tụ toàn cục: giá trị tốt nhất của mọi đảo tại từng vòng lặp
+            'history_values': np.max(curves, axis=0),
+        }
+        workers = [
+            {'seed': seeds[k].entropy, 'stream': seeds[k].spawn_key, 'pid': pids[k], 'best_value': states[k]['best_value'],
+             'worker_time': worker_times[k], 'cancelled': cancelled, 'stop_reason': stop_reasons[k]}
+            for k in range(islands)
+        ]
+        return RunResult("GreyWolfOptimizer (island)", self._item_names, best, workers,
+                         time.perf_counter() - start_time)
+
+    def _item_quantities(self, solution: np.ndarray) -> np.ndarray:
+        """Số lượng của từng vật phẩm trong một nghiệm 0/1 (trên các gói khi có giới hạn số lượng)."""
+        if self._packs is None:
+            return np.asarray(solution, dtype=np.int64)
+        owners, sizes = self._packs
+        return np.bincount(owners, weights=solution * sizes, minlength=len(self._item_names)).astype(np.int64)
+
+    def _migrate(self, states: List[Dict], migrants: int):
+        """
+        Di cư vòng tròn: sói tốt nhất của đảo k thay sói kém nhất của đảo k+1 (mọi sói đều đã hợp lệ).
+        Sói mang theo giá trị đã tính nên đảo nhận không phải đánh giá lại.
+        """
+        ranked = [np.argsort(-state['values'], kind="stable") for state in states]
+        outgoing = [(state['wolves'][order[:migrants]].copy(), state['values'][order[:migrants]].copy())
+                    for state, order in zip(states, ranked)]
+        for k, state in enumerate(states):
+            source, source_values = outgoing[k - 1]
+            worst = ranked[k][::-1][:len(source)]
+            state['wolves'][worst] = source
+            state['values'][worst] = source_values
@@ -0,0 +1,44 @@
+from typing import Dict, NamedTuple
+
+# Điều khiển lần chạy (tiến độ, hủy, lý do dừng) không phụ thuộc NumPy: giao diện import được ngay lúc khởi động
+
+
+class ProgressEvent(NamedTuple):
+    """Sự kiện tiến độ gọn nhẹ được phát trong khi thuật toán chạy."""
+    iteration: int
+    best_value: int
+    weight: int
+
+
+class CancelToken:
+    """
+    Cờ hủy dùng chung giữa giao diện và thuật toán đang chạy.
+
+    Có thể bọc một đối tượng Event bất kỳ (threading.Event hoặc Event của multiprocessing.Manager)
+    để dùng được cả với luồng lẫn tiến trình worker.
+    """
+    def __init__(self, event=None):
+        """Khởi tạo token, mặc định dùng threading.Event."""
+        if event is None:
+            import threading
+            event = threading.Event()
+        self._event = event
+
+    def cancel(self):
+        """Yêu cầu dừng thuật toán."""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """True nếu đã có yêu cầu dừng."""
+        return self._event.is_set()
+
+
+# Tiêu chí đã kết thúc lần chạy (giá trị của stop_reason) và nhãn hiển thị
+STOP_REASONS: Dict[str, str] = {
+    "max_iterations": "đủ số vòng lặp",
+    "time_budget": "hết thời gian cho phép",
+    "max_evaluations": "đủ số lần đánh giá",
+    "stall": "không cải thiện",
+    "cancelled": "người dùng dừng",
+}
@@ -0,0 +1,81 @@
+import importlib
+from typing import Dict, List, NamedTuple, Optional, Type, Union
+
+
+class SolverSpec(NamedTuple):
+    """
+    Mô tả một bộ giải đã đăng ký: giao diện, dòng lệnh và bộ đo hiệu năng đều dựng từ đây.
+
+    target là Class bộ giải hoặc chuỗi "module:Class"; dạng chuỗi chỉ import module (và NumPy)
+    ở lần đầu truy cập spec.cls, nên đọc danh sách bộ giải không làm chậm lúc khởi động.
+    """
+    key: str                                # Tên ngắn dùng ở dòng lệnh (ví dụ "gwo")
+    name: str                               # Tên hiển thị trên giao diện
+    target: Union[type, str]                # Class bộ giải hoặc "module:Class"
+    defaults: Dict = {}                     # Tham số mặc định truyền cho constructor
+    color: str = "green"                    # Màu đường hội tụ
+    population_kwarg: Optional[str] = None  # Tên tham số kích thước quần thể (nếu có)
+    supports_islands: bool = False          # Chạy được theo mô hình đảo của ParallelRunner
+    baseline: bool = False                  # Bộ giải chính xác dùng làm mốc, không chạy như heuristic
+
+    def load(self) -> Type:
+        """Import module của bộ giải (nếu chưa import) và trả về Class."""
+        if isinstance(self.target, str):
+            module, _, class_name = self.target.partition(":")
+            return getattr(importlib.import_module(module), class_name)
+        return self.target
+
+    @property
+    def cls(self) -> Type:
+        """Class bộ giải (lớp con của KnapsackAlgorithmBase), import module ở lần dùng đầu tiên."""
+        return self.load()
+
+    @property
+    def multi_constraint(self) -> bool:
+        """Giải được bài toán nhiều ràng buộc trọng lượng hay không (đọc từ _MULTI_CONSTRAINT của Class)."""
+        return self.cls._MULTI_CONSTRAINT
+
+    @property
+    def class_name(self) -> str:
+        """Tên Class bộ giải, không cần import module."""
+        return self.target.partition(":")[2] if isinstance(self.target, str) else self.target.__name__
+
+
+# Các bộ giải theo thứ tự đăng ký (thứ tự hiển thị)
+SOLVERS: Dict[str, SolverSpec] = {}
+
+
+def register_solver(spec: SolverSpec) -> SolverSpec:
+    """Đăng ký một bộ giải mới; khóa phải chưa tồn tại."""
+    if spec.key in SOLVERS:
+        raise ValueError(f"Bộ giải '{spec.key}' đã được đăng ký")
+    SOLVERS[spec.key] = spec
+    return spec
+
+
+def get_solver(key: str) -> SolverSpec:
+    """Tra bộ giải theo khóa."""
+    try:
+        return SOLVERS[key]
+    except KeyError:
+        raise ValueError(f"Bộ giải không hợp lệ: {key} (chọn trong {', '.join(SOLVERS)})") from None
+
+
+def heuristic_solvers() -> List[SolverSpec]:
+    """Các bộ giải heuristic (không tính bộ giải chính xác làm mốc)."""
+    return [spec for spec in SOLVERS.values() if not spec.baseline]
+
+
+def solver_for_class(class_name: str) -> Optional[SolverSpec]:
+    """Tra bộ giải theo tên Class (tag tiến độ của worker dùng tên Class)."""
+    return next((spec for spec in SOLVERS.values() if spec.class_name == class_name), None)
+
+
+register_solver(SolverSpec("hc", "Hill Climbing", "knapsack_hc:HillClimbing", color="blue"))
+register_solver(SolverSpec("gwo", "Grey Wolf Optimizer", "knapsack_gwo:GreyWolfOptimizer", {'num_wolves': 30},
+                           color="red", population_kwarg="num_wolves", supports_islands=True))
+register_solver(SolverSpec("sa", "Simulated Annealing", "knapsack_sa:SimulatedAnnealing", color="orange"))
+register_solver(SolverSpec("tabu", "Tabu Search", "knapsack_tabu:TabuSearch", color="purple"))
+register_solver(SolverSpec("ga", "Genetic Algorithm", "knapsack_ga:GeneticAlgorithm", {'population_size': 50},
+                           color="green", population_kwarg="population_size"))
+register_solver(SolverSpec("exact", "Exact (DP / B&B)", "knapsack_exact:ExactSolver", color="black", baseline=True))
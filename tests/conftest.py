@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+# Các module nằm phẳng ở thư mục gốc của dự án
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def dataset():
+    """Đường dẫn tuyệt đối tới một dataset đi kèm dự án (ví dụ dataset("dataset_500.csv"))."""
+    return lambda name: os.path.join(ROOT, name)
+
+
+@pytest.fixture(scope="session")
+def items_500():
+    """Dữ liệu dataset_500.csv (một ràng buộc, sức chứa dùng trong test: 5000)."""
+    from data_handler import load_knapsack_data_from_csv
+    return load_knapsack_data_from_csv(os.path.join(ROOT, "dataset_500.csv"), use_cache=False)
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+import bit_solution
+from bit_solution import BitSolution, hamming_distances, pack_rows, unique_rows, unpack_rows
+
+
+@pytest.fixture
+def population():
+    return np.random.default_rng(0).integers(0, 2, size=(12, 130), dtype=np.uint8)
+
+
+def test_pack_and_unpack_round_trip(population):
+    words = pack_rows(population)
+    assert words.dtype == np.dtype("<u8")
+    assert words.shape == (12, 3)  # 130 bit -> 3 từ 64 bit
+    assert np.array_equal(unpack_rows(words, population.shape[1]), population)
+
+
+def test_popcount_and_hamming_match_unpacked_arrays(population):
+    words = pack_rows(population)
+    distances = hamming_distances(words, words[0])
+    assert distances.tolist() == (population != population[0]).sum(axis=1).tolist()
+
+    a, b = BitSolution.from_array(population[1]), BitSolution.from_array(population[2])
+    assert a.popcount() == int(population[1].sum())
+    assert a.hamming(b) == int((population[1] != population[2]).sum())
+    assert np.array_equal((a ^ b).to_array(), population[1] ^ population[2])
+
+
+def test_popcount_fallback_without_bitwise_count(population, monkeypatch):
+    words = pack_rows(population)
+    expected = population.sum(axis=1).tolist()
+    monkeypatch.delattr(np, "bitwise_count", raising=False)
+    assert bit_solution._popcount_words(words).tolist() == expected
+
+
+def test_bit_solution_indexing_equality_and_hashing(population):
+    sol = BitSolution.from_array(population[3])
+    assert len(sol) == population.shape[1]
+    assert [sol[i] for i in range(len(sol))] == population[3].tolist()
+    assert sol[-1] == population[3][-1]
+    with pytest.raises(IndexError):
+        sol[len(sol)]
+
+    same = BitSolution.from_array(population[3].copy())
+    assert sol == same and hash(sol) == hash(same)
+    assert len({sol, same, BitSolution.from_array(population[4])}) == 2
+    assert not sol.words.flags.writeable
+
+
+def test_unique_rows_finds_duplicates(population):
+    duplicated = np.concatenate([population, population[[0, 5, 5]]])
+    first, inverse = unique_rows(pack_rows(duplicated))
+    assert len(first) == len(population)
+    assert np.array_equal(duplicated[first][inverse], duplicated)
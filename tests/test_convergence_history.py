@@ -0,0 +1,49 @@
+import numpy as np
+
+from convergence_history import ConvergenceHistory, downsample_minmax
+from data_handler import load_knapsack_data_from_csv
+from knapsack_gwo import GreyWolfOptimizer
+
+
+def test_arrays_are_copies_so_append_keeps_working():
+    history = ConvergenceHistory()
+    history.append(5, 1)
+    values, weights = history.best_values, history.weights
+    history.append(7, 2)  # Không được báo BufferError dù values/weights vẫn còn được giữ
+    assert values.tolist() == [5] and weights.tolist() == [1]
+    assert history.best_values.tolist() == [5, 7]
+    assert history[1] == "Lần 1: Giá trị=7, Trọng lượng=2"
+
+
+def test_progress_callback_may_keep_history_values(dataset):
+    data = load_knapsack_data_from_csv(dataset("dataset_500.csv"))
+    gwo = GreyWolfOptimizer(data['names'], data['values'], data['weights'], 5000, 20, seed=1)
+    kept = []
+    gwo.add_progress_callback(lambda event: kept.append(gwo.history_values))
+    gwo.solve()
+    assert len(kept) == 20
+    assert kept[-1].tolist() == gwo.history_values.tolist()[:len(kept[-1])]
+
+
+def test_timestamps_are_interpolated_between_marks_and_shifted_on_extend():
+    first = ConvergenceHistory()
+    for i in range(4):
+        first.append(i, i)
+    first.mark()
+    second = ConvergenceHistory()
+    for i in range(2):
+        second.append(10 + i, i)
+    second.mark()
+    first.extend(second)
+
+    times = first.timestamps
+    assert len(times) == len(first) == 6
+    assert (np.diff(times) >= 0).all()
+    assert first.best_values.tolist() == [0, 1, 2, 3, 10, 11]
+
+
+def test_downsample_keeps_extremes_and_endpoints():
+    y = np.sin(np.linspace(0, 20, 10_000))
+    x, values = downsample_minmax(y, max_points=200)
+    assert len(x) <= 202 and x[0] == 0 and x[-1] == len(y) - 1
+    assert values.max() == y.max() and values.min() == y.min()
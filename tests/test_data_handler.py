@@ -0,0 +1,69 @@
+import os
+
+import numpy as np
+
+from data_handler import CACHE_DIR_NAME, load_knapsack_arrays, load_knapsack_data_from_csv
+
+
+def _write(path, text: str) -> str:
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_bad_rows_are_skipped_and_reported_with_file_line_numbers(tmp_path):
+    filename = _write(tmp_path / "items.csv", "Name,Value,Weight\nA,10,5\n\nB,x,3\nC,7,2\nD,4\n")
+
+    data = load_knapsack_data_from_csv(filename, use_cache=False)
+
+    assert data['names'] == ["A", "C"]
+    assert data['values'].tolist() == [10, 7]
+    assert data['weights'].tolist() == [5, 2]
+    assert data['bad_rows'] == [4, 6]
+
+
+def test_blank_lines_do_not_shift_bad_row_numbers(tmp_path):
+    filename = _write(tmp_path / "items.csv", "Name,Value,Weight\nA,10,5\n\nB,x,3")
+
+    data = load_knapsack_data_from_csv(filename, use_cache=False)
+
+    assert data['names'] == ["A"]
+    assert data['bad_rows'] == [4]
+
+
+def test_blank_lines_only_are_not_bad_rows(tmp_path):
+    filename = _write(tmp_path / "items.csv", "Name,Value,Weight\nA,10,5\n\n\nB,3,2\n")
+
+    data = load_knapsack_data_from_csv(filename, use_cache=False)
+
+    assert data['names'] == ["A", "B"]
+    assert data['bad_rows'] == []
+
+
+def test_binary_cache_is_written_once_and_reused(tmp_path):
+    filename = _write(tmp_path / "items.csv", "Name,Value,Weight\nA,10,5\nB,x,3\nC,7,2\n")
+
+    parsed = load_knapsack_arrays(filename)
+    cache_dir = tmp_path / CACHE_DIR_NAME
+    cached_files = sorted(os.listdir(cache_dir))
+    assert cached_files and all(name.endswith(".npy") for name in cached_files)
+
+    cached = load_knapsack_arrays(filename)
+    assert isinstance(cached['items'], np.memmap)  # Đọc từ cache bằng memory map, không phân tích lại CSV
+    assert np.array_equal(cached['items'], parsed['items'])
+    assert cached['names'].tolist() == parsed['names'].tolist() == ["A", "C"]
+    assert cached['bad_rows'].tolist() == parsed['bad_rows'].tolist() == [3]
+    assert sorted(os.listdir(cache_dir)) == cached_files
+
+
+def test_binary_cache_is_invalidated_when_the_file_changes(tmp_path):
+    path = tmp_path / "items.csv"
+    filename = _write(path, "Name,Value,Weight\nA,10,5\n")
+    load_knapsack_arrays(filename)
+
+    _write(path, "Name,Value,Weight\nA,10,5\nB,20,8\n")
+    stat = os.stat(filename)
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    data = load_knapsack_data_from_csv(filename)
+    assert data['names'] == ["A", "B"]
+    assert data['values'].tolist() == [10, 20]
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from fitness_cache import ENTRY_BYTES, FitnessCache
+from solver_registry import heuristic_solvers
+
+SOLVERS = heuristic_solvers()
+
+
+def test_rejects_budget_below_one_entry():
+    with pytest.raises(ValueError):
+        FitnessCache(ENTRY_BYTES - 1, 10)
+
+
+def test_counters_and_lru_eviction():
+    cache = FitnessCache(2 * ENTRY_BYTES, 8)
+    assert cache.max_entries == 2
+    assert cache.get(1) is None
+    cache.put(1, 10, 5)
+    cache.put(2, 20, 6)
+    assert cache.get(1) == (10, 5)  # Mục 1 thành mục mới dùng nhất
+    cache.put(3, 30, 7)  # Loại mục 2 (ít dùng gần đây nhất)
+    assert cache.get(2) is None
+    assert cache.get(3) == (30, 7)
+    assert (cache.hits, cache.misses, cache.evictions) == (2, 2, 1)
+    assert cache.hit_rate == 0.5
+    assert len(cache) == 2 and cache.nbytes == 2 * ENTRY_BYTES
+
+
+def test_flip_key_matches_full_key():
+    rng = np.random.default_rng(0)
+    cache = FitnessCache(ENTRY_BYTES, 64)
+    sol = rng.integers(0, 2, size=64).astype(np.int8)
+    key = cache.solution_key(sol)
+    for index in rng.integers(0, 64, size=20):
+        key = cache.flip_key(key, int(index), bool(sol[index]))
+        sol[index] ^= 1
+        assert key == cache.solution_key(sol)
+    population = rng.integers(0, 2, size=(5, 64)).astype(np.int8)
+    assert cache.population_keys(population) == [cache.solution_key(row) for row in population]
+
+
+def _solve(spec, data, cache_bytes):
+    options = dict(spec.defaults)
+    if spec.key == "hc":
+        options['delta_evaluation'] = False  # Leo đồi chỉ dùng bộ nhớ đệm khi đánh giá toàn bộ
+    algo = spec.cls(data['names'], data['values'], data['weights'], 5000, 60, seed=5,
+                    fitness_cache_bytes=cache_bytes, **options)
+    algo.solve()
+    return algo
+
+
+@pytest.mark.parametrize("spec", SOLVERS, ids=lambda spec: spec.key)
+def test_cache_does_not_change_results(spec, items_500):
+    plain = _solve(spec, items_500, 0)
+    cached = _solve(spec, items_500, 2**20)
+    assert plain.fitness_cache is None and cached.fitness_cache is not None
+    assert cached.best_value == plain.best_value
+    assert np.array_equal(cached.best_solution, plain.best_solution)
+    assert np.array_equal(cached.history_values, plain.history_values)
+    # Lần trúng bộ nhớ đệm không tính là một lần đánh giá (SA/Tabu chỉ tra cứu nghiệm ban đầu)
+    assert cached.evaluations + cached.fitness_cache.hits == plain.evaluations
+    assert cached.fitness_cache.misses <= cached.evaluations
+
+
+def test_population_solvers_hit_the_cache(items_500):
+    ga = _solve(next(spec for spec in SOLVERS if spec.key == "ga"), items_500, 2**20)
+    assert ga.fitness_cache.hits > 0
+    assert ga.evaluations == ga.fitness_cache.misses
+
+
+def test_report_includes_cache_counters(items_500):
+    spec = next(spec for spec in SOLVERS if spec.key == "hc")
+    algo = _solve(spec, items_500, 2**20)
+    counters = algo.performance_report()["counters"]
+    assert counters["cache_hits"] == algo.fitness_cache.hits
+    assert counters["cache_misses"] == algo.fitness_cache.misses
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from data_handler import load_knapsack_data_from_csv
+from knapsack_hc import HillClimbing
+
+# (dataset, sức chứa, dùng giới hạn số lượng)
+INSTANCES = [
+    ("dataset_500.csv", 5000, False),
+    ("dataset_multi_50.csv", (1600, 850, 4900), False),
+    ("dataset_multi_50.csv", (1600, 850, 4900), True),
+]
+
+
+def _solve(dataset, name, capacity, bounded, delta_evaluation, **kwargs) -> HillClimbing:
+    data = load_knapsack_data_from_csv(dataset(name))
+    weights = data['weights'] if isinstance(capacity, int) else data['weight_matrix']
+    hc = HillClimbing(data['names'], data['values'], weights, capacity, 3000, seed=4,
+                      delta_evaluation=delta_evaluation, item_bounds=data['bounds'] if bounded else None, **kwargs)
+    hc.solve()
+    return hc
+
+
+@pytest.mark.parametrize("name, capacity, bounded", INSTANCES)
+@pytest.mark.parametrize("stopping", [{}, {"stall_iterations": 200}], ids=["full-run", "stall"])
+def test_delta_and_full_evaluation_agree(dataset, name, capacity, bounded, stopping):
+    delta = _solve(dataset, name, capacity, bounded, True, **stopping)
+    full = _solve(dataset, name, capacity, bounded, False, **stopping)
+
+    assert delta.best_value == full.best_value
+    assert np.array_equal(delta.best_solution, full.best_solution)
+    assert np.array_equal(delta.history.best_values, full.history.best_values)
+    assert np.array_equal(delta.history.weights, full.history.weights)
+    assert delta.stop_reason == full.stop_reason
+
+
+@pytest.mark.parametrize("name, capacity, bounded", INSTANCES)
+def test_delta_result_matches_recomputed_fitness(dataset, name, capacity, bounded):
+    hc = _solve(dataset, name, capacity, bounded, True)
+    value, weight = hc._calculate_fitness(hc.best_solution)
+    assert value == hc.best_value
+    assert hc._feasible(weight)
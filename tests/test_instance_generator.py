@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+import instance_generator
+from data_handler import load_knapsack_data_from_csv
+from instance_generator import KINDS, generate_arrays, write_binary, write_csv
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    # Đoạn nhỏ để test đi qua nhiều đoạn sinh mà vẫn nhanh
+    monkeypatch.setattr(instance_generator, "CHUNK_ITEMS", 100)
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def test_fixed_seed_is_reproducible(kind, small_chunks):
+    values, weights = generate_arrays(250, kind, seed=42)
+    again_values, again_weights = generate_arrays(250, kind, seed=42)
+    assert np.array_equal(values, again_values) and np.array_equal(weights, again_weights)
+    other_values, other_weights = generate_arrays(250, kind, seed=43)
+    assert not np.array_equal(weights, other_weights)
+    assert values.dtype == weights.dtype == np.int64
+    assert weights.min() >= 1 and weights.max() <= 1000 and values.min() >= 1
+
+
+def test_kinds_follow_their_correlation():
+    values, weights = generate_arrays(500, "weakly_correlated", seed=1)
+    assert np.all(np.abs(values - weights) <= 100)
+    values, weights = generate_arrays(500, "strongly_correlated", seed=1)
+    assert np.array_equal(values, weights + 100)
+    values, weights = generate_arrays(500, "subset_sum", seed=1)
+    assert np.array_equal(values, weights)
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        generate_arrays(10, "correlated")
+    with pytest.raises(ValueError):
+        generate_arrays(10, value_range=0)
+
+
+def test_csv_round_trip(tmp_path, small_chunks):
+    path = tmp_path / "generated.csv"
+    total_weight = write_csv(str(path), 250, "weakly_correlated", seed=9)
+    values, weights = generate_arrays(250, "weakly_correlated", seed=9)
+
+    data = load_knapsack_data_from_csv(str(path), use_cache=False)
+    assert data['names'] == [f"Item_{i}" for i in range(1, 251)]
+    assert np.array_equal(data['values'], values)
+    assert np.array_equal(data['weights'], weights)
+    assert data['bad_rows'] == [] and data['bounds'] is None
+    assert total_weight == int(weights.sum())
+
+
+def test_binary_round_trip_matches_csv(tmp_path, small_chunks):
+    csv_path, npy_path = tmp_path / "generated.csv", tmp_path / "generated.npy"
+    assert write_csv(str(csv_path), 250, seed=3) == write_binary(str(npy_path), 250, seed=3)
+
+    from_csv = load_knapsack_data_from_csv(str(csv_path), use_cache=False)
+    from_npy = load_knapsack_data_from_csv(str(npy_path))
+    assert list(from_npy['names']) == from_csv['names']
+    assert np.array_equal(from_npy['values'], from_csv['values'])
+    assert np.array_equal(from_npy['weights'], from_csv['weights'])
+    assert list(from_npy['dimensions']) == list(from_csv['dimensions'])
@@ -0,0 +1,113 @@
+import csv
+import itertools
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from data_handler import load_knapsack_arrays, load_knapsack_data_from_csv, split_items
+from knapsack_exact import ExactSolver
+from solver_registry import heuristic_solvers
+
+DATASET_MULTI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dataset_multi_50.csv")
+MULTI_SOLVERS = [spec for spec in heuristic_solvers() if spec.multi_constraint]
+
+
+def _bounded_instance(seed: int, n: int, m: int = 1):
+    """Instance nhỏ ngẫu nhiên: giá trị, ma trận trọng lượng m x n, số lượng tối đa, sức chứa."""
+    rng = np.random.default_rng(seed)
+    values = rng.integers(1, 60, size=n)
+    weights = rng.integers(1, 30, size=(m, n))
+    bounds = rng.integers(1, 4, size=n)
+    capacities = (weights * bounds).sum(axis=1) // 3
+    return values, weights, bounds, capacities
+
+
+def _brute_force(values, weights, bounds, capacities) -> int:
+    """Giá trị tối ưu bằng cách duyệt mọi tổ hợp số lượng."""
+    best = 0
+    for quantities in itertools.product(*(range(b + 1) for b in bounds)):
+        q = np.array(quantities)
+        if (weights @ q <= capacities).all():
+            best = max(best, int(values @ q))
+    return best
+
+
+@pytest.mark.parametrize("method", ["dp", "bnb"])
+@pytest.mark.parametrize("seed", range(5))
+def test_exact_matches_brute_force_on_bounded_instances(seed, method):
+    values, weights, bounds, capacities = _bounded_instance(seed, n=6)
+    names = [f"Item_{i}" for i in range(len(values))]
+    solver = ExactSolver(names, values, weights[0], int(capacities[0]), method=method, item_bounds=bounds)
+    solver.solve()
+
+    quantities = solver.item_quantities()
+    assert solver.best_value == _brute_force(values, weights, bounds, capacities)
+    assert int(values @ quantities) == solver.best_value
+    assert (quantities <= bounds).all()
+    assert int(weights[0] @ quantities) <= capacities[0]
+
+
+@pytest.mark.parametrize("repair_strategy", ["greedy", "random"])
+@pytest.mark.parametrize("spec", MULTI_SOLVERS, ids=lambda spec: spec.key)
+def test_repaired_multi_constraint_solutions_are_feasible(spec, repair_strategy):
+    values, weights, bounds, capacities = _bounded_instance(7, n=30, m=3)
+    names = [f"Item_{i}" for i in range(len(values))]
+    solver = spec.cls(names, values, weights, tuple(capacities.tolist()), 30, seed=1,
+                      repair_strategy=repair_strategy, item_bounds=bounds, **spec.defaults)
+
+    population = np.random.default_rng(2).integers(0, 2, size=(40, solver._n), dtype=np.uint8)
+    repaired_values, loads = solver._repair_population(population)
+    for sol, value, load in zip(population, repaired_values, loads):
+        quantities = solver.item_quantities(sol)
+        assert (quantities <= bounds).all()
+        assert (weights @ quantities == load).all()
+        assert (load <= capacities).all()
+        assert int(values @ quantities) == value
+
+    solver.solve()
+    quantities = solver.item_quantities()
+    assert (quantities <= bounds).all()
+    assert (weights @ quantities <= capacities).all()
+    assert int(values @ quantities) == solver.best_value
+
+
+def test_multi_constraint_loader_round_trip(tmp_path):
+    path = tmp_path / "dataset_multi_50.csv"
+    shutil.copyfile(DATASET_MULTI, path)
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+
+    data = load_knapsack_data_from_csv(str(path), use_cache=False)
+    assert data['dimensions'] == ["Weight", "Volume", "Budget"]
+    assert data['bad_rows'] == []
+    assert data['names'] == [row["Name"] for row in rows]
+    assert data['values'].tolist() == [int(row["Value"]) for row in rows]
+    for j, dimension in enumerate(data['dimensions']):
+        assert data['weight_matrix'][j].tolist() == [int(row[dimension]) for row in rows]
+    assert data['weights'].tolist() == data['weight_matrix'][0].tolist()
+    assert data['bounds'].tolist() == [int(row["Bound"]) for row in rows]
+
+    # Lần đầu ghi cache nhị phân, lần sau đọc lại từ cache: cùng một kết quả
+    parsed = load_knapsack_arrays(str(path))
+    cached = load_knapsack_arrays(str(path))
+    assert (tmp_path / ".knapsack_cache").is_dir()
+    for arrays in (parsed, cached):
+        assert arrays['dimensions'] == data['dimensions'] and arrays['bounded']
+        values, weight_matrix, bounds = split_items(arrays['items'], len(arrays['dimensions']), arrays['bounded'])
+        assert np.array_equal(values, data['values'])
+        assert np.array_equal(weight_matrix, data['weight_matrix'])
+        assert np.array_equal(bounds, data['bounds'])
+
+    # Ghi lại thành CSV và tải lại: dữ liệu không đổi
+    copy = tmp_path / "copy.csv"
+    with open(copy, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Name", "Value", *data['dimensions'], "Bound"])
+        for i, name in enumerate(data['names']):
+            writer.writerow([name, data['values'][i], *data['weight_matrix'][:, i], data['bounds'][i]])
+    reloaded = load_knapsack_data_from_csv(str(copy), use_cache=False)
+    assert reloaded['names'] == data['names']
+    assert np.array_equal(reloaded['weight_matrix'], data['weight_matrix'])
+    assert np.array_equal(reloaded['bounds'], data['bounds'])
@@ -0,0 +1,90 @@
+import time
+
+import numpy as np
+import pytest
+
+from knapsack_hc import HillClimbing
+from parallel_runner import ParallelRunner
+
+CAPACITY = 5000
+
+
+@pytest.fixture(scope="module")
+def runner(items_500):
+    with ParallelRunner(items_500['names'], items_500['values'], items_500['weights'], max_workers=2) as runner:
+        yield runner
+
+
+def _check_selection(result, data):
+    indices = result.best_indices
+    assert int(np.asarray(data['values'])[indices].sum()) == result.best_value
+    assert int(np.asarray(data['weights']).reshape(-1)[indices].sum()) <= CAPACITY
+    assert result.selected == [data['names'][i] for i in indices]
+
+
+def test_run_restarts_keeps_the_best_worker(runner, items_500):
+    result = runner.run_restarts(HillClimbing, CAPACITY, 300, 4, seed=2)
+
+    assert len(result.workers) == 4
+    assert result.best_value == max(w['best_value'] for w in result.workers)
+    assert all(w['stop_reason'] == "max_iterations" for w in result.workers)
+    assert result.stop_reason == "max_iterations" and not result.cancelled
+    assert len(result.worker_times()) == 4 and all(t > 0 for t in result.worker_times())
+    assert result.exec_time == max(result.worker_times())
+    assert result.history_values[-1] == result.best_value
+    _check_selection(result, items_500)
+
+
+def test_exec_time_excludes_queueing_behind_other_algorithms(runner):
+    start_time = time.perf_counter()
+    slow = runner.submit_restarts(HillClimbing, CAPACITY, 200000, 2, seed=1)
+    fast = runner.submit_restarts(HillClimbing, CAPACITY, 10, 2, seed=1)
+    slow_result = runner.collect("slow", slow, start_time)
+    fast_result = runner.collect("fast", fast, start_time)
+
+    # Cả hai dùng chung start_time: wall_time của thuật toán nhanh gồm thời gian chờ thuật toán chậm
+    assert fast_result.wall_time >= slow_result.exec_time
+    assert fast_result.exec_time == max(fast_result.worker_times()) < slow_result.exec_time
+
+
+def test_island_gwo_history_and_bookkeeping(runner, items_500):
+    result = runner.run_island_gwo(CAPACITY, 40, islands=3, migration_interval=10, seed=4, num_wolves=20)
+
+    assert [w['stream'] for w in result.workers] == [(0,), (1,), (2,)]
+    assert result.best_value == max(w['best_value'] for w in result.workers)
+    assert [w['stop_reason'] for w in result.workers] == ["max_iterations"] * 3
+    # Đường hội tụ toàn cục gồm đủ 40 vòng, không giảm và kết thúc ở giá trị tốt nhất
+    assert len(result.history_values) == 40
+    assert np.all(np.diff(result.history_values) >= 0)
+    assert result.history_values[-1] == result.best_value
+    assert len(result.history) == 40
+    _check_selection(result, items_500)
+
+
+def test_island_gwo_stops_when_every_island_stalls(runner):
+    result = runner.run_island_gwo(CAPACITY, 10**5, islands=2, migration_interval=10, seed=4,
+                                   num_wolves=20, stall_iterations=10)
+
+    assert all(w['stop_reason'] == "stall" for w in result.workers)
+    assert len(result.history_values) < 10**5
+    assert np.all(np.diff(result.history_values) >= 0)
+
+
+def _island(values):
+    values = np.asarray(values, dtype=np.int64)
+    # Mỗi sói được đánh dấu bằng chính giá trị của nó để theo dõi sau khi di cư
+    return {'wolves': np.repeat(values[:, None], 3, axis=1), 'values': values.copy()}
+
+
+def test_migrate_moves_best_wolves_to_next_island_in_a_ring(items_500):
+    runner = ParallelRunner(items_500['names'], items_500['values'], items_500['weights'])
+    states = [_island([5, 1, 9, 3]), _island([20, 40, 10, 30]), _island([100, 300, 200, 400])]
+
+    runner._migrate(states, 2)
+
+    # Đảo k nhận 2 sói tốt nhất của đảo k-1 (đảo 0 nhận từ đảo cuối): sói tốt nhất thay sói kém nhất
+    assert states[0]['values'].tolist() == [5, 400, 9, 300]
+    assert states[1]['values'].tolist() == [5, 40, 9, 30]
+    assert states[2]['values'].tolist() == [40, 300, 30, 400]
+    for state in states:
+        assert np.array_equal(state['wolves'], np.repeat(state['values'][:, None], 3, axis=1))
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from knapsack_hc import HillClimbing
+from parallel_runner import ParallelRunner
+from solver_registry import heuristic_solvers
+
+SOLVERS = heuristic_solvers()
+
+
+def _solve(spec, data, seed, iterations=60):
+    algo = spec.cls(data['names'], data['values'], data['weights'], 5000, iterations, seed=seed, **spec.defaults)
+    algo.solve()
+    return algo
+
+
+def _same_run(a, b) -> bool:
+    return (a.best_value == b.best_value and np.array_equal(a.best_solution, b.best_solution)
+            and np.array_equal(a.history.best_values, b.history.best_values))
+
+
+@pytest.mark.parametrize("spec", SOLVERS, ids=lambda spec: spec.key)
+def test_same_seed_reproduces_the_run(spec, items_500):
+    assert _same_run(_solve(spec, items_500, 123), _solve(spec, items_500, 123))
+
+
+@pytest.mark.parametrize("spec", SOLVERS, ids=lambda spec: spec.key)
+def test_system_entropy_seed_is_recorded_and_replayable(spec, items_500):
+    first = _solve(spec, items_500, None)
+    assert isinstance(first.seed, int) and first.seed_stream == ()
+    assert _same_run(first, _solve(spec, items_500, first.seed))
+
+
+@pytest.mark.parametrize("spec", SOLVERS, ids=lambda spec: spec.key)
+def test_spawned_streams_are_independent_and_replayable(spec, items_500):
+    children = np.random.SeedSequence(7).spawn(3)
+    runs = [_solve(spec, items_500, child) for child in children]
+
+    assert [run.seed_stream for run in runs] == [(0,), (1,), (2,)]
+    assert all(run.seed == 7 for run in runs)
+    # Mỗi luồng con là một chuỗi số ngẫu nhiên khác nhau nên ba lần chạy không trùng nhau
+    assert not _same_run(runs[0], runs[1]) or not _same_run(runs[1], runs[2])
+    for run in runs:
+        replay = _solve(spec, items_500, np.random.SeedSequence(run.seed, spawn_key=run.seed_stream))
+        assert _same_run(run, replay)
+
+
+def test_solver_rng_is_private(items_500):
+    np.random.seed(0)
+    before = np.random.random()
+    np.random.seed(0)
+    _solve(SOLVERS[0], items_500, 1)
+    assert np.random.random() == before  # Bộ giải không dùng bộ sinh số toàn cục
+
+
+def test_parallel_restarts_use_distinct_streams_and_replay_in_process(items_500):
+    with ParallelRunner(items_500['names'], items_500['values'], items_500['weights'], max_workers=2) as runner:
+        first = runner.run_restarts(HillClimbing, 5000, 500, 3, seed=11)
+        second = runner.run_restarts(HillClimbing, 5000, 500, 3, seed=11)
+
+    assert sorted(w['stream'] for w in first.workers) == [(0,), (1,), (2,)]
+    assert [w['best_value'] for w in first.workers] == [w['best_value'] for w in second.workers]
+    assert first.best_value == second.best_value
+    assert np.array_equal(first.history_values, second.history_values)
+
+    replay = HillClimbing(items_500['names'], items_500['values'], items_500['weights'], 5000, 500,
+                          seed=np.random.SeedSequence(first.seed, spawn_key=first.seed_stream))
+    replay.solve()
+    assert replay.best_value == first.best_value
+    assert np.flatnonzero(replay.best_solution).tolist() == first.best_indices.tolist()
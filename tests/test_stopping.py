@@ -0,0 +1,81 @@
+import time
+
+import pytest
+
+from run_control import CancelToken, STOP_REASONS
+from solver_registry import get_solver, heuristic_solvers
+
+SOLVERS = heuristic_solvers()
+MANY_ITERATIONS = 10**6
+
+
+def _make(spec, data, iterations, **kwargs):
+    return spec.cls(data['names'], data['values'], data['weights'], 5000, iterations, seed=3,
+                    **spec.defaults, **kwargs)
+
+
+@pytest.mark.parametrize("spec", SOLVERS, ids=lambda spec: spec.key)
+def test_max_iterations_when_no_criterion_fires(spec, items_500):
+    algo = _make(spec, items_500, 30)
+    algo.solve()
+    assert algo.stop_reason == "max_iterations"
+    assert len(algo.history) == 30
+
+
+@pytest.mark.parametrize("spec", SOLVERS, ids=lambda spec: spec.key)
+def test_time_budget(spec, items_500):
+    algo = _make(spec, items_500, MANY_ITERATIONS, time_budget=0.05)
+    start = time.perf_counter()
+    algo.solve()
+    assert algo.stop_reason == "time_budget"
+    assert time.perf_counter() - start < 2.0
+    assert len(algo.history) < MANY_ITERATIONS
+
+
+@pytest.mark.parametrize("spec", SOLVERS, ids=lambda spec: spec.key)
+def test_max_evaluations(spec, items_500):
+    algo = _make(spec, items_500, MANY_ITERATIONS, max_evaluations=500)
+    algo.solve()
+    assert algo.stop_reason == "max_evaluations"
+    assert algo.evaluations >= 500
+    assert len(algo.history) < MANY_ITERATIONS
+
+
+@pytest.mark.parametrize("spec", SOLVERS, ids=lambda spec: spec.key)
+def test_stall(spec, items_500):
+    algo = _make(spec, items_500, MANY_ITERATIONS, stall_iterations=20)
+    algo.solve()
+    assert algo.stop_reason == "stall"
+    assert len(algo.history) < MANY_ITERATIONS
+    # Giá trị tốt nhất không đổi trong ít nhất stall_iterations vòng cuối
+    assert len(set(algo.history.best_values[-20:].tolist())) == 1
+
+
+@pytest.mark.parametrize("spec", SOLVERS, ids=lambda spec: spec.key)
+def test_cancelled_from_progress_callback(spec, items_500):
+    token = CancelToken()
+    algo = _make(spec, items_500, MANY_ITERATIONS, cancel_token=token, progress_every=5)
+    algo.add_progress_callback(lambda event: event.iteration >= 20 and token.cancel())
+    algo.solve()
+    assert algo.stop_reason == "cancelled" and algo.cancelled
+    assert 20 <= len(algo.history) < MANY_ITERATIONS
+    assert algo.best_value > 0  # Nghiệm tốt nhất đến lúc dừng vẫn được giữ
+
+
+@pytest.mark.parametrize("criterion, kwargs", [
+    ("time_budget", {'time_budget': 1e-9}),
+    ("cancelled", {}),
+])
+def test_exact_solver_stops_early(criterion, kwargs, items_500):
+    token = CancelToken()
+    if criterion == "cancelled":
+        token.cancel()
+    exact = get_solver("exact").cls(items_500['names'], items_500['values'], items_500['weights'], 5000,
+                                    cancel_token=token, **kwargs)
+    exact.solve()
+    assert exact.stop_reason == criterion
+    assert not exact.is_optimal
+
+
+def test_every_stop_reason_has_a_label():
+    assert set(STOP_REASONS) == {"max_iterations", "time_budget", "max_evaluations", "stall", "cancelled"}
@@ -1,35 +1,52 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, Text 
-from knapsack_hc import HillClimbing 
-from knapsack_gwo import GreyWolfOptimizer
-from data_handler import load_knapsack_data_from_csv 
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from solver_registry import heuristic_solvers, get_solver, solver_for_class
+from run_control import CancelToken, STOP_REASONS
+from instrumentation import format_report
+from virtual_views import VirtualHistoryView, VirtualItemTable
 
 import threading
-from typing import List, Tuple
+import time
+import queue
+from concurrent.futures import as_completed
+from typing import List, Tuple, Dict
+
+# NumPy, matplotlib, các bộ giải, ParallelRunner (multiprocessing) và data_handler chỉ được import khi dùng lần đầu
+# (vẽ biểu đồ, bấm chạy, tải dữ liệu ở luồng nền) để cửa sổ hiện ra ngay; xem `cli.py startup`.
 
 class KnapsackApp:
     """Class chính quản lý giao diện người dùng và điều phối các thuật toán tối ưu."""
     def __init__(self, root):
         """Khởi tạo ứng dụng Knapsack."""
         self.root = root
-        self.root.title("Knapsack Optimization - Hill Climbing & GWO Song Song")
+        self.root.title("Knapsack Optimization - Chạy Song Song")
         self.root.geometry("1400x800") 
         
         self.data_files = [
             'dataset_20.csv',
             'dataset_500.csv',
             'dataset_1000.csv',
-            'products.csv'
+            'products.csv',
+            'dataset_multi_50.csv'
         ]
         
         self.items_data = {'names': [], 'values': [], 'weights': []}
-        self.items: List[Tuple[str, int, int]] = []
+        self.data_file = None  # File CSV đang dùng (cache nhị phân của nó được chia sẻ cho worker)
         
-        # Lưu kết quả của các thuật toán để vẽ biểu đồ
-        self.hc_algo = None
-        self.gwo_algo = None
+        # Kết quả của các thuật toán (khóa trong solver_registry) để vẽ biểu đồ
+        self.results: Dict[str, object] = {}
+        self.panels: Dict[str, Tuple[Text, VirtualHistoryView]] = {}  # khóa -> (kết quả, lịch sử)
+        self.solver_vars: Dict[str, tk.BooleanVar] = {}  # khóa -> có chạy thuật toán này không
+        self.exact_algo = None  # Bộ giải chính xác làm mốc tính khoảng cách tối ưu
+        self._pending_jobs = 0  # Số tác vụ nền chưa hoàn tất (nút Run bật lại khi về 0)
+        self._instrumented = False  # Lần chạy hiện tại có bật "Đo hiệu năng" hay không
+
+        # Tiến độ trực tiếp: worker đẩy (tag, ProgressEvent) vào hàng đợi, luồng chính gom theo lô
+        self._manager = None
+        self._progress_queue = None
+        self._cancel_token = None
+        self._live_series = {}  # tên thuật toán -> {iteration: giá trị tốt nhất}
+        self._load_generation = 0  # Tăng mỗi lần tải; kết quả của lần tải cũ hơn bị bỏ qua
             
         self.create_widgets()
 
@@ -40,7 +57,7 @@ class KnapsackApp:
         top_frame.pack(fill="x", padx=10, pady=5)
 
         ttk.Label(top_frame, text="Khối lượng tối đa:").pack(side="left", padx=5)
-        self.max_w_entry = ttk.Entry(top_frame, width=8)
+        self.max_w_entry = ttk.Entry(top_frame, width=14)  # Nhiều ràng buộc: các sức chứa cách nhau bởi dấu phẩy
         self.max_w_entry.pack(side="left", padx=5)
         self.max_w_entry.insert(0, "5000") 
 
@@ -49,8 +66,31 @@ class KnapsackApp:
         self.iter_entry.insert(0, "100")
         self.iter_entry.pack(side="left", padx=5)
 
+        ttk.Label(top_frame, text="Số lần khởi động:").pack(side="left", padx=5)
+        self.restarts_entry = ttk.Entry(top_frame, width=4)
+        self.restarts_entry.insert(0, "1")
+        self.restarts_entry.pack(side="left", padx=5)
+
+        ttk.Label(top_frame, text="Giới hạn (s):").pack(side="left", padx=5)
+        self.time_budget_entry = ttk.Entry(top_frame, width=5)  # Để trống: không giới hạn thời gian
+        self.time_budget_entry.pack(side="left", padx=5)
+
+        ttk.Label(top_frame, text="Seed:").pack(side="left", padx=5)
+        self.seed_entry = ttk.Entry(top_frame, width=8)  # Để trống: seed ngẫu nhiên (vẫn hiển thị để chạy lại)
+        self.seed_entry.pack(side="left", padx=5)
+
+        self.island_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top_frame, text="GWO đảo", variable=self.island_var).pack(side="left", padx=5)
+
+        # Đo thời gian từng pha (tab Hiệu năng) có chi phí riêng nên mặc định tắt
+        self.instrument_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top_frame, text="Đo hiệu năng", variable=self.instrument_var).pack(side="left", padx=5)
+
         self.run_button = ttk.Button(top_frame, text="Chạy Song Song", command=self.start_parallel_run)
         self.run_button.pack(side="left", padx=10)
+
+        self.cancel_button = ttk.Button(top_frame, text="Dừng", command=self.cancel_run, state="disabled")
+        self.cancel_button.pack(side="left", padx=5)
         
         ttk.Label(top_frame, text="Chọn Dataset:").pack(side="left", padx=(10, 5))
         self.data_combobox = ttk.Combobox(
@@ -62,45 +102,65 @@ class KnapsackApp:
         self.data_combobox.set(self.data_files[0]) 
         self.data_combobox.pack(side="left", padx=5)
         
-        ttk.Button(top_frame, text="Tải Dữ Liệu", command=self.load_selected_data).pack(side="left", padx=5)
+        self.load_button = ttk.Button(top_frame, text="Tải Dữ Liệu", command=self.load_selected_data)
+        self.load_button.pack(side="left", padx=5)
         
         ttk.Button(top_frame, text="Xóa kết quả", command=self.clear_results).pack(side="left", padx=10)
         
         ttk.Button(top_frame, text="📊 So Sánh Biểu Đồ", command=self.show_comparison_chart).pack(side="left", padx=10)
 
-        # ========== TABLE (Dữ liệu vật phẩm) ==========
-        columns = ("Tên", "Giá trị", "Khối lượng")
-        self.tree = ttk.Treeview(self.root, columns=columns, show="headings", height=10)
-        for col in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, anchor="center", width=150)
-        self.tree.pack(fill="x", padx=10, pady=5)
+        # ========== CHỌN THUẬT TOÁN (dựng từ solver_registry) ==========
+        solver_frame = ttk.Frame(self.root)
+        solver_frame.pack(fill="x", padx=10)
+        ttk.Label(solver_frame, text="Thuật toán:").pack(side="left", padx=5)
+        for spec in heuristic_solvers():
+            self.solver_vars[spec.key] = tk.BooleanVar(value=spec.key in ("hc", "gwo"))
+            ttk.Checkbutton(solver_frame, text=spec.name, variable=self.solver_vars[spec.key]).pack(side="left", padx=5)
+
+        # Tải dữ liệu chạy ở luồng nền, thanh tiến độ chạy liên tục cho đến khi xong
+        self.load_progress = ttk.Progressbar(solver_frame, mode="indeterminate", length=120)
+        self.load_status = ttk.Label(solver_frame, text="")
+        self.load_status.pack(side="right", padx=5)
+
+        self.gap_label = ttk.Label(self.root, text="", font=("Arial", 10, "bold"))
+        self.gap_label.pack(fill="x", padx=15)
+
+        # ========== TABLE (Dữ liệu vật phẩm, chỉ dựng các dòng đang hiển thị) ==========
+        self.item_table = VirtualItemTable(self.root, height=10)
+        self.item_table.pack(fill="x", padx=10, pady=5)
         
         # ========== FRAME DƯỚI (Kết quả & Lịch sử) ==========
         bottom_frame = ttk.Frame(self.root)
         bottom_frame.pack(fill="both", expand=True, padx=10, pady=5)
         
-        hc_frame = ttk.Frame(bottom_frame)
-        hc_frame.pack(side="left", fill="both", expand=True, padx=5)
-        ttk.Label(hc_frame, text="HILL CLIMBING", font=("Arial", 12, "bold")).pack(pady=5)
-        self.hc_result = Text(hc_frame, height=8, bg="white", fg="black", font=("Consolas", 10))
-        self.hc_result.pack(fill="x", pady=5)
-        ttk.Label(hc_frame, text="LỊCH SỬ HC", font=("Arial", 10, "bold")).pack(pady=5)
-        self.hc_history = Text(hc_frame, bg="white", fg="black", font=("Consolas", 10))
-        self.hc_history.pack(fill="both", expand=True, pady=5)
-        gwo_frame = ttk.Frame(bottom_frame)
-        gwo_frame.pack(side="left", fill="both", expand=True, padx=5)
-        ttk.Label(gwo_frame, text="GREY WOLF OPTIMIZER", font=("Arial", 12, "bold")).pack(pady=5)
-        self.gwo_result = Text(gwo_frame, height=8, bg="white", fg="black", font=("Consolas", 10))
-        self.gwo_result.pack(fill="x", pady=5)
-        ttk.Label(gwo_frame, text="LỊCH SỬ GWO", font=("Arial", 10, "bold")).pack(pady=5)
-        self.gwo_history = Text(gwo_frame, bg="white", fg="black", font=("Consolas", 10))
-        self.gwo_history.pack(fill="both", expand=True, pady=5)
+        # Mỗi thuật toán đã đăng ký có một tab kết quả + lịch sử
+        self.result_notebook = ttk.Notebook(bottom_frame)
+        self.result_notebook.pack(side="left", fill="both", expand=True, padx=5)
+        for spec in heuristic_solvers():
+            frame = ttk.Frame(self.result_notebook)
+            self.result_notebook.add(frame, text=spec.name)
+            ttk.Label(frame, text=spec.name.upper(), font=("Arial", 12, "bold")).pack(pady=5)
+            result_text = Text(frame, height=8, bg="white", fg="black", font=("Consolas", 10))
+            result_text.pack(fill="x", pady=5)
+            ttk.Label(frame, text=f"LỊCH SỬ {spec.key.upper()}", font=("Arial", 10, "bold")).pack(pady=5)
+            history_view = VirtualHistoryView(frame, bg="white", fg="black", font=("Consolas", 10))
+            history_view.pack(fill="both", expand=True, pady=5)
+            self.panels[spec.key] = (result_text, history_view)
+
+        # Tab Hiệu năng: thời gian từng pha và bộ đếm của mỗi thuật toán (worker tốt nhất)
+        performance_frame = ttk.Frame(self.result_notebook)
+        self.result_notebook.add(performance_frame, text="Hiệu năng")
+        self.performance_text = Text(performance_frame, bg="white", fg="black", font=("Consolas", 10))
+        self.performance_text.pack(fill="both", expand=True, pady=5)
+
+        live_frame = ttk.Frame(bottom_frame)
+        live_frame.pack(side="left", fill="both", expand=True, padx=5)
+        ttk.Label(live_frame, text="HỘI TỤ TRỰC TIẾP", font=("Arial", 12, "bold")).pack(pady=5)
+        self.live_canvas = tk.Canvas(live_frame, bg="white", height=250)
+        self.live_canvas.pack(fill="both", expand=True, pady=5)
         
-        try:
-            self.load_data_and_populate_tree(self.data_files[0])
-        except Exception as e:
-            messagebox.showerror("Lỗi Tải Dữ Liệu Mặc Định", f"Không thể tải '{self.data_files[0]}'.\n{e}")
+        # Dataset mặc định được tải sau khi cửa sổ đã hiện
+        self.load_data_and_populate_tree(self.data_files[0])
 
     def load_selected_data(self):
         """Lấy tên file từ Combobox và tải dữ liệu."""
@@ -108,130 +168,390 @@ class KnapsackApp:
         if not filename:
             messagebox.showwarning("Chưa chọn file", "Vui lòng chọn một dataset từ danh sách.")
             return
-            
+
+        self.load_data_and_populate_tree(filename)
+
+    def load_data_and_populate_tree(self, filename: str):
+        """Tải dữ liệu từ file CSV ở luồng nền (kèm thanh tiến độ); bảng vật phẩm được cập nhật khi tải xong."""
+        self._load_generation += 1
+        self.items_data = {'names': [], 'values': [], 'weights': []}
+        self.load_button.config(state="disabled")
+        self.run_button.config(state="disabled")
+        self.load_status.config(text=f"Đang tải {filename}...")
+        self.load_progress.pack(side="right", padx=5)
+        self.load_progress.start(15)
+        worker = threading.Thread(target=self._load_data_worker, args=(filename, self._load_generation), daemon=True)
+        worker.start()
+
+    def _load_data_worker(self, filename: str, generation: int):
+        """Luồng nền: đọc file (lần đầu kéo theo NumPy/data_handler), rồi chuyển kết quả về luồng giao diện."""
         try:
-            self.load_data_and_populate_tree(filename)
+            from data_handler import load_knapsack_data_from_csv
+            data = load_knapsack_data_from_csv(filename)
         except Exception as e:
-            messagebox.showerror("Lỗi Tải File", f"Không thể tải file: {filename}\n{e}")
+            self.root.after(0, self._on_data_loaded, filename, generation, None, e)
+            return
+        self.root.after(0, self._on_data_loaded, filename, generation, data, None)
+        # Import trước module các bộ giải (và NumPy) ở luồng nền trong lúc người dùng còn thiết lập tham số,
+        # để lần bấm chạy đầu tiên không phải chờ import trên luồng giao diện
+        for spec in heuristic_solvers():
+            spec.load()
 
-    
+    def _on_data_loaded(self, filename: str, generation: int, data, error):
+        """Nhận dữ liệu đã tải (luồng chính) và hiển thị lên bảng vật phẩm."""
+        if generation != self._load_generation:
+            return  # Đã có yêu cầu tải mới hơn
+        self.load_progress.stop()
+        self.load_progress.pack_forget()
+        self.load_status.config(text="")
+        self.load_button.config(state="normal")
+        if self._pending_jobs == 0:
+            self.run_button.config(state="normal")
+        if error is not None:
+            messagebox.showerror("Lỗi Tải File", f"Không thể tải file: {filename}\n{error}")
+            self.item_table.clear()
+            self.data_file = None
+            return
 
-    def load_data_and_populate_tree(self, filename: str):
-        """Tải dữ liệu từ file CSV được chỉ định và hiển thị lên Treeview."""
-        self.items_data = load_knapsack_data_from_csv(filename)
-        
+        self.items_data = data
         if not self.items_data['names']:
              messagebox.showerror("Lỗi", f"Không tìm thấy dữ liệu hoặc file '{filename}' bị lỗi.")
-             self.items = [] 
+             self.item_table.clear()
+             self.data_file = None
              return
+
+        bad_rows = self.items_data['bad_rows']
+        if bad_rows:
+            preview = ", ".join(map(str, bad_rows[:20])) + (", ..." if len(bad_rows) > 20 else "")
+            messagebox.showwarning("Dòng dữ liệu lỗi", f"Đã bỏ qua {len(bad_rows)} dòng sai định dạng trong '{filename}':\n{preview}")
+        self.data_file = filename
              
-        self.items = list(zip(self.items_data['names'], self.items_data['values'], self.items_data['weights']))
-        
-        for item in self.tree.get_children(): 
-            self.tree.delete(item)
-            
-        for name, val, w in self.items:
-            self.tree.insert("", "end", values=(name, val, w))
-            
+        self.item_table.set_data(self.items_data['names'], self.items_data['values'], self.items_data['weight_matrix'],
+                                 self.items_data['dimensions'])
+
         self.clear_results()
         self.root.title(f"Knapsack Optimization - {filename}")
 
 
     def clear_results(self):
         """Xóa tất cả kết quả và lịch sử."""
-        self.hc_result.delete(1.0, "end"); self.gwo_result.delete(1.0, "end")
-        self.hc_history.delete(1.0, "end"); self.gwo_history.delete(1.0, "end")
-        self.hc_algo = None
-        self.gwo_algo = None
+        for result_text, history_view in self.panels.values():
+            result_text.delete(1.0, "end")
+            history_view.clear()
+        self.performance_text.delete(1.0, "end")
+        self.results = {}
+        self.exact_algo = None
+        self.gap_label.config(text="")
+        self._live_series = {}
+        self.live_canvas.delete("all")
 
     
-    def _run_single_algo(self, method_name, algo_class, result_text, history_text, names, values, weights, max_w, max_iter):
-        """Hàm chạy thuật toán trong một luồng riêng biệt (luồng worker)."""
+    def _run_parallel_jobs(self, specs, names, values, weights, bounds, max_w, max_iter, restarts, island,
+                           progress_every, limits, seed, instrument):
+        """
+        Luồng điều phối: gửi mọi lần khởi động của các thuật toán đã chọn vào pool tiến trình
+        (luồng này chỉ chờ kết quả); thuật toán nào xong hết worker thì được hiển thị ngay.
+        weights là ma trận m x n và max_w là tuple sức chứa khi dataset có nhiều ràng buộc;
+        bounds: số lượng tối đa của từng vật phẩm (None: bài toán 0/1).
+        limits: tiêu chí dừng sớm truyền cho mọi thuật toán (ví dụ {'time_budget': 2.0});
+        seed: seed gốc, mỗi worker nhận một luồng con riêng (None: ngẫu nhiên).
+        instrument: đo thời gian từng pha và bộ đếm cho tab Hiệu năng.
+        """
         try:
-            if method_name == "Grey Wolf Optimizer":
-                 algo_instance = algo_class(names, values, weights, max_w, max_iter, num_wolves=30)
-            else:
-                 algo_instance = algo_class(names, values, weights, max_w, max_iter)
-            
-            selected, hist, t = algo_instance.solve()
-            
-            total_val = sum(values[i] for i, n in enumerate(names) if n in selected)
-            total_w = sum(weights[i] for i, n in enumerate(names) if n in selected)
+            from parallel_runner import ParallelRunner
+            with ParallelRunner(names, values, weights, progress_queue=self._progress_queue,
+                                cancel_token=self._cancel_token, dataset_file=self.data_file,
+                                item_bounds=bounds) as runner:
+                start_time = time.perf_counter()
+                futures_by_key = {}
+                island_jobs = []
+                for spec in specs:
+                    if island and spec.supports_islands:
+                        job = threading.Thread(
+                            target=self._run_island_job,
+                            args=(runner, spec, names, values, weights, max_w, max_iter, restarts, progress_every,
+                                  limits, seed, instrument)
+                        )
+                        job.start()
+                        island_jobs.append(job)
+                    else:
+                        futures_by_key[spec.key] = runner.submit_restarts(
+                            spec.cls, max_w, max_iter, restarts, seed, progress_every=progress_every,
+                            instrument=instrument, **spec.defaults, **limits)
 
-            self.root.after(0, self._update_gui, method_name, selected, hist, t, total_val, total_w, max_w, names, values, weights, result_text, history_text, algo_instance)
-            
+                owner = {future: key for key, futures in futures_by_key.items() for future in futures}
+                remaining = {key: len(futures) for key, futures in futures_by_key.items()}
+                for future in as_completed(owner):
+                    key = owner[future]
+                    remaining[key] -= 1
+                    if remaining[key]:
+                        continue
+                    spec = get_solver(key)
+                    try:
+                        result = runner.collect(spec.name, futures_by_key[key], start_time)
+                    except Exception as e:
+                        self.root.after(0, lambda title=f"Lỗi {spec.name}", msg=str(e): messagebox.showerror(title, msg))
+                        continue
+                    self.root.after(0, self._update_gui, key, result, max_w, names, values, weights)
+
+                for job in island_jobs:
+                    job.join()
+        except Exception as e:
+            self.root.after(0, lambda msg=str(e): messagebox.showerror("Lỗi Chạy Song Song", msg))
+        finally:
+            self.root.after(0, self._check_running_threads)
+
+    def _run_island_job(self, runner, spec, names, values, weights, max_w, max_iter, restarts, progress_every, limits,
+                        seed, instrument):
+        """Chạy thuật toán theo mô hình đảo (các quần thể trao đổi cá thể tốt nhất) trên pool của runner."""
+        try:
+            result = runner.run_island_gwo(max_w, max_iter, islands=max(2, restarts), seed=seed,
+                                           progress_every=progress_every, instrument=instrument,
+                                           **spec.defaults, **limits)
+            self.root.after(0, self._update_gui, spec.key, result, max_w, names, values, weights)
         except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror(f"Lỗi {method_name}", str(e)))
-            self.root.after(0, self._check_running_threads) 
+            self.root.after(0, lambda msg=str(e): messagebox.showerror(f"Lỗi {spec.name}", msg))
 
-    def _update_gui(self, method_name, selected, hist, t, total_val, total_w, max_w, names, values, weights, result_text, history_text, algo_instance):
-        """Cập nhật giao diện an toàn trên luồng chính của Tkinter."""
+    def _update_gui(self, key, run_result, max_w, names, values, weights):
+        """Cập nhật tab kết quả của một thuật toán an toàn trên luồng chính của Tkinter."""
+        import numpy as np
+        spec = get_solver(key)
+        result_text, history_text = self.panels[key]
         result_text.delete(1.0, "end")
-        history_text.delete(1.0, "end")
 
-        result_text.insert("end", f"Thuật toán: {method_name}\n")
-        result_text.insert("end", f"Tổng giá trị: {total_val}\nTổng khối lượng: {total_w}/{max_w}\n")
-        result_text.insert("end", f"Số vật phẩm được chọn: {len(selected)}\nThời gian: {t:.4f}s\n\n")
-        
-        for i, name in enumerate(selected, 1):
-            idx = names.index(name)
-            result_text.insert("end", f"{i:2d}. {name} ({values[idx]} - {weights[idx]})\n")
+        # Dùng trực tiếp tập chỉ số của nghiệm (kèm số lượng khi có giới hạn), không tra cứu theo tên
+        indices = np.asarray(run_result.best_indices, dtype=np.int64)
+        quantities = np.asarray(run_result.quantities, dtype=np.int64)
+        chosen_values = np.asarray(values)[indices] * quantities
+        chosen_weights = np.atleast_2d(weights)[:, indices] * quantities  # m x số vật phẩm được chọn
+        total_val = int(chosen_values.sum())
+        used = ", ".join(f"{load}/{limit}" for load, limit in
+                         zip(chosen_weights.sum(axis=1).tolist(), np.atleast_1d(max_w).tolist()))
+        worker_times = run_result.worker_times()
 
-        history_text.insert("end", "\n".join(hist))
+        result_text.insert("end", f"Thuật toán: {spec.name}\n")
+        result_text.insert("end", f"Tổng giá trị: {total_val}\nTổng khối lượng: {used}\n")
+        result_text.insert("end", f"Số vật phẩm được chọn: {len(indices)}\nThời gian: {run_result.exec_time:.4f}s\n")
+        if run_result.cancelled:
+            result_text.insert("end", "(Đã dừng sớm - nghiệm tốt nhất đến lúc dừng)\n")
+        elif run_result.stop_reason is not None:
+            result_text.insert("end", f"Lý do dừng: {STOP_REASONS[run_result.stop_reason]}\n")
+        stream = f" (luồng con {list(run_result.seed_stream)})" if run_result.seed_stream else ""
+        result_text.insert("end", f"Seed: {run_result.seed}{stream}\n")
+        result_text.insert("end", f"Số worker: {len(worker_times)} (mỗi worker {min(worker_times):.4f}s - {max(worker_times):.4f}s)\n\n")
         
-        # Lưu instance để vẽ biểu đồ
-        if method_name == "Hill Climbing":
-            self.hc_algo = algo_instance
-        elif method_name == "Grey Wolf Optimizer":
-            self.gwo_algo = algo_instance
+        lines = [
+            f"{i:2d}. {names[idx]}{f' x{q}' if q > 1 else ''} ({v} - {'/'.join(map(str, w))})"
+            for i, (idx, q, v, w) in enumerate(zip(indices.tolist(), quantities.tolist(), chosen_values.tolist(),
+                                                   chosen_weights.T.tolist()), 1)
+        ]
+        result_text.insert("end", "\n".join(lines) + "\n")  # Một lần chèn thay vì mỗi vật phẩm một lần
+
+        # Lịch sử chỉ được định dạng thành chuỗi cho những dòng đang hiển thị
+        history_text.set_source(run_result.history)
         
+        # Lưu kết quả để vẽ biểu đồ
+        self.results[key] = run_result
+        self._update_gap_label()
+        self._update_performance_tab()
         self.root.update_idletasks()
-        
+
+    def _run_exact_baseline(self, names, values, weights, bounds, max_w, instrument):
+        """Chạy bộ giải chính xác trong luồng worker để lấy giá trị tối ưu làm mốc (chỉ khi có một ràng buộc)."""
+        if isinstance(max_w, tuple) and not get_solver("exact").multi_constraint:
+            self.root.after(0, self._check_running_threads)
+            return
+        try:
+            exact = get_solver("exact").cls(names, values, weights, max_w, cancel_token=self._cancel_token,
+                                            instrument=instrument, item_bounds=bounds)
+            exact.solve()
+            self.root.after(0, self._set_exact_result, exact)
+        except Exception as e:
+            self.root.after(0, lambda msg=str(e): messagebox.showerror("Lỗi Bộ Giải Chính Xác", msg))
+            self.root.after(0, self._check_running_threads)
+
+    def _set_exact_result(self, exact):
+        """Lưu kết quả bộ giải chính xác và cập nhật khoảng cách tối ưu (luồng chính)."""
+        self.exact_algo = exact
+        self._update_gap_label()
+        self._update_performance_tab()
         self._check_running_threads()
 
+    def _update_gap_label(self):
+        """Hiển thị giá trị tối ưu và khoảng cách tối ưu của các thuật toán heuristic."""
+        if self.exact_algo is None:
+            return
+        from knapsack_exact import optimality_gap
+        optimum = self.exact_algo.best_value
+        status = "" if self.exact_algo.is_optimal else " (chưa chứng minh)"
+        text = f"Tối ưu ({self.exact_algo.method_used.upper()}): {optimum}{status} - {self.exact_algo.exec_time:.4f}s"
+        for spec in heuristic_solvers():
+            if spec.key in self.results:
+                gap = optimality_gap(self.results[spec.key].best_value, optimum)
+                text += f" | Gap {spec.key.upper()}: {gap:.2f}%"
+        self.gap_label.config(text=text)
+
+    def _update_performance_tab(self):
+        """
+        Hiển thị báo cáo hiệu năng của các thuật toán đã xong (theo thứ tự đăng ký) và bộ giải chính xác;
+        chỉ có nội dung khi lần chạy bật "Đo hiệu năng".
+        """
+        self.performance_text.delete(1.0, "end")
+        if not self._instrumented:
+            self.performance_text.insert("end", "Bật \"Đo hiệu năng\" rồi chạy lại để xem thời gian từng pha và các bộ đếm.")
+            return
+        sections = []
+        for spec in heuristic_solvers():
+            result = self.results.get(spec.key)
+            if result is not None and result.performance is not None:
+                sections.append(f"== {spec.name} ({result.exec_time:.4f}s) ==\n{format_report(result.performance)}")
+        if self.exact_algo is not None:
+            exact = self.exact_algo
+            sections.append(f"== {get_solver('exact').name} ({exact.exec_time:.4f}s) ==\n"
+                            f"{format_report(exact.performance_report())}")
+        self.performance_text.insert("end", "\n\n".join(sections))
+
     def _check_running_threads(self):
-        """Kiểm tra số lượng luồng đang chạy và bật lại nút Run."""
-        if threading.active_count() <= 2: 
+        """Đánh dấu một tác vụ nền đã xong và bật lại nút Run khi không còn tác vụ nào."""
+        self._pending_jobs -= 1
+        if self._pending_jobs <= 0:
+             self._pending_jobs = 0
              self.run_button.config(state="normal")
+             self.cancel_button.config(state="disabled")
+             if self._progress_queue is not None:
+                 self._poll_progress()  # Gom nốt các sự kiện còn lại trong hàng đợi
+
+    def cancel_run(self):
+        """Yêu cầu các thuật toán đang chạy dừng sớm; kết quả tốt nhất đến lúc đó vẫn được hiển thị."""
+        if self._cancel_token is not None:
+            self._cancel_token.cancel()
+        self.cancel_button.config(state="disabled")
+
+    def _poll_progress(self):
+        """Gom các ProgressEvent đang chờ theo lô (throttle bằng root.after) rồi vẽ lại đồ thị hội tụ."""
+        changed = False
+        for _ in range(500):
+            try:
+                (algorithm, _worker), event = self._progress_queue.get_nowait()
+            except queue.Empty:
+                break
+            series = self._live_series.setdefault(algorithm, {})
+            if event.best_value > series.get(event.iteration, -1):
+                series[event.iteration] = event.best_value
+                changed = True
+        if changed:
+            self._draw_live_chart()
+        if self._pending_jobs > 0:
+            self.root.after(100, self._poll_progress)
+
+    def _draw_live_chart(self):
+        """Vẽ đường hội tụ (giá trị tốt nhất theo vòng lặp) của từng thuật toán lên Canvas."""
+        canvas = self.live_canvas
+        canvas.delete("all")
+        width, height, pad = canvas.winfo_width(), canvas.winfo_height(), 30
+        points = {name: sorted(series.items()) for name, series in self._live_series.items() if series}
+        if not points or width <= 2 * pad or height <= 2 * pad:
+            return
+
+        max_x = max(p[-1][0] for p in points.values()) or 1
+        low = min(v for p in points.values() for _, v in p)
+        high = max(v for p in points.values() for _, v in p)
+        span = (high - low) or 1
+
+        canvas.create_line(pad, height - pad, width - pad, height - pad)
+        canvas.create_line(pad, pad, pad, height - pad)
+        canvas.create_text(pad, pad - 10, text=str(high), anchor="w", font=("Consolas", 8))
+        for row, (class_name, series) in enumerate(points.items()):
+            spec = solver_for_class(class_name)
+            name, color = (spec.name, spec.color) if spec else (class_name, "green")
+            coords = []
+            best = -1
+            for iteration, value in series:
+                best = max(best, value)  # Giá trị tốt nhất của mọi worker tính tới vòng lặp này
+                coords.append(pad + iteration / max_x * (width - 2 * pad))
+                coords.append(height - pad - (best - low) / span * (height - 2 * pad))
+            if len(coords) >= 4:
+                canvas.create_line(*coords, fill=color, width=2)
+            canvas.create_text(width - pad, pad + 12 * row, text=f"{name}: {best}", anchor="e", fill=color,
+                               font=("Consolas", 8))
              
     def start_parallel_run(self):
-        """Khởi tạo hai luồng (Thread) để chạy Hill Climbing và GWO song song."""
-        if not self.items: 
+        """Chạy các thuật toán đã chọn song song trên nhiều tiến trình, kèm bộ giải chính xác làm mốc."""
+        if not self.items_data['names']: 
             messagebox.showerror("Lỗi", "Vui lòng tải dữ liệu trước.")
             return
 
         try:
-            max_w = int(self.max_w_entry.get())
+            capacities = [int(part) for part in self.max_w_entry.get().split(",")]
+            max_w = capacities[0] if len(capacities) == 1 else tuple(capacities)
             max_iter = int(self.iter_entry.get())
+            restarts = max(1, int(self.restarts_entry.get()))
+            time_budget = float(self.time_budget_entry.get() or 0)
+            seed = int(self.seed_entry.get()) if self.seed_entry.get().strip() else None
         except ValueError:
-            messagebox.showerror("Lỗi", "Tham số 'Khối lượng tối đa' hoặc 'Số lần lặp' không hợp lệ!")
+            messagebox.showerror("Lỗi", "Tham số 'Khối lượng tối đa', 'Số lần lặp', 'Số lần khởi động', "
+                                        "'Giới hạn (s)' hoặc 'Seed' không hợp lệ!")
+            return
+        limits = {'time_budget': time_budget} if time_budget > 0 else {}
+
+        dimensions = self.items_data['dimensions']
+        if len(capacities) != len(dimensions):
+            messagebox.showerror("Lỗi", f"Dataset có {len(dimensions)} ràng buộc ({', '.join(dimensions)}): "
+                                        f"nhập {len(dimensions)} giá trị 'Khối lượng tối đa' cách nhau bởi dấu phẩy.")
+            return
+
+        specs = [spec for spec in heuristic_solvers() if self.solver_vars[spec.key].get()]
+        if len(dimensions) > 1:
+            skipped = [spec.name for spec in specs if not spec.multi_constraint]
+            specs = [spec for spec in specs if spec.multi_constraint]
+            if skipped:
+                messagebox.showwarning("Bỏ qua thuật toán", f"Chỉ hỗ trợ một ràng buộc: {', '.join(skipped)}")
+        if not specs:
+            messagebox.showerror("Lỗi", "Vui lòng chọn ít nhất một thuật toán.")
             return
 
-        names, values, weights = self.items_data['names'], self.items_data['values'], self.items_data['weights']
+        names, values = self.items_data['names'], self.items_data['values']
+        weights = self.items_data['weights'] if len(dimensions) == 1 else self.items_data['weight_matrix']
+        bounds = self.items_data['bounds']
         
         if not names: 
             messagebox.showerror("Lỗi", "Dữ liệu vật phẩm bị rỗng, vui lòng tải lại file.")
             return
             
         self.run_button.config(state="disabled") 
+        self.cancel_button.config(state="normal")
+        self._instrumented = self.instrument_var.get()
         self.clear_results()
+        self._pending_jobs = 2
+
+        # Hàng đợi và cờ hủy của Manager dùng được từ cả luồng lẫn tiến trình worker
+        if self._manager is None:
+            import multiprocessing
+            self._manager = multiprocessing.get_context("spawn").Manager()
+        self._progress_queue = self._manager.Queue()
+        self._cancel_token = CancelToken(self._manager.Event())
+        progress_every = max(1, max_iter // 200)
+        self.root.after(100, self._poll_progress)
 
-        thread_hc = threading.Thread(
-            target=self._run_single_algo, 
-            args=("Hill Climbing", HillClimbing, self.hc_result, self.hc_history, names, values, weights, max_w, max_iter)
+        thread_parallel = threading.Thread(
+            target=self._run_parallel_jobs,
+            args=(specs, names, values, weights, bounds, max_w, max_iter, restarts, self.island_var.get(),
+                  progress_every, limits, seed, self._instrumented),
+            daemon=True
         )
-        thread_hc.start()
+        thread_parallel.start()
 
-        thread_gwo = threading.Thread(
-            target=self._run_single_algo, 
-            args=("Grey Wolf Optimizer", GreyWolfOptimizer, self.gwo_result, self.gwo_history, names, values, weights, max_w, max_iter)
+        thread_exact = threading.Thread(
+            target=self._run_exact_baseline,
+            args=(names, values, weights, bounds, max_w, self._instrumented),
+            daemon=True
         )
-        thread_gwo.start()
+        thread_exact.start()
 
     def show_comparison_chart(self):
-        """Hiển thị biểu đồ so sánh hai thuật toán."""
-        if self.hc_algo is None or self.gwo_algo is None:
-            messagebox.showwarning("Chưa có dữ liệu", "Vui lòng chạy cả hai thuật toán trước khi xem biểu đồ so sánh!")
+        """Hiển thị biểu đồ so sánh các thuật toán đã chạy."""
+        if not self.results:
+            messagebox.showwarning("Chưa có dữ liệu", "Vui lòng chạy thuật toán trước khi xem biểu đồ so sánh!")
             return
         
         # Tạo cửa sổ mới cho biểu đồ
@@ -239,33 +559,34 @@ class KnapsackApp:
         chart_window.title("Biểu Đồ So Sánh Thuật Toán")
         chart_window.geometry("1000x600")
         
-        # Tạo figure matplotlib
-        fig, ax = plt.subplots(figsize=(10, 6))
+        # matplotlib chỉ được import ở lần vẽ đầu tiên; Figure độc lập (không qua pyplot) được giải phóng cùng cửa sổ
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from convergence_history import downsample_minmax
+        fig = Figure(figsize=(10, 6))
+        ax = fig.add_subplot()
         
-        # Vẽ đường cho Hill Climbing
-        iterations_hc = range(len(self.hc_algo.history_values))
-        ax.plot(iterations_hc, self.hc_algo.history_values, 
-                label='Hill Climbing', marker='o', markersize=3, linewidth=2, color='blue')
-        
-        # Vẽ đường cho Grey Wolf Optimizer
-        iterations_gwo = range(len(self.gwo_algo.history_values))
-        ax.plot(iterations_gwo, self.gwo_algo.history_values, 
-                label='Grey Wolf Optimizer', marker='s', markersize=3, linewidth=2, color='red')
+        # Giảm điểm (giữ min/max mỗi nhóm) để chuỗi dài vẫn vẽ nhanh; chỉ dùng marker khi ít điểm
+        # Mỗi thuật toán đã chạy là một đường, màu lấy từ solver_registry
+        markers = "os^Dv<>"
+        info_lines = []
+        for row, (key, result) in enumerate(self.results.items()):
+            spec = get_solver(key)
+            iterations, values = downsample_minmax(result.history_values)
+            ax.plot(iterations, values, label=spec.name, linewidth=2, color=spec.color,
+                    marker=markers[row % len(markers)] if len(iterations) <= 200 else None, markersize=3)
+            info_lines.append(f"{key.upper()}: {result.best_value} ({result.exec_time:.4f}s)")
         
         # Thiết lập labels và title
         ax.set_xlabel('Generation (Thế hệ)', fontsize=12)
         ax.set_ylabel('Fitness (Giá trị thích nghi)', fontsize=12)
-        ax.set_title('So Sánh Hiệu Suất: Hill Climbing vs Grey Wolf Optimizer', fontsize=14, fontweight='bold')
+        ax.set_title('So Sánh Hiệu Suất: ' + ' vs '.join(get_solver(key).name for key in self.results),
+                     fontsize=14, fontweight='bold')
         ax.legend(loc='best', fontsize=11)
         ax.grid(True, alpha=0.3)
         
         # Thêm thông tin cuối cùng
-        final_hc = self.hc_algo.best_value
-        final_gwo = self.gwo_algo.best_value
-        time_hc = self.hc_algo.exec_time
-        time_gwo = self.gwo_algo.exec_time
-        
-        info_text = f"Kết quả cuối:\nHC: {final_hc} ({time_hc:.4f}s) | GWO: {final_gwo} ({time_gwo:.4f}s)"
+        info_text = "Kết quả cuối:\n" + " | ".join(info_lines)
         ax.text(0.02, 0.98, info_text, transform=ax.transAxes, 
                 verticalalignment='top', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5),
                 fontsize=10)
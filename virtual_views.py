@@ -0,0 +1,304 @@
+from tkinter import ttk, Text
+from tkinter import font as tkfont
+from typing import Sequence, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class VirtualHistoryView(ttk.Frame):
+    """
+    Khung hiển thị danh sách dòng rất dài (ví dụ lịch sử 1 triệu vòng lặp) mà chỉ
+    định dạng và vẽ những dòng đang nhìn thấy.
+
+    Nguồn dữ liệu là bất kỳ đối tượng nào hỗ trợ len() và truy cập chỉ số trả về chuỗi,
+    chẳng hạn ConvergenceHistory.
+    """
+
+    def __init__(self, master, **text_options):
+        """Tạo Text chỉ đọc và thanh cuộn điều khiển thủ công."""
+        super().__init__(master)
+        self._source: Sequence[str] = []
+        self._offset = 0
+
+        self._scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scroll)
+        self._scrollbar.pack(side="right", fill="y")
+        self._text = Text(self, wrap="none", **text_options)
+        self._text.pack(side="left", fill="both", expand=True)
+        self._text.configure(state="disabled")
+
+        self._text.bind("<Configure>", lambda _e: self._render())
+        self._text.bind("<MouseWheel>", self._on_mousewheel)
+        self._text.bind("<Button-4>", lambda _e: self._scroll_by(-3))
+        self._text.bind("<Button-5>", lambda _e: self._scroll_by(3))
+
+    def set_source(self, source: Sequence[str]):
+        """Gắn nguồn dữ liệu mới và cuộn về đầu."""
+        self._source = source
+        self._offset = 0
+        self._render()
+
+    def clear(self):
+        """Xóa nội dung đang hiển thị."""
+        self.set_source([])
+
+    def _visible_rows(self) -> int:
+        """Số dòng vừa với chiều cao hiện tại của Text."""
+        linespace = tkfont.Font(font=self._text.cget("font")).metrics("linespace") or 1
+        return max(1, self._text.winfo_height() // linespace)
+
+    def _render(self):
+        """Vẽ lại các dòng trong cửa sổ nhìn thấy và cập nhật thanh cuộn."""
+        total = len(self._source)
+        rows = self._visible_rows()
+        self._offset = max(0, min(self._offset, total - rows))
+        stop = min(total, self._offset + rows)
+
+        self._text.configure(state="normal")
+        self._text.delete(1.0, "end")
+        self._text.insert("end", "\n".join(self._source[i] for i in range(self._offset, stop)))
+        self._text.configure(state="disabled")
+
+        if total:
+            self._scrollbar.set(self._offset / total, stop / total)
+        else:
+            self._scrollbar.set(0.0, 1.0)
+
+    def _scroll_by(self, rows: int):
+        """Cuộn tương đối theo số dòng."""
+        self._offset += rows
+        self._render()
+
+    def _on_scroll(self, action, value, unit=None):
+        """Xử lý lệnh từ thanh cuộn: moveto (kéo) hoặc scroll (mũi tên / trang)."""
+        if action == "moveto":
+            self._offset = int(float(value) * len(self._source))
+        elif action == "scroll":
+            step = self._visible_rows() if unit == "pages" else 1
+            self._offset += int(value) * step
+        self._render()
+
+    def _on_mousewheel(self, event):
+        """Cuộn bằng con lăn chuột (Windows/macOS)."""
+        self._scroll_by(-3 if event.delta > 0 else 3)
+        return "break"
+
+
+class VirtualItemTable(ttk.Frame):
+    """
+    Bảng vật phẩm ảo hóa cho dataset lớn: Treeview chỉ giữ đúng số dòng đang nhìn thấy
+    (cố định bằng `height`), nội dung được điền lại từ mảng mỗi khi cuộn.
+
+    Sắp xếp (bấm tiêu đề cột) và lọc theo khoảng giá trị / khối lượng / tỉ lệ được tính
+    trên mảng NumPy gốc; bảng chỉ lưu một mảng chỉ số của các dòng đang hiển thị.
+    NumPy chỉ được import khi gắn dữ liệu, nên tạo bảng rỗng lúc khởi động không kéo theo NumPy.
+    Khi có nhiều ràng buộc trọng lượng, mỗi ràng buộc là một cột riêng.
+    """
+
+    COLUMNS = ("Tên", "Giá trị", "Khối lượng", "Tỉ lệ")
+    FILTER_COLUMNS = ("Giá trị", "Khối lượng", "Tỉ lệ")
+    WEIGHT_COLUMN = "Khối lượng"
+
+    def __init__(self, master, height: int = 10):
+        """Tạo thanh lọc, Treeview với `height` dòng dựng sẵn và thanh cuộn."""
+        super().__init__(master)
+        self._height = height
+        self._names: Sequence[str] = []
+        self._name_array: "Optional[np.ndarray]" = None  # Tạo khi sắp xếp theo tên lần đầu
+        self._columns = {}  # Tên cột số -> mảng
+        self._column_names = self.COLUMNS  # Các cột đang hiển thị (thay đổi theo số ràng buộc)
+        self._view: Sequence[int] = ()  # Chỉ số vật phẩm theo thứ tự hiển thị (mảng NumPy sau set_data)
+        self._order = self._view  # Thứ tự sắp xếp hiện tại (chưa lọc)
+        self._mask: "Optional[np.ndarray]" = None  # Mặt nạ lọc (None = không lọc)
+        self._sort_column: Optional[str] = None
+        self._descending = False
+        self._offset = 0
+
+        filter_frame = ttk.Frame(self)
+        filter_frame.pack(fill="x", pady=(0, 2))
+        ttk.Label(filter_frame, text="Lọc theo:").pack(side="left", padx=5)
+        self._filter_column = ttk.Combobox(filter_frame, values=self.FILTER_COLUMNS, state="readonly", width=10)
+        self._filter_column.set(self.FILTER_COLUMNS[0])
+        self._filter_column.pack(side="left", padx=5)
+        ttk.Label(filter_frame, text="Từ:").pack(side="left", padx=5)
+        self._low_entry = ttk.Entry(filter_frame, width=10)
+        self._low_entry.pack(side="left", padx=5)
+        ttk.Label(filter_frame, text="Đến:").pack(side="left", padx=5)
+        self._high_entry = ttk.Entry(filter_frame, width=10)
+        self._high_entry.pack(side="left", padx=5)
+        ttk.Button(filter_frame, text="Lọc", command=self._apply_filter_entries).pack(side="left", padx=5)
+        ttk.Button(filter_frame, text="Bỏ lọc", command=self.clear_filter).pack(side="left", padx=5)
+        self._count_label = ttk.Label(filter_frame, text="")
+        self._count_label.pack(side="left", padx=10)
+
+        self._scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scroll)
+        self._scrollbar.pack(side="right", fill="y")
+        self._tree = ttk.Treeview(self, columns=self.COLUMNS, show="headings", height=height, selectmode="none")
+        for col in self.COLUMNS:
+            self._tree.heading(col, text=col, command=lambda c=col: self.sort_by(c))
+            self._tree.column(col, anchor="center", width=150)
+        self._tree.pack(side="left", fill="x", expand=True)
+
+        # Chỉ `height` dòng được tạo một lần; khi cuộn chỉ đổi nội dung của chúng
+        self._row_ids = [self._tree.insert("", "end", values=("",) * len(self.COLUMNS)) for _ in range(height)]
+        self._attached = height
+
+        self._tree.bind("<MouseWheel>", self._on_mousewheel)
+        self._tree.bind("<Button-4>", lambda _e: self._scroll_by(-3))
+        self._tree.bind("<Button-5>", lambda _e: self._scroll_by(3))
+
+    def set_data(self, names: Sequence[str], values, weights, dimensions: Optional[Sequence[str]] = None):
+        """
+        Gắn dữ liệu vật phẩm mới (không sao chép mảng), bỏ sắp xếp/lọc cũ và cuộn về đầu.
+
+        weights là mảng (n,) hoặc ma trận (m x n) khi có nhiều ràng buộc; khi đó mỗi ràng buộc
+        một cột, đặt tên theo dimensions, và tỉ lệ tính theo ràng buộc đầu tiên.
+        """
+        import numpy as np
+        values = np.asarray(values, dtype=np.int64)
+        weight_rows = np.atleast_2d(np.asarray(weights, dtype=np.int64))
+        if len(weight_rows) == 1:
+            weight_columns = [self.WEIGHT_COLUMN]
+        else:
+            weight_columns = list(dimensions or (f"{self.WEIGHT_COLUMN} {j + 1}" for j in range(len(weight_rows))))
+        ratios = np.divide(values, weight_rows[0], out=np.full(len(values), np.inf), where=weight_rows[0] != 0)
+        self._names = names
+        self._name_array = None
+        self._columns = {"Giá trị": values, **dict(zip(weight_columns, weight_rows)), "Tỉ lệ": ratios}
+        self._set_columns(("Tên",) + tuple(self._columns))
+        self._order = np.arange(len(values))
+        self._mask = None
+        self._sort_column = None
+        self._descending = False
+        self._refresh_headings()
+        self._update_view()
+
+    def clear(self):
+        """Xóa dữ liệu đang hiển thị."""
+        self.set_data([], [], [])
+
+    def _set_columns(self, columns: Sequence[str]):
+        """Dựng lại cột của Treeview và danh sách cột lọc khi số ràng buộc thay đổi."""
+        if tuple(columns) == self._column_names:
+            return
+        self._column_names = tuple(columns)
+        self._tree.configure(columns=self._column_names)
+        for col in self._column_names:
+            self._tree.heading(col, text=col, command=lambda c=col: self.sort_by(c))
+            self._tree.column(col, anchor="center", width=150)
+        self._filter_column.configure(values=self._column_names[1:])
+        self._filter_column.set(self._column_names[1])
+
+    def sort_by(self, column: str):
+        """Sắp xếp theo cột (bấm lại cùng cột để đảo chiều). Dùng argsort ổn định trên mảng."""
+        import numpy as np
+        if column == self._sort_column:
+            self._descending = not self._descending
+        else:
+            self._sort_column, self._descending = column, False
+
+        if column == "Tên":
+            if self._name_array is None:
+                self._name_array = np.asarray(self._names, dtype=str)
+            key = self._name_array
+        else:
+            key = self._columns[column]
+        order = np.argsort(key, kind="stable")
+        self._order = order[::-1] if self._descending else order
+        self._refresh_headings()
+        self._update_view()
+
+    def set_filter(self, column: str, low: Optional[float] = None, high: Optional[float] = None):
+        """Chỉ hiển thị vật phẩm có low <= cột <= high (bỏ trống một đầu nghĩa là không giới hạn)."""
+        import numpy as np
+        if column not in self._columns:
+            raise ValueError(f"Không thể lọc theo cột '{column}'.")
+        data = self._columns[column]
+        mask = np.ones(len(data), dtype=bool)
+        if low is not None:
+            mask &= data >= low
+        if high is not None:
+            mask &= data <= high
+        self._mask = mask
+        self._update_view()
+
+    def clear_filter(self):
+        """Bỏ lọc, hiển thị lại mọi vật phẩm."""
+        self._low_entry.delete(0, "end")
+        self._high_entry.delete(0, "end")
+        self._mask = None
+        self._update_view()
+
+    def visible_indices(self) -> "np.ndarray":
+        """Chỉ số vật phẩm (trong dữ liệu gốc) theo thứ tự đang hiển thị sau sắp xếp và lọc."""
+        return self._view
+
+    def _apply_filter_entries(self):
+        """Đọc khoảng lọc từ các ô nhập; ô trống nghĩa là không giới hạn."""
+        try:
+            low = float(self._low_entry.get()) if self._low_entry.get().strip() else None
+            high = float(self._high_entry.get()) if self._high_entry.get().strip() else None
+        except ValueError:
+            self._count_label.config(text="Khoảng lọc không hợp lệ")
+            return
+        self.set_filter(self._filter_column.get(), low, high)
+
+    def _refresh_headings(self):
+        """Hiện mũi tên chiều sắp xếp trên tiêu đề cột đang sắp xếp."""
+        for col in self._column_names:
+            arrow = (" ▼" if self._descending else " ▲") if col == self._sort_column else ""
+            self._tree.heading(col, text=col + arrow)
+
+    def _update_view(self):
+        """Tính lại mảng chỉ số hiển thị từ thứ tự sắp xếp và mặt nạ lọc."""
+        self._view = self._order if self._mask is None else self._order[self._mask[self._order]]
+        self._offset = 0
+        total = len(self._columns["Giá trị"]) if self._columns else 0
+        self._count_label.config(text=f"Hiển thị {len(self._view)}/{total} vật phẩm")
+        self._render()
+
+    def _render(self):
+        """Điền nội dung các dòng nhìn thấy vào những dòng Treeview dựng sẵn và cập nhật thanh cuộn."""
+        total = len(self._view)
+        self._offset = max(0, min(self._offset, total - self._height))
+        window = self._view[self._offset:self._offset + self._height]
+
+        # Gắn lại / tách bớt dòng dựng sẵn khi số dòng hiển thị ít hơn chiều cao bảng
+        if len(window) != self._attached:
+            for k, row_id in enumerate(self._row_ids):
+                if k < len(window):
+                    self._tree.move(row_id, "", k)
+                else:
+                    self._tree.detach(row_id)
+            self._attached = len(window)
+
+        if len(window):
+            # Giá trị và các cột trọng lượng nằm giữa tên và tỉ lệ
+            cells = [self._columns[col][window].tolist() for col in self._column_names[1:-1]]
+            ratios = self._columns["Tỉ lệ"][window].tolist()
+            for row_id, i, r, *row in zip(self._row_ids, window.tolist(), ratios, *cells):
+                self._tree.item(row_id, values=(self._names[i], *row, f"{r:.3f}"))
+
+        if total:
+            self._scrollbar.set(self._offset / total, (self._offset + len(window)) / total)
+        else:
+            self._scrollbar.set(0.0, 1.0)
+
+    def _scroll_by(self, rows: int):
+        """Cuộn tương đối theo số dòng."""
+        self._offset += rows
+        self._render()
+
+    def _on_scroll(self, action, value, unit=None):
+        """Xử lý lệnh từ thanh cuộn: moveto (kéo) hoặc scroll (mũi tên / trang)."""
+        if action == "moveto":
+            self._offset = int(float(value) * len(self._view))
+        elif action == "scroll":
+            step = self._height if unit == "pages" else 1
+            self._offset += int(value) * step
+        self._render()
+
+    def _on_mousewheel(self, event):
+        """Cuộn bằng con lăn chuột (Windows/macOS)."""
+        self._scroll_by(-3 if event.delta > 0 else 3)
+        return "break"